@@ -4,28 +4,41 @@ import uuid
 from fastapi import APIRouter, HTTPException
 from app.models.request_models import ChatRequest
 from app.models.response_models import ChatResponse
-from app.services.language_utils import LanguageService
-from app.services.intent_recognizer import IntentRecognizer
-from app.services.weather_service import get_forecast, simplify_forecast_for_farmer
-from app.services.mandi_service import MandiPriceService
-from app.services.schemes_service import SchemesRAGService
-from app.services.crop_care_service import CropCareRAGService
-from app.services.location_crop_extractor import EntityExtractor
-from app.services.speech_utils.text_to_speech import TextToSpeechService
+from app.core.config import ANSWER_CACHE_ENABLED
+from app.core.container import ServiceContainer
+from app.core.executor import run_blocking
+from app.services.answer_cache import answer_scope
+from app.services.weather_service import (
+    acache_summary,
+    aget_cached_summary,
+    aget_forecast,
+    asimplify_forecast_for_farmer,
+)
 
 logger = logging.getLogger(__name__)
 
-def create_chat_router() -> APIRouter:
-    router = APIRouter()
 
-    # Initialize services
-    lang_service = LanguageService()
-    intent_service = IntentRecognizer()
-    mandi_service = MandiPriceService()
-    scheme_service = SchemesRAGService()
-    cropcare_service = CropCareRAGService()
-    entity_extractor = EntityExtractor()
-    tts_service = TextToSpeechService()
+def _audio_url(audio_path: str) -> str:
+    return f"http://localhost:8000/static/audio/{os.path.basename(audio_path)}"
+
+
+def _is_cacheable(response_text: str) -> bool:
+    # Error and fallback messages must not be served to the next farmer
+    return bool(response_text) and not response_text.startswith(("Sorry", "❌", "⚠️"))
+
+
+async def _answer_cache(services: ServiceContainer):
+    if not ANSWER_CACHE_ENABLED:
+        return None
+    try:
+        return await services.aget("answer_cache")
+    except Exception:
+        # Without an embedding model the pipeline simply runs uncached
+        return None
+
+
+def create_chat_router(services: ServiceContainer) -> APIRouter:
+    router = APIRouter()
 
     @router.post("/chat", response_model=ChatResponse)
     async def chat_endpoint(chat_request: ChatRequest):
@@ -34,64 +47,111 @@ def create_chat_router() -> APIRouter:
             if not query_text:
                 raise HTTPException(status_code=400, detail="Query cannot be empty")
 
+            # Shared services (loaded on first use)
+            lang_service = await services.aget("language")
+            understanding_service = await services.aget("query_understanding")
+
             # 1. Detect user language
-            detected_lang = lang_service.detect_language(query_text)
+            detected_lang = await lang_service.adetect_language(query_text)
             logger.info(f"🌐 Detected language: {detected_lang}")
 
             # 2. Translate to English if needed
             translated_query = (
-                lang_service.translate_text(query_text, target_lang="en")
+                await lang_service.atranslate_text(query_text, target_lang="en")
                 if detected_lang != "en"
                 else query_text
             )
             logger.info(f"📝 Translated query: {translated_query}")
 
-            # 3. Detect user intent
-            intent = intent_service.detect_intent(translated_query)
+            # 3. Understand the query: intent + crop/city/state/district in one step
+            understanding = await understanding_service.aunderstand(translated_query)
+            intent = understanding.intent
             logger.info(f"🎯 Detected intent: {intent}")
 
-            # 4. Route to appropriate module
-            if intent == "weather":
-                city = entity_extractor.extract_weather_city(translated_query)
-                weather_data, forecast = get_forecast(city)
-                response_text = (
-                    simplify_forecast_for_farmer(city, forecast)
-                    if weather_data
-                    else forecast
-                )
+            # 4. Semantic answer cache: a paraphrase of an answered question (same intent and
+            #    entities) reuses the English answer, its translation and its audio
+            answer_cache = await _answer_cache(services)
+            scope = answer_scope(understanding)
+            query_vector = cached_answer = None
+            if answer_cache is not None and intent != "unknown":
+                query_vector = await run_blocking(answer_cache.embed, translated_query)
+                cached_answer = answer_cache.lookup(scope, query_vector)
+                if cached_answer is not None:
+                    localized = answer_cache.localized(cached_answer, scope, detected_lang)
+                    if localized is not None:
+                        return ChatResponse(
+                            response=localized[0],
+                            detected_module=intent,
+                            language=detected_lang,
+                            audio_url=_audio_url(localized[1]),
+                            english_response=cached_answer.english,
+                        )
+
+            # 5. Route to appropriate module
+            final_response_text = None
+            cache_weather_summary = False
+            if cached_answer is not None:
+                response_text = cached_answer.english
+
+            elif intent == "weather":
+                city = understanding.city
+                # Same city, forecast slot and language -> reuse the summary and its translation
+                cached = await aget_cached_summary(city, detected_lang)
+                if cached is not None:
+                    response_text, final_response_text = cached["english"], cached["text"]
+                else:
+                    weather_data, forecast = await aget_forecast(city)
+                    response_text = (
+                        await asimplify_forecast_for_farmer(city, forecast)
+                        if weather_data
+                        else forecast
+                    )
+                    cache_weather_summary = bool(weather_data) and not response_text.startswith("❌")
 
             elif intent == "mandi_prices":
-                entities = entity_extractor.extract_mandi_entities(translated_query)
-                crop = entities.get("crop", "")
-                location = entities.get("location", "")
-                response_text = mandi_service.search_prices(location, crop)
+                mandi_service = await services.aget("mandi")
+                response_text = await mandi_service.asearch_prices(
+                    understanding.city,
+                    understanding.crop,
+                    state=understanding.state,
+                    district=understanding.district,
+                )
 
             elif intent == "schemes":
-                response_text = scheme_service.run_rag_pipeline(translated_query)
+                scheme_service = await services.aget("schemes")
+                response_text = await scheme_service.arun_rag_pipeline(translated_query)
 
             elif intent == "agriculture_info":
-                response_text = cropcare_service.run_crop_care_pipeline(translated_query)
+                cropcare_service = await services.aget("crop_care")
+                response_text = await cropcare_service.arun_crop_care_pipeline(translated_query)
 
             else:
                 response_text = "Sorry, I couldn't understand your request."
 
-            # 5. Translate response back to original language (if not English)
-            final_response_text = (
-                lang_service.translate_text(response_text, target_lang=detected_lang)
-                if detected_lang != "en"
-                else response_text
-            )
+            # 6. Translate response back to original language (if not English)
+            if final_response_text is None:
+                final_response_text = (
+                    await lang_service.atranslate_text(response_text, target_lang=detected_lang)
+                    if detected_lang != "en"
+                    else response_text
+                )
+                if cache_weather_summary and detected_lang != "en":
+                    await acache_summary(understanding.city, detected_lang, response_text, final_response_text)
+
+            # 7. Generate TTS audio
+            tts_service = await services.aget("text_to_speech")
+            audio_path = await tts_service.asynthesize_speech(final_response_text, slow=False, lang=detected_lang)
 
-            # 6. Generate TTS audio
-            audio_path = tts_service.synthesize_speech(final_response_text, slow=False)
-            audio_filename = os.path.basename(audio_path)
-            audio_url = f"http://localhost:8000/static/audio/{audio_filename}"
+            if cached_answer is not None:
+                answer_cache.add_localized(cached_answer, detected_lang, final_response_text, audio_path)
+            elif query_vector is not None and _is_cacheable(response_text):
+                answer_cache.store(scope, query_vector, response_text, detected_lang, final_response_text, audio_path)
 
             return ChatResponse(
                 response=final_response_text,
                 detected_module=intent,
                 language=detected_lang,
-                audio_url=audio_url,
+                audio_url=_audio_url(audio_path),
                 english_response=response_text
             )
 
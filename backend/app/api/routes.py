@@ -1,78 +1,90 @@
-import os
 import logging
 from typing import Optional
 from fastapi import APIRouter, Query, File, UploadFile, HTTPException
 from fastapi.responses import StreamingResponse
-from io import BytesIO
 
 # Service imports
-from app.services.speech_utils.text_to_speech import TextToSpeechService
-from app.services.crop_care_service import CropCareRAGService
-from app.services.schemes_service import SchemesRAGService
-from app.services.language_utils import LanguageService
-from app.services.intent_recognizer import IntentRecognizer
-from app.services.mandi_service import MandiPriceService
-from app.services.weather_service import get_forecast, simplify_forecast_for_farmer
-from app.services.speech_utils.speech_to_text import SpeechToTextService
+from app.core.cache import cache_stats
+from app.core.config import MANDI_TREND_DAYS, MANDI_TREND_WINDOW, STT_MAX_UPLOAD_MB
+from app.core.container import ServiceContainer
+from app.core.http_client import http_stats
+from app.models.response_models import MandiTrendResponse
+from app.services.retrieval_fanout import retrieval_stats
+from app.services.speech_utils.speech_to_text import STTOverloaded
+from app.services.speech_utils.text_to_speech import speakable
+from app.services.weather_service import aget_forecast, asimplify_forecast_for_farmer
 
 # Import chat router
 from app.api.chat_routes import create_chat_router
 
 logger = logging.getLogger(__name__)
-UPLOAD_DIR = "./temp"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+STT_MAX_UPLOAD_BYTES = int(STT_MAX_UPLOAD_MB * 1024 * 1024)
 
 
-def create_router() -> APIRouter:
+def create_router(services: ServiceContainer) -> APIRouter:
     router = APIRouter()
 
-    # Initialize services
-    lang_service = LanguageService()
-    intent_service = IntentRecognizer()
-    rag_service = SchemesRAGService()
-    crop_care_service = CropCareRAGService()
-    mandi_service = MandiPriceService()
-    stt_service = SpeechToTextService()
-    tts_service = TextToSpeechService()
-
+    # Services are shared, lazily created singletons from the container
     # ---------------------------- Health Check ----------------------------
     @router.get("/ping")
     async def ping():
         return {"message": "pong"}
 
+    @router.get("/services/stats")
+    async def service_stats():
+        return services.stats()
+
+    @router.get("/cache/stats")
+    async def cache_stats_route():
+        return cache_stats()
+
+    @router.get("/http/stats")
+    async def http_stats_route():
+        return http_stats()
+
+    @router.get("/rag/stats")
+    async def rag_stats_route():
+        return retrieval_stats()
+
     # ---------------------------- Language ----------------------------
     @router.get("/detect-language")
     async def detect_language_route(text: str = Query(...)):
-        lang = lang_service.detect_language(text)
+        lang_service = await services.aget("language")
+        lang = await lang_service.adetect_language(text)
         return {"detected_language": lang}
 
     @router.get("/translate-to-english")
     async def translate_to_english_route(text: str = Query(...)):
-        source_lang = lang_service.detect_language(text)
-        translated = text if source_lang == "en" else lang_service.translate_text(text, target_lang="en")
+        lang_service = await services.aget("language")
+        source_lang = await lang_service.adetect_language(text)
+        translated = text if source_lang == "en" else await lang_service.atranslate_text(text, target_lang="en")
         return {"translated_text": translated, "original_language": source_lang}
 
     @router.get("/translate-from-english")
     async def translate_from_english_route(text: str = Query(...), target_lang: str = Query(...)):
-        translated = lang_service.translate_text(text, target_lang)
+        lang_service = await services.aget("language")
+        translated = await lang_service.atranslate_text(text, target_lang)
         return {"translated_text": translated, "target_language": target_lang}
 
     # ---------------------------- Intent Detection ----------------------------
     @router.get("/detect-intent")
     async def detect_intent_route(query: str = Query(...)):
-        intent = intent_service.detect_intent(query)
+        intent_service = await services.aget("intent")
+        intent = await intent_service.adetect_intent(query)
         return {"intent": intent}
 
     # ---------------------------- Government Schemes ----------------------------
     @router.get("/get-scheme-info")
     async def get_scheme_info_route(query: str = Query(...)):
-        result = rag_service.run_rag_pipeline(query)
+        rag_service = await services.aget("schemes")
+        result = await rag_service.arun_rag_pipeline(query)
         return {"answer": result}
 
     # ---------------------------- Agriculture Info ----------------------------
     @router.get("/get-agriculture-info")
     async def get_agriculture_info_route(query: str = Query(...)):
-        answer = crop_care_service.run_crop_care_pipeline(query)
+        crop_care_service = await services.aget("crop_care")
+        answer = await crop_care_service.arun_crop_care_pipeline(query)
         return {"answer": answer}
 
 
@@ -82,45 +94,89 @@ def create_router() -> APIRouter:
         city: str = Query(..., description="City name in India"),
         crop: str = Query(..., description="Crop/commodity name")
     ):
-        answer = mandi_service.search_prices(city, crop)
+        mandi_service = await services.aget("mandi")
+        answer = await mandi_service.asearch_prices(city, crop)
         return {"result": answer}
 
+    @router.get("/mandi/trends", response_model=MandiTrendResponse)
+    async def get_mandi_trends_route(
+        crop: str = Query(..., description="Crop/commodity name"),
+        city: str = Query("", description="City name in India (resolved to state/district)"),
+        state: str = Query("", description="State, if already known"),
+        district: str = Query("", description="District, if already known"),
+        days: int = Query(MANDI_TREND_DAYS, ge=7, le=365, description="History length in days"),
+        window: int = Query(MANDI_TREND_WINDOW, ge=1, le=30, description="Rolling average window in days"),
+    ):
+        if not (city or state):
+            raise HTTPException(status_code=400, detail="Provide a city or a state.")
+
+        mandi_service = await services.aget("mandi")
+        try:
+            trend = await mandi_service.aget_trends(crop, city, state, district, days, window)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        if trend is None:
+            raise HTTPException(status_code=404, detail=f"No price history for '{crop}'.")
+        return trend
+
     # ---------------------------- Weather Forecast ----------------------------
     @router.get("/get-weather")
     async def get_weather_route(city: str):
-        weather_data, forecast = get_forecast(city)
+        weather_data, forecast = await aget_forecast(city)
         if not weather_data:
             return {"error": forecast}
-        simplified = simplify_forecast_for_farmer(city, forecast)
+        simplified = await asimplify_forecast_for_farmer(city, forecast)
         return {"forecast": simplified}
 
     # ---------------------------- Speech-to-Text ----------------------------
     @router.post("/speech-to-text")
     async def speech_to_text_route(file: UploadFile = File(...), language: Optional[str] = None):
         try:
-            file_location = os.path.abspath(os.path.join(UPLOAD_DIR, file.filename))
-            with open(file_location, "wb") as buffer:
-                buffer.write(await file.read())
-            logger.info(f"File saved successfully at: {file_location}")
-            transcription = stt_service.transcribe_audio(file_location, language)
+            # Decoded in memory by the STT worker: no upload or WAV files on disk
+            audio = await file.read(STT_MAX_UPLOAD_BYTES + 1)
+            if len(audio) > STT_MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="Audio file is too large.")
+            logger.info(f"🎙️ Received {len(audio)} bytes of audio ({file.filename})")
+            stt_service = await services.aget("speech_to_text")
+            transcription = await stt_service.atranscribe_audio(audio, language)
             return {"transcription": transcription}
+        except HTTPException:
+            raise
+        except STTOverloaded as e:
+            logger.warning(f"⚠️ Speech-to-text queue full: {e}")
+            raise HTTPException(status_code=503, detail="Speech-to-text is busy, try again shortly.",
+                                headers={"Retry-After": "5"})
         except Exception as e:
             logger.error(f"Speech-to-text route error: {e}")
             raise HTTPException(status_code=500, detail="Speech-to-text transcription failed.")
 
     # ---------------------------- Text-to-Speech ----------------------------
     @router.get("/text-to-speech")
-    async def text_to_speech_route(text: str = Query(...), slow: Optional[bool] = Query(False)):
+    async def text_to_speech_route(text: str = Query(...), slow: Optional[bool] = Query(False),
+                                   lang: Optional[str] = Query(None)):
+        if not speakable(text):
+            raise HTTPException(status_code=400, detail="Nothing to speak in 'text'.")
         try:
-            audio_path = tts_service.synthesize_speech(text, slow)
-            with open(audio_path, "rb") as f:
-                audio_bytes = f.read()
-            return StreamingResponse(BytesIO(audio_bytes), media_type="audio/mpeg")
+            if not lang:
+                lang_service = await services.aget("language")
+                lang = await lang_service.adetect_language(text)
+            tts_service = await services.aget("text_to_speech")
+            audio = tts_service.stream_speech(text, slow, lang)
+            # Render the first sentence before answering, so failures still get a 500
+            first = await audio.__anext__()
         except Exception as e:
             logger.error(f"Text-to-speech route error: {e}")
             raise HTTPException(status_code=500, detail="Text-to-speech generation failed.")
 
+        async def body():
+            yield first
+            async for block in audio:
+                yield block
+
+        # No Content-Length: the MP3 goes out with chunked transfer encoding as sentences finish
+        return StreamingResponse(body(), media_type="audio/mpeg")
+
     # ---------------------------- Chat Routes ----------------------------
-    router.include_router(create_chat_router(), tags=["Chat"])
+    router.include_router(create_chat_router(services), tags=["Chat"])
 
     return router
@@ -0,0 +1,288 @@
+# backend/app/core/cache.py
+
+import os
+import json
+import asyncio
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Every named in-process cache, for the /cache/stats endpoint
+_registry: Dict[str, Any] = {}
+
+
+def cache_stats() -> Dict[str, dict]:
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """
+    Lists a cache implemented elsewhere (anything with a stats() method) in /cache/stats.
+    """
+    _registry[name] = cache
+
+
+def purge_shared_caches() -> int:
+    """
+    Deletes expired rows from the shared SQLite store of every registered TieredCache.
+    Returns the number of rows deleted.
+    """
+    deleted = 0
+    for name, cache in list(_registry.items()):
+        shared = getattr(cache, "shared", None)
+        if not isinstance(shared, SQLiteKVStore):
+            continue
+        try:
+            deleted += shared.purge_expired()
+        except Exception as e:
+            logger.warning(f"⚠️ Purging shared cache '{name}' failed: {e}")
+    return deleted
+
+
+async def run_cache_purge(interval_minutes: float) -> None:
+    """
+    Background task started from the app lifespan: purges expired shared cache rows now
+    and then every `interval_minutes`.
+    """
+    while True:
+        try:
+            deleted = await asyncio.to_thread(purge_shared_caches)
+            if deleted:
+                logger.info(f"🧹 Purged {deleted} expired shared cache rows")
+        except Exception as e:
+            logger.error(f"❌ Shared cache purge failed: {e}")
+        await asyncio.sleep(interval_minutes * 60)
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU with optional per-entry TTL and hit/miss counters.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: Optional[float] = None) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Any, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+class SQLiteKVStore:
+    """
+    Small persistent key-value store backed by SQLite. Values are stored as JSON and may
+    carry an expiry time. WAL mode lets several worker processes share one file.
+    With `max_rows`, purge_expired() also drops the rows closest to expiring beyond it.
+    """
+
+    def __init__(self, path: str, table: str = "kv", max_rows: Optional[int] = None) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.table = table
+        self.max_rows = max_rows
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            # Lets purge_expired() hand freed pages back to the OS; only takes effect on new files
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self._conn().execute(
+            f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return default
+
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return default
+        return json.loads(value)
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """
+        (value, expires_at) for a live key, or None.
+        """
+        row = self._conn().execute(
+            f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        conn = self._conn()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), expires_at),
+        )
+        conn.commit()
+
+    def delete(self, key: str) -> None:
+        conn = self._conn()
+        conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        conn.commit()
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        rows = self._conn().execute(
+            f"SELECT key, value FROM {self.table} WHERE expires_at IS NULL OR expires_at > ?",
+            (time.time(),),
+        ).fetchall()
+        for key, value in rows:
+            yield key, json.loads(value)
+
+    def purge_expired(self) -> int:
+        conn = self._conn()
+        deleted = conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        ).rowcount
+        if self.max_rows:
+            # Keep the entries that never expire, then the most recently written ones
+            deleted += conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} "
+                "ORDER BY expires_at IS NULL DESC, expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            ).rowcount
+        conn.commit()
+        if deleted:
+            # executescript steps the pragma to completion; execute() frees a single page
+            conn.executescript("PRAGMA incremental_vacuum;")
+        return deleted
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class TieredCache:
+    """
+    In-process LRU in front of an optional shared SQLiteKVStore, so worker processes on
+    the same host share entries. Shared hits are promoted into the LRU with their
+    remaining TTL. Values must be JSON-serializable when a shared store is used.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        shared: Optional[SQLiteKVStore] = None,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.local = LRUCache(f"{name}.local", maxsize=maxsize, ttl=ttl)
+        self.shared = shared
+        self.shared_hits = 0
+        self.misses = 0
+        _registry.pop(self.local.name, None)
+        _registry[name] = self
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        if self.shared is not None:
+            try:
+                entry = self.shared.get_entry(key)
+            except Exception as e:
+                logger.warning(f"⚠️ Shared cache '{self.name}' read failed: {e}")
+                entry = None
+            if entry is not None:
+                value, expires_at = entry
+                self.local.set(key, value, ttl=expires_at - time.time() if expires_at else None)
+                self.shared_hits += 1
+                return value
+
+        self.misses += 1
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        self.local.set(key, value, ttl=ttl)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value, ttl=ttl)
+            except Exception as e:
+                logger.warning(f"⚠️ Shared cache '{self.name}' write failed: {e}")
+
+    def stats(self) -> dict:
+        local_hits = self.local.hits
+        lookups = local_hits + self.shared_hits + self.misses
+        return {
+            "size": len(self.local),
+            "maxsize": self.local.maxsize,
+            "hits": local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": round((local_hits + self.shared_hits) / lookups, 3) if lookups else None,
+            "shared_backend": self.shared.path if self.shared is not None else None,
+        }
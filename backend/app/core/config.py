@@ -0,0 +1,188 @@
+# backend/app/core/config.py
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ✅ Paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # /backend
+
+
+def _csv_env(name: str, default: str = "") -> list:
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+# ✅ Service container
+# Comma-separated service names to load at startup ("all" loads everything).
+# Anything not listed is loaded lazily on first use.
+PRELOAD_SERVICES = _csv_env("PRELOAD_SERVICES")
+
+# ✅ Async execution
+# Max threads used to run blocking SDK calls (gTTS, retrievers, Whisper) off the event loop
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", "16"))
+
+# ✅ Outbound HTTP
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+# Pooled keep-alive connections and max in-flight requests per upstream host
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+HTTP_MAX_CONCURRENCY_PER_HOST = int(os.getenv("HTTP_MAX_CONCURRENCY_PER_HOST", "10"))
+# Retries (connection errors, timeouts, 429 and 5xx) with jittered exponential backoff
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_SECONDS = float(os.getenv("HTTP_BACKOFF_SECONDS", "0.5"))
+# Circuit breaker: open after N consecutive failures, try again after the cooldown
+HTTP_BREAKER_THRESHOLD = int(os.getenv("HTTP_BREAKER_THRESHOLD", "5"))
+HTTP_BREAKER_COOLDOWN_SECONDS = float(os.getenv("HTTP_BREAKER_COOLDOWN_SECONDS", "30"))
+
+# ✅ LLM (one shared Groq client per configuration)
+LLM_MODEL = os.getenv("LLM_MODEL", "llama3-8b-8192")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+# ✅ Intent detection
+# Local classifier decides when its confidence is at least this high; otherwise the LLM is asked
+INTENT_LOCAL_CONFIDENCE = float(os.getenv("INTENT_LOCAL_CONFIDENCE", "0.65"))
+INTENT_MODEL_PATH = os.getenv(
+    "INTENT_MODEL_PATH", os.path.join(BASE_DIR, "rag_store", "intent", "intent_model.json")
+)
+
+# ✅ Local caches (SQLite files shared by all workers on the host)
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(BASE_DIR, ".cache"))
+# Expired rows in those files are deleted every N minutes; 0 disables the purge
+CACHE_PURGE_INTERVAL_MINUTES = float(os.getenv("CACHE_PURGE_INTERVAL_MINUTES", "60"))
+
+# ✅ Gazetteer (city -> district/state)
+GAZETTEER_PATH = os.getenv(
+    "GAZETTEER_PATH", os.path.join(BASE_DIR, "rag_store", "gazetteer", "india_places.csv")
+)
+GAZETTEER_FUZZY_CUTOFF = float(os.getenv("GAZETTEER_FUZZY_CUTOFF", "0.8"))
+
+# ✅ Mandi prices (local copy of the Agmarknet daily dataset)
+MANDI_DB_PATH = os.getenv("MANDI_DB_PATH", os.path.join(CACHE_DIR, "mandi_prices.sqlite"))
+# Background incremental sync interval; 0 disables it (use scripts/sync_mandi.py instead)
+MANDI_SYNC_INTERVAL_HOURS = float(os.getenv("MANDI_SYNC_INTERVAL_HOURS", "6"))
+MANDI_SYNC_PAGE_SIZE = int(os.getenv("MANDI_SYNC_PAGE_SIZE", "1000"))
+# Incremental syncs ask the API for at most this many recent arrival dates
+MANDI_SYNC_LOOKBACK_DAYS = int(os.getenv("MANDI_SYNC_LOOKBACK_DAYS", "7"))
+# Searches answer from the most recent N arrival dates stored for a crop
+MANDI_RECENT_DAYS = int(os.getenv("MANDI_RECENT_DAYS", "3"))
+# Trend endpoint defaults: history length and rolling-average window, in days
+MANDI_TREND_DAYS = int(os.getenv("MANDI_TREND_DAYS", "30"))
+MANDI_TREND_WINDOW = int(os.getenv("MANDI_TREND_WINDOW", "7"))
+
+# ✅ Weather cache (entries expire at the end of the current 3-hour forecast slot)
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "512"))
+# "sqlite" shares entries between workers through CACHE_DIR; "memory" keeps them per process
+WEATHER_CACHE_BACKEND = os.getenv("WEATHER_CACHE_BACKEND", "sqlite")
+
+# ✅ RAG retrieval
+# Each retriever gets this long to answer; slower sources are dropped from that query
+RAG_SOURCE_DEADLINE_SECONDS = float(os.getenv("RAG_SOURCE_DEADLINE_SECONDS", "4"))
+# Context compression: keep the top N reranked documents and only ask the LLM to
+# compress them when they don't already fit this many tokens
+RAG_COMPRESS_TOP_N = int(os.getenv("RAG_COMPRESS_TOP_N", "5"))
+RAG_CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKEN_BUDGET", "1500"))
+
+# ✅ Reranking
+# "auto" uses the cross-encoder when sentence-transformers is installed, else BM25
+RERANKER_BACKEND = os.getenv("RERANKER_BACKEND", "auto")
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANKER_BATCH_SIZE = int(os.getenv("RERANKER_BATCH_SIZE", "16"))
+# Long pages are split into passages of about this many tokens before scoring
+RERANKER_PASSAGE_TOKENS = int(os.getenv("RERANKER_PASSAGE_TOKENS", "160"))
+CROP_CARE_CONTEXT_TOKEN_BUDGET = int(os.getenv("CROP_CARE_CONTEXT_TOKEN_BUDGET", "1500"))
+
+# ✅ Vector store (schemes)
+# "local" keeps a memory-mapped NumPy index in VECTOR_STORE_DIR; "pinecone" uses the remote index
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "local")
+VECTOR_STORE_DIR = os.getenv("VECTOR_STORE_DIR", os.path.join(CACHE_DIR, "vector_store"))
+PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "schemes")
+# Chunks embedded per model call during ingestion
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "32"))
+
+# ✅ Embeddings
+# Query/document embeddings are cached in memory and in SQLite (float32 blobs) by model + text
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIR, "embeddings.sqlite"))
+# Any sentence-transformers model; e5 models ("intfloat/e5-small-v2", "intfloat/multilingual-e5-small", ...)
+# get their "query: " / "passage: " prefixes automatically. Changing it re-embeds the corpus.
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "intfloat/e5-large-v2")
+# "torch", "onnx" (ONNX Runtime fp32) or "onnx-int8" (dynamically quantized, exported once into CACHE_DIR);
+# the ONNX backends need `pip install optimum[onnxruntime]`
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_QUANTIZATION = os.getenv("EMBEDDING_QUANTIZATION", "avx2")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+# Hybrid scheme retrieval: BM25 and dense candidates per query, fused with reciprocal rank fusion
+RAG_HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", "20"))
+RAG_RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+
+# ✅ Semantic answer cache (/chat)
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# Cosine similarity of the English query embeddings needed to reuse an answer
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "2000"))
+# Per-intent TTLs in seconds ("intent=seconds,..."); time-sensitive modules expire fast
+ANSWER_CACHE_TTLS = {
+    intent: float(seconds)
+    for intent, seconds in (
+        item.split("=", 1) for item in _csv_env(
+            "ANSWER_CACHE_TTLS", "weather=1800,mandi_prices=3600,schemes=604800,agriculture_info=604800"
+        )
+    )
+}
+
+# ✅ Translation (Google Cloud Translate)
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "4096"))
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", os.path.join(CACHE_DIR, "translations.sqlite"))
+# Cached translations and detections expire after this many seconds (0 = never)
+TRANSLATION_CACHE_TTL = float(os.getenv("TRANSLATION_CACHE_TTL", str(30 * 24 * 3600)))
+# Rows kept per table (translations, detections) by the periodic cache purge; 0 = no cap
+TRANSLATION_CACHE_MAX_ROWS = int(os.getenv("TRANSLATION_CACHE_MAX_ROWS", "200000"))
+# Concurrent translate calls to the same language within this window share one RPC
+TRANSLATE_BATCH_WINDOW_MS = float(os.getenv("TRANSLATE_BATCH_WINDOW_MS", "10"))
+TRANSLATE_BATCH_MAX = int(os.getenv("TRANSLATE_BATCH_MAX", "32"))
+# Cloud Translate v3 rejects requests over ~30k codepoints, so batches stay below this
+TRANSLATE_BATCH_MAX_CHARS = int(os.getenv("TRANSLATE_BATCH_MAX_CHARS", "25000"))
+# Detect the language locally when the script identifies it (Tamil, Telugu, ...) instead of calling the API
+LOCAL_LANGUAGE_DETECTION = os.getenv("LOCAL_LANGUAGE_DETECTION", "true").lower() in ("1", "true", "yes")
+
+# ✅ Text-to-speech audio cache (content-addressed MP3s served from /static/audio)
+TTS_AUDIO_DIR = os.getenv("TTS_AUDIO_DIR", os.path.join(BASE_DIR, "app", "static", "audio"))
+TTS_CACHE_MAX_MB = float(os.getenv("TTS_CACHE_MAX_MB", "500"))
+# Files not served for this long are deleted (0 = keep until the size limit evicts them)
+TTS_CACHE_MAX_AGE_DAYS = float(os.getenv("TTS_CACHE_MAX_AGE_DAYS", "30"))
+TTS_JANITOR_INTERVAL_MINUTES = float(os.getenv("TTS_JANITOR_INTERVAL_MINUTES", "30"))
+# Long answers are synthesized as sentence chunks of up to this many characters, concurrently
+TTS_CHUNK_CHARS = int(os.getenv("TTS_CHUNK_CHARS", "250"))
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "4"))
+# Voice used for detected languages no engine has a voice for
+TTS_FALLBACK_LANG = os.getenv("TTS_FALLBACK_LANG", "hi")
+# Engines tried in order ("gtts" = Google, network; "espeak" = local espeak-ng, CPU); a failing
+# engine is skipped for TTS_ENGINE_COOLDOWN_SECONDS after TTS_ENGINE_FAILURES consecutive errors
+TTS_ENGINES = _csv_env("TTS_ENGINES", "gtts,espeak")
+# Per-language engine order, e.g. "or=espeak,en=espeak+gtts" (Odia has no gTTS voice)
+TTS_LANGUAGE_ENGINES = {
+    lang: engines.split("+")
+    for lang, engines in (item.split("=", 1) for item in _csv_env("TTS_LANGUAGE_ENGINES", ""))
+}
+TTS_ENGINE_FAILURES = int(os.getenv("TTS_ENGINE_FAILURES", "2"))
+TTS_ENGINE_COOLDOWN_SECONDS = float(os.getenv("TTS_ENGINE_COOLDOWN_SECONDS", "60"))
+ESPEAK_BINARY = os.getenv("ESPEAK_BINARY", "espeak-ng")
+
+# ✅ Speech-to-text (Whisper in a pool of worker processes)
+# "whisper" (openai-whisper, PyTorch) or "faster-whisper" (CTranslate2, int8 on CPU; pip install faster-whisper)
+STT_BACKEND = os.getenv("STT_BACKEND", "whisper")
+STT_MODEL_SIZE = os.getenv("STT_MODEL_SIZE", "small")
+# Per-language model sizes, e.g. "en=base,hi=small"; sizes listed here are loaded at startup too
+STT_LANGUAGE_MODELS = dict(item.split("=", 1) for item in _csv_env("STT_LANGUAGE_MODELS", ""))
+# CTranslate2 compute type for faster-whisper ("int8", "int8_float32", "float32")
+STT_COMPUTE_TYPE = os.getenv("STT_COMPUTE_TYPE", "int8")
+STT_WORKERS = int(os.getenv("STT_WORKERS", "2"))
+# Uploads waiting for a worker beyond this are rejected with 503 instead of piling up
+STT_QUEUE_SIZE = int(os.getenv("STT_QUEUE_SIZE", "8"))
+STT_THREADS_PER_WORKER = int(os.getenv("STT_THREADS_PER_WORKER", str(max(1, (os.cpu_count() or 2) // max(1, STT_WORKERS)))))
+# ffmpeg decodes running longer than this are killed, so a bad upload can't pin a worker
+STT_DECODE_TIMEOUT_SECONDS = float(os.getenv("STT_DECODE_TIMEOUT_SECONDS", "60"))
+# Uploads larger than this are rejected with 413 (they are decoded in memory)
+STT_MAX_UPLOAD_MB = float(os.getenv("STT_MAX_UPLOAD_MB", "25"))
@@ -0,0 +1,216 @@
+# backend/app/core/container.py
+
+import os
+import asyncio
+import time
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def get_rss_bytes() -> int:
+    """
+    Returns the resident set size of the current process in bytes, or 0 if it can't be measured.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+@dataclass
+class ServiceLoadStats:
+    name: str
+    loaded: bool = False
+    load_seconds: float = 0.0
+    rss_delta_mb: float = 0.0
+    error: Optional[str] = None
+
+
+class ServiceContainer:
+    """
+    Process-wide registry of lazily created service singletons.
+
+    Each service is built by its factory the first time it is requested and then shared
+    by every router. Creation is guarded by a per-service lock, so concurrent first
+    requests build a service only once.
+    """
+
+    def __init__(self) -> None:
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, ServiceLoadStats] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        if name in self._factories:
+            raise ValueError(f"Service '{name}' is already registered")
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+        self._stats[name] = ServiceLoadStats(name=name)
+
+    @property
+    def names(self) -> list:
+        return list(self._factories)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        if name not in self._factories:
+            raise KeyError(f"Unknown service '{name}'")
+
+        with self._locks[name]:
+            # Another thread may have finished loading while we waited for the lock
+            instance = self._instances.get(name)
+            if instance is not None:
+                return instance
+
+            stats = self._stats[name]
+            rss_before = get_rss_bytes()
+            start = time.perf_counter()
+            try:
+                instance = self._factories[name]()
+            except Exception as e:
+                stats.error = str(e)
+                logger.error(f"❌ Failed to load service '{name}': {e}")
+                raise
+
+            stats.loaded = True
+            stats.error = None
+            stats.load_seconds = round(time.perf_counter() - start, 3)
+            # Approximate: other threads loading at the same time also count towards the delta
+            stats.rss_delta_mb = round((get_rss_bytes() - rss_before) / (1024 * 1024), 1)
+            self._instances[name] = instance
+            logger.info(
+                f"✅ Service '{name}' loaded in {stats.load_seconds}s "
+                f"(+{stats.rss_delta_mb} MB RSS)"
+            )
+            return instance
+
+    async def aget(self, name: str) -> Any:
+        """
+        Async variant of get(): a service that still has to be loaded is built in a worker
+        thread, so a cold start doesn't block the event loop.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        return await asyncio.to_thread(self.get, name)
+
+    def preload(self, names: Iterable[str]) -> None:
+        """
+        Eagerly loads the given services ("all" loads every registered service).
+        Failures are logged and left for the first request to retry.
+        """
+        names = list(names)
+        if "all" in names:
+            names = self.names
+
+        for name in names:
+            try:
+                self.get(name)
+            except KeyError:
+                logger.warning(f"⚠️ Unknown service in preload list: {name}")
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "process_rss_mb": round(get_rss_bytes() / (1024 * 1024), 1),
+            "services": [asdict(stats) for stats in self._stats.values()],
+        }
+
+    def shutdown(self) -> None:
+        for name, instance in list(self._instances.items()):
+            close = getattr(instance, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.error(f"❌ Error while closing service '{name}': {e}")
+        self._instances.clear()
+        logger.info("🛑 Service container shut down")
+
+
+def build_service_container() -> ServiceContainer:
+    """
+    Registers every backend service. Imports happen inside the factories so that
+    heavy dependencies (torch, whisper, Google clients) load only when needed.
+    """
+    container = ServiceContainer()
+
+    def language():
+        from app.services.language_utils import LanguageService
+        return LanguageService()
+
+    def intent():
+        from app.services.intent_recognizer import IntentRecognizer
+        return IntentRecognizer()
+
+    def entity_extractor():
+        from app.services.location_crop_extractor import EntityExtractor
+        return EntityExtractor()
+
+    def mandi_store():
+        from app.services.mandi_store import MandiPriceStore
+        return MandiPriceStore()
+
+    def mandi():
+        from app.services.mandi_service import MandiPriceService
+        return MandiPriceService(store=container.get("mandi_store"))
+
+    def schemes():
+        from app.services.schemes_service import SchemesRAGService
+        return SchemesRAGService()
+
+    def crop_care():
+        from app.services.crop_care_service import CropCareRAGService
+        return CropCareRAGService()
+
+    def answer_cache():
+        from app.services.answer_cache import SemanticAnswerCache
+        from app.services.embeddings import get_embeddings
+        return SemanticAnswerCache(get_embeddings())
+
+    def query_understanding():
+        from app.services.query_understanding import QueryUnderstandingService
+        return QueryUnderstandingService(
+            container.get("intent"), container.get("entity_extractor"), container.get("mandi")
+        )
+
+    def speech_to_text():
+        from app.services.speech_utils.speech_to_text import SpeechToTextService
+        return SpeechToTextService()
+
+    def text_to_speech():
+        from app.services.speech_utils.text_to_speech import TextToSpeechService
+        return TextToSpeechService()
+
+    container.register("language", language)
+    container.register("intent", intent)
+    container.register("entity_extractor", entity_extractor)
+    container.register("mandi_store", mandi_store)
+    container.register("mandi", mandi)
+    container.register("schemes", schemes)
+    container.register("crop_care", crop_care)
+    container.register("answer_cache", answer_cache)
+    container.register("query_understanding", query_understanding)
+    container.register("speech_to_text", speech_to_text)
+    container.register("text_to_speech", text_to_speech)
+
+    return container
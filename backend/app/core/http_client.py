@@ -0,0 +1,434 @@
+# backend/app/core/http_client.py
+
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import (
+    HTTP_BACKOFF_SECONDS,
+    HTTP_BREAKER_COOLDOWN_SECONDS,
+    HTTP_BREAKER_THRESHOLD,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_MAX_CONCURRENCY_PER_HOST,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_SIZE,
+    HTTP_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LATENCY_SAMPLES = 500
+
+
+class UpstreamUnavailable(Exception):
+    """
+    Raised instead of calling a host whose circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures; after `cooldown` seconds one trial
+    request is let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, threshold: int = HTTP_BREAKER_THRESHOLD, cooldown: float = HTTP_BREAKER_COOLDOWN_SECONDS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        Gives back a claimed half-open trial without an outcome, e.g. when the caller was
+        cancelled by its own deadline. Without this the circuit would stay open for good.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.failures >= self.threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class HostStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.new_connections = 0  # httpx clients only; the requests pool reports its own counts
+        self.latencies_ms: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def snapshot(self, sync_connections: int = 0) -> dict:
+        latencies = sorted(self.latencies_ms)
+        new_connections = self.new_connections + sync_connections
+
+        def pct(p: float) -> Optional[float]:
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 1) if latencies else None
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rejected_by_breaker": self.rejected,
+            "new_connections": new_connections,
+            "connection_reuse_rate": round(1 - new_connections / self.requests, 3) if self.requests else None,
+            "latency_p50_ms": pct(50),
+            "latency_p95_ms": pct(95),
+        }
+
+
+class _Host:
+    def __init__(self) -> None:
+        self.stats = HostStats()
+        self.breaker = CircuitBreaker()
+        self.semaphore = threading.BoundedSemaphore(HTTP_MAX_CONCURRENCY_PER_HOST)
+        self.async_semaphore: Optional[asyncio.Semaphore] = None
+
+
+_hosts: Dict[str, _Host] = {}
+_hosts_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_sdk_clients: Optional[Tuple[httpx.Client, httpx.AsyncClient]] = None
+
+
+def _host(url: str) -> _Host:
+    name = urlsplit(url).netloc
+    with _hosts_lock:
+        if name not in _hosts:
+            _hosts[name] = _Host()
+        return _hosts[name]
+
+
+def _async_semaphore(host: _Host) -> asyncio.Semaphore:
+    if host.async_semaphore is None:
+        host.async_semaphore = asyncio.Semaphore(HTTP_MAX_CONCURRENCY_PER_HOST)
+    return host.async_semaphore
+
+
+def _connect_tracer(host: _Host):
+    # httpcore only emits connect events when it has to open a new connection
+    def trace(event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            host.stats.new_connections += 1
+    return trace
+
+
+def _async_connect_tracer(host: _Host):
+    sync_trace = _connect_tracer(host)
+
+    async def trace(event: str, info: dict) -> None:
+        sync_trace(event, info)
+    return trace
+
+
+def _backoff(attempt: int) -> float:
+    # "Full jitter": uniform in [0, base * 2^attempt], so retries from many workers spread out
+    return random.uniform(0, HTTP_BACKOFF_SECONDS * (2 ** attempt))
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide requests session (pooled keep-alive connections).
+    Prefer `request()`, which adds timeouts, retries and the circuit breaker.
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide async HTTP client (keep-alive connections are reused across requests).
+    """
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=HTTP_POOL_SIZE * 5, max_keepalive_connections=HTTP_POOL_SIZE),
+        )
+    return _async_client
+
+
+def request(method: str, url: str, *, retries: int = HTTP_MAX_RETRIES, timeout: Optional[float] = None,
+            **kwargs) -> requests.Response:
+    """
+    Blocking request through the shared session with a per-host concurrency limit,
+    timeouts, jittered retries and a per-host circuit breaker. Returns the last
+    response (callers still check status codes) or raises after the final attempt.
+    """
+    host = _host(url)
+    session = get_session()
+    timeout = (HTTP_CONNECT_TIMEOUT_SECONDS, timeout or HTTP_TIMEOUT_SECONDS)
+
+    for attempt in range(retries + 1):
+        if not host.breaker.allow():
+            host.stats.rejected += 1
+            raise UpstreamUnavailable(f"Circuit open for {urlsplit(url).netloc}")
+
+        start = time.perf_counter()
+        try:
+            with host.semaphore:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            error, response = e, None
+        except BaseException:
+            # Anything else must still settle a half-open trial
+            host.breaker.record_failure()
+            raise
+        else:
+            error = None
+        finally:
+            host.stats.requests += 1
+            host.stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        if error is None and response.status_code not in RETRY_STATUSES:
+            host.breaker.record_success()
+            return response
+
+        host.stats.errors += 1
+        if error is not None or response.status_code >= 500:
+            host.breaker.record_failure()
+        else:
+            # 429 says nothing about the host's health, but must give back a half-open trial
+            host.breaker.release()
+        if attempt == retries:
+            if error is not None:
+                raise error
+            return response
+
+        host.stats.retries += 1
+        delay = _backoff(attempt)
+        logger.warning(f"⚠️ {method} {urlsplit(url).netloc} failed ({error or response.status_code}), "
+                       f"retry {attempt + 1}/{retries} in {delay:.2f}s")
+        time.sleep(delay)
+
+
+async def arequest(method: str, url: str, *, retries: int = HTTP_MAX_RETRIES, timeout: Optional[float] = None,
+                   **kwargs) -> httpx.Response:
+    """
+    Async variant of request() on the shared httpx client.
+    """
+    host = _host(url)
+    semaphore = _async_semaphore(host)
+    client = get_async_client()
+    timeout = httpx.Timeout(timeout or HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS)
+    trace = _async_connect_tracer(host)
+
+    for attempt in range(retries + 1):
+        if not host.breaker.allow():
+            host.stats.rejected += 1
+            raise UpstreamUnavailable(f"Circuit open for {urlsplit(url).netloc}")
+
+        start = time.perf_counter()
+        try:
+            async with semaphore:
+                response = await client.request(
+                    method, url, timeout=timeout, extensions={"trace": trace}, **kwargs
+                )
+        except httpx.HTTPError as e:
+            error, response = e, None
+        except asyncio.CancelledError:
+            # Cancelled by the caller's deadline: says nothing about the host
+            host.breaker.release()
+            raise
+        except BaseException:
+            host.breaker.record_failure()
+            raise
+        else:
+            error = None
+        finally:
+            host.stats.requests += 1
+            host.stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        if error is None and response.status_code not in RETRY_STATUSES:
+            host.breaker.record_success()
+            return response
+
+        host.stats.errors += 1
+        if error is not None or response.status_code >= 500:
+            host.breaker.record_failure()
+        else:
+            # 429 says nothing about the host's health, but must give back a half-open trial
+            host.breaker.release()
+        if attempt == retries:
+            if error is not None:
+                raise error
+            return response
+
+        host.stats.retries += 1
+        delay = _backoff(attempt)
+        logger.warning(f"⚠️ {method} {urlsplit(url).netloc} failed ({error or response.status_code}), "
+                       f"retry {attempt + 1}/{retries} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+
+def _settle(host: _Host, status_code: int) -> None:
+    # Same outcome rules as request(): 5xx is a host failure, 429 is neither
+    if status_code not in RETRY_STATUSES:
+        host.breaker.record_success()
+        return
+    host.stats.errors += 1
+    if status_code >= 500:
+        host.breaker.record_failure()
+    else:
+        host.breaker.release()
+
+
+class GuardedTransport(httpx.HTTPTransport):
+    """
+    httpx transport for clients handed to vendor SDKs (Groq): each request gets the
+    per-host circuit breaker, concurrency limit and /http/stats accounting of request().
+    Retries stay with the SDK, which sees an open circuit as a connection error.
+    """
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = _host(str(request.url))
+        if not host.breaker.allow():
+            host.stats.rejected += 1
+            raise UpstreamUnavailable(f"Circuit open for {request.url.host}")
+
+        request.extensions["trace"] = _connect_tracer(host)
+        start = time.perf_counter()
+        try:
+            with host.semaphore:
+                response = super().handle_request(request)
+        except BaseException:
+            host.stats.errors += 1
+            host.breaker.record_failure()
+            raise
+        finally:
+            host.stats.requests += 1
+            host.stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+        _settle(host, response.status_code)
+        return response
+
+
+class AsyncGuardedTransport(httpx.AsyncHTTPTransport):
+    """
+    Async variant of GuardedTransport.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = _host(str(request.url))
+        if not host.breaker.allow():
+            host.stats.rejected += 1
+            raise UpstreamUnavailable(f"Circuit open for {request.url.host}")
+
+        request.extensions["trace"] = _async_connect_tracer(host)
+        start = time.perf_counter()
+        try:
+            async with _async_semaphore(host):
+                response = await super().handle_async_request(request)
+        except asyncio.CancelledError:
+            host.breaker.release()
+            raise
+        except BaseException:
+            host.stats.errors += 1
+            host.breaker.record_failure()
+            raise
+        finally:
+            host.stats.requests += 1
+            host.stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+        _settle(host, response.status_code)
+        return response
+
+
+def get_sdk_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Returns the process-wide (sync, async) httpx clients for SDKs that accept one,
+    pooled and guarded like request()/arequest().
+    """
+    global _sdk_clients
+    if _sdk_clients is None:
+        limits = httpx.Limits(max_connections=HTTP_POOL_SIZE * 5, max_keepalive_connections=HTTP_POOL_SIZE)
+        timeout = httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS)
+        _sdk_clients = (
+            httpx.Client(transport=GuardedTransport(limits=limits), timeout=timeout),
+            httpx.AsyncClient(transport=AsyncGuardedTransport(limits=limits), timeout=timeout),
+        )
+    return _sdk_clients
+
+
+def _sync_pool_connections() -> Dict[str, int]:
+    # urllib3 counts the connections each host pool has opened (num_connections)
+    opened: Dict[str, int] = {}
+    if _session is None:
+        return opened
+    for adapter in set(_session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            netloc = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+            opened[netloc] = opened.get(netloc, 0) + pool.num_connections
+    return opened
+
+
+def http_stats() -> dict:
+    sync_connections = _sync_pool_connections()
+    stats = {}
+    for name, host in list(_hosts.items()):
+        snapshot = host.stats.snapshot(sync_connections.get(name, 0))
+        stats[name] = {**snapshot, "circuit": host.breaker.state}
+    return stats
+
+
+async def close_async_client() -> None:
+    global _async_client, _session, _sdk_clients
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+    _async_client = None
+    if _sdk_clients is not None:
+        sdk_client, sdk_async_client = _sdk_clients
+        sdk_client.close()
+        await sdk_async_client.aclose()
+        _sdk_clients = None
+    if _session is not None:
+        _session.close()
+        _session = None
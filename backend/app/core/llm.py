@@ -0,0 +1,40 @@
+# backend/app/core/llm.py
+
+import os
+import logging
+from functools import lru_cache
+
+from langchain_groq import ChatGroq
+
+from app.core.config import LLM_MAX_RETRIES, LLM_MODEL, LLM_TIMEOUT_SECONDS
+from app.core.http_client import get_sdk_clients
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_llm(temperature: float = None, json_mode: bool = False) -> ChatGroq:
+    """
+    Returns a shared ChatGroq client for the given settings. Services share instances
+    (and the shared guarded httpx clients, so Groq calls get the per-host circuit
+    breaker, concurrency limit and /http/stats of every other upstream) instead of
+    building one per call, and every call gets a timeout and bounded SDK retries.
+    """
+    kwargs = {}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    if json_mode:
+        kwargs["model_kwargs"] = {"response_format": {"type": "json_object"}}
+
+    http_client, http_async_client = get_sdk_clients()
+    llm = ChatGroq(
+        api_key=os.getenv("GROQ_API_KEY"),
+        http_client=http_client,
+        http_async_client=http_async_client,
+        model_name=LLM_MODEL,
+        timeout=LLM_TIMEOUT_SECONDS,
+        max_retries=LLM_MAX_RETRIES,
+        **kwargs,
+    )
+    logger.info(f"✅ Groq LLM client created ({LLM_MODEL}, temperature={temperature}, json_mode={json_mode})")
+    return llm
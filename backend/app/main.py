@@ -1,22 +1,75 @@
 # backend/app/main.py
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles 
 from dotenv import load_dotenv
 from app.api.routes import create_router
+from app.core.cache import run_cache_purge
+from app.core.config import (
+    CACHE_PURGE_INTERVAL_MINUTES,
+    MANDI_SYNC_INTERVAL_HOURS,
+    PRELOAD_SERVICES,
+    TTS_JANITOR_INTERVAL_MINUTES,
+)
+from app.core.container import build_service_container
+from app.core.executor import shutdown_executor
+from app.core.http_client import close_async_client
 from app.core.logger import setup_logger
+from app.services.mandi_store import run_periodic_sync
+from app.services.speech_utils.audio_cache import run_audio_janitor
 import os  # ✅ NEW
 
 # ✅ Load .env variables
 load_dotenv()
 
-# ✅ Initialize FastAPI
-app = FastAPI(title="Agribot_new Backend")
-
 # ✅ Setup logging
 setup_logger()
 
+# ✅ One shared service container per worker process
+services = build_service_container()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.services = services
+    if PRELOAD_SERVICES:
+        # Load heavy models off the event loop before accepting traffic
+        await asyncio.to_thread(services.preload, PRELOAD_SERVICES)
+
+    # Keep the local mandi price store fresh in the background. Every worker runs this
+    # loop, but a file lock lets only one of them sync at a time; the others skip the tick.
+    sync_task = None
+    if MANDI_SYNC_INTERVAL_HOURS > 0:
+        store = await services.aget("mandi_store")
+        sync_task = asyncio.create_task(run_periodic_sync(store, MANDI_SYNC_INTERVAL_HOURS))
+
+    # Keep the TTS audio cache under its size and age limits
+    janitor_task = None
+    if TTS_JANITOR_INTERVAL_MINUTES > 0:
+        tts = await services.aget("text_to_speech")
+        janitor_task = asyncio.create_task(run_audio_janitor(tts.cache, TTS_JANITOR_INTERVAL_MINUTES))
+
+    # Expired weather/translation rows would otherwise stay in the shared SQLite caches
+    purge_task = None
+    if CACHE_PURGE_INTERVAL_MINUTES > 0:
+        purge_task = asyncio.create_task(run_cache_purge(CACHE_PURGE_INTERVAL_MINUTES))
+
+    yield
+
+    for task in (sync_task, janitor_task, purge_task):
+        if task is not None:
+            task.cancel()
+    services.shutdown()
+    await close_async_client()
+    shutdown_executor()
+
+
+# ✅ Initialize FastAPI
+app = FastAPI(title="Agribot_new Backend", lifespan=lifespan)
+
 # ✅ Serve static files (e.g. speech audio)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # This points to /backend
 STATIC_DIR = os.path.join(BASE_DIR, "static")
@@ -32,7 +85,7 @@ app.add_middleware(
 )
 
 # ✅ Register your routes
-app.include_router(create_router())
+app.include_router(create_router(services))
 
 # ✅ Basic health check route
 @app.get("/")
@@ -0,0 +1,21 @@
+from typing import Literal
+from pydantic import BaseModel, field_validator
+
+
+class QueryUnderstanding(BaseModel):
+    intent: Literal["weather", "mandi_prices", "schemes", "agriculture_info", "unknown"]
+    crop: str = ""
+    city: str = ""
+    state: str = ""
+    district: str = ""
+
+    @field_validator("crop", "city", "state", "district", mode="before")
+    @classmethod
+    def blank_if_missing(cls, value):
+        value = "" if value is None else str(value).strip()
+        return "" if value.lower() in ("none", "null", "unknown", "n/a") else value
+
+    @field_validator("crop")
+    @classmethod
+    def lowercase_crop(cls, value: str) -> str:
+        return value.lower()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class ChatResponse(BaseModel):
     response: str
@@ -8,3 +8,33 @@ class ChatResponse(BaseModel):
     audio_url: Optional[str] = None
     english_response: Optional[str] = None
 
+
+
+class PricePoint(BaseModel):
+    date: str
+    modal_price: float
+    min_price: float
+    max_price: float
+    rolling_avg: float
+
+
+class MarketComparison(BaseModel):
+    market: str
+    district: str
+    date: str
+    modal_price: float
+    change_vs_local_pct: Optional[float] = None
+    same_district: bool
+
+
+class MandiTrendResponse(BaseModel):
+    crop: str
+    state: str
+    district: str
+    scope: str  # "district", or "state" when the district has no history
+    latest_date: Optional[str] = None
+    latest_modal_price: Optional[float] = None
+    week_over_week_pct: Optional[float] = None
+    direction: str = "unknown"  # "up", "down", "flat" or "unknown"
+    series: List[PricePoint] = []
+    markets: List[MarketComparison] = []
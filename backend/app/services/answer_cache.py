@@ -0,0 +1,170 @@
+# backend/app/services/answer_cache.py
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.cache import register_cache
+from app.core.config import ANSWER_CACHE_SIZE, ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_TTLS
+from app.models.query_models import QueryUnderstanding
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAnswer:
+    english: str
+    expires_at: float
+    # language -> (translated answer, audio path)
+    localized: Dict[str, Tuple[str, Optional[str]]] = field(default_factory=dict)
+    hits: int = 0
+
+
+class _Bucket:
+    # Entries that may answer each other: same intent and same entities
+    def __init__(self) -> None:
+        self.vectors: List[np.ndarray] = []
+        self.answers: List[CachedAnswer] = []
+        self.matrix: Optional[np.ndarray] = None
+
+    def add(self, vector: np.ndarray, answer: CachedAnswer) -> None:
+        self.vectors.append(vector)
+        self.answers.append(answer)
+        self.matrix = None
+
+    def prune(self, now: float) -> None:
+        live = [i for i, answer in enumerate(self.answers) if answer.expires_at > now]
+        if len(live) != len(self.answers):
+            self.vectors = [self.vectors[i] for i in live]
+            self.answers = [self.answers[i] for i in live]
+            self.matrix = None
+
+    def best(self, vector: np.ndarray) -> Tuple[Optional[CachedAnswer], float]:
+        if not self.answers:
+            return None, 0.0
+        if self.matrix is None:
+            self.matrix = np.vstack(self.vectors)
+        scores = self.matrix @ vector
+        i = int(np.argmax(scores))
+        return self.answers[i], float(scores[i])
+
+
+def answer_scope(understanding: QueryUnderstanding) -> Tuple[str, ...]:
+    """
+    Bucket key for a query. Weather and mandi answers depend on the place and crop, which
+    embeddings barely separate ("tomato price in Pune" vs "... in Nashik"), so those are
+    part of the key rather than left to the similarity threshold.
+    """
+    intent = understanding.intent
+    if intent == "weather":
+        return intent, understanding.city.lower()
+    if intent == "mandi_prices":
+        return (intent, understanding.crop, understanding.city.lower(),
+                understanding.state.lower(), understanding.district.lower())
+    return (intent,)
+
+
+class SemanticAnswerCache:
+    """
+    Reuses /chat answers for paraphrased questions. Entries are keyed by the embedding of
+    the English query inside an intent/entity bucket, expire after a per-intent TTL, and
+    hold the English answer plus each language's translation and TTS audio.
+    """
+
+    def __init__(self, embeddings, threshold: float = ANSWER_CACHE_THRESHOLD, maxsize: int = ANSWER_CACHE_SIZE,
+                 ttls: Dict[str, float] = ANSWER_CACHE_TTLS) -> None:
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttls = ttls
+        self._buckets: Dict[Tuple[str, ...], _Bucket] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.partial_hits = 0  # English answer reused, new language translated
+        self.misses = 0
+        self.hits_by_intent: Dict[str, int] = {}
+        register_cache("answers", self)
+        logger.info(f"✅ Semantic answer cache ready (threshold={threshold}, ttls={ttls})")
+
+    def embed(self, query: str) -> np.ndarray:
+        vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def lookup(self, scope: Tuple[str, ...], vector: np.ndarray) -> Optional[CachedAnswer]:
+        with self._lock:
+            bucket = self._buckets.get(scope)
+            if bucket is not None:
+                bucket.prune(time.time())
+                answer, score = bucket.best(vector)
+                if answer is not None and score >= self.threshold:
+                    answer.hits += 1
+                    logger.info(f"🎯 Answer cache hit ({scope[0]}, similarity {score:.3f})")
+                    return answer
+            self.misses += 1
+            return None
+
+    def localized(self, answer: CachedAnswer, scope: Tuple[str, ...], lang: str) -> Optional[Tuple[str, str]]:
+        """
+        The cached (text, audio path) for `lang`, if both are still usable. Audio files
+        can be evicted from disk, in which case the caller re-synthesizes.
+        """
+        entry = answer.localized.get(lang)
+        with self._lock:
+            if entry is not None and entry[1] and os.path.exists(entry[1]):
+                self.hits += 1
+                self.hits_by_intent[scope[0]] = self.hits_by_intent.get(scope[0], 0) + 1
+                return entry
+            self.partial_hits += 1
+            return None
+
+    def store(self, scope: Tuple[str, ...], vector: np.ndarray, english: str,
+              lang: str, text: str, audio_path: Optional[str]) -> Optional[CachedAnswer]:
+        ttl = self.ttls.get(scope[0])
+        if not ttl:
+            return None
+        answer = CachedAnswer(english=english, expires_at=time.time() + ttl, localized={lang: (text, audio_path)})
+        with self._lock:
+            self._buckets.setdefault(scope, _Bucket()).add(vector, answer)
+            if len(self) > self.maxsize:
+                self._evict()
+        return answer
+
+    def add_localized(self, answer: CachedAnswer, lang: str, text: str, audio_path: Optional[str]) -> None:
+        with self._lock:
+            answer.localized[lang] = (text, audio_path)
+
+    def _evict(self) -> None:
+        # Drop expired entries first, then the ones closest to expiry
+        now = time.time()
+        for bucket in self._buckets.values():
+            bucket.prune(now)
+        while len(self) > self.maxsize:
+            scope, bucket = min(
+                ((s, b) for s, b in self._buckets.items() if b.answers),
+                key=lambda item: min(a.expires_at for a in item[1].answers),
+            )
+            i = min(range(len(bucket.answers)), key=lambda j: bucket.answers[j].expires_at)
+            del bucket.vectors[i], bucket.answers[i]
+            bucket.matrix = None
+        self._buckets = {s: b for s, b in self._buckets.items() if b.answers}
+
+    def __len__(self) -> int:
+        return sum(len(bucket.answers) for bucket in self._buckets.values())
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.partial_hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "hits_by_intent": dict(self.hits_by_intent),
+            "threshold": self.threshold,
+        }
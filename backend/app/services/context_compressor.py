@@ -0,0 +1,156 @@
+# backend/app/services/context_compressor.py
+
+import json
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.prompts import PromptTemplate
+
+from app.core.config import RAG_COMPRESS_TOP_N, RAG_CONTEXT_TOKEN_BUDGET
+from app.core.llm import get_llm
+from app.core.executor import run_blocking
+from app.services.reranker import get_reranker
+from app.utils.text_utils import estimate_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+BATCH_PROMPT = PromptTemplate.from_template(
+    "For each numbered document below, keep only the parts relevant to answering the user's question.\n"
+    "Return a JSON object mapping each document number to its compressed text, e.g. {{\"1\": \"...\", \"2\": \"...\"}}.\n"
+    "Use an empty string for a document with nothing relevant. Keep each entry under {max_tokens} tokens.\n\n"
+    "User Question: {question}\n\n{documents}"
+)
+
+SINGLE_PROMPT = PromptTemplate.from_template(
+    "Summarize the following document by keeping only the parts relevant to answering the user's question.\n\n"
+    "User Question: {question}\n\nDocument:\n{document}\n\nCompressed Content:"
+)
+
+
+class ContextCompressor:
+    """
+    Reranks retrieved documents, keeps the top N and squeezes them into the context
+    token budget. Documents that already fit their share are passed through untouched;
+    the rest are compressed together in one JSON-mode LLM call, falling back to
+    per-document calls if the batch reply can't be parsed.
+    """
+
+    def __init__(self, llm=None, reranker=None, top_n: int = RAG_COMPRESS_TOP_N,
+                 budget: int = RAG_CONTEXT_TOKEN_BUDGET) -> None:
+        self.llm = llm or get_llm()
+        self.batch_llm = get_llm(temperature=0, json_mode=True) if llm is None else llm
+        self.reranker = reranker or get_reranker()
+        self.top_n = top_n
+        self.budget = budget
+        self.stats = {"queries": 0, "skipped": 0, "batched": 0, "fallbacks": 0, "docs_compressed": 0}
+        logger.info(f"✅ Context compressor ready (top_n={top_n}, budget={budget} tokens)")
+
+    def _plan(self, docs: List[Document], query: str) -> Tuple[List[Document], List[int], int]:
+        """
+        Returns the reranked top-N documents, the indexes of the ones that need
+        compressing, and the per-document token share.
+        """
+        self.stats["queries"] += 1
+        ranked = self.reranker.rerank(query, docs, self.top_n)
+        if sum(estimate_tokens(doc.page_content) for doc in ranked) <= self.budget:
+            self.stats["skipped"] += 1
+            return ranked, [], 0
+
+        share = self.budget // max(1, len(ranked))
+        over = [i for i, doc in enumerate(ranked) if estimate_tokens(doc.page_content) > share]
+        self.stats["docs_compressed"] += len(over)
+        return ranked, over, share
+
+    def _batch_prompt(self, docs: List[Document], query: str, share: int) -> str:
+        # Inputs are capped so one oversized page can't blow up the batch prompt
+        sections = "\n\n".join(
+            f"Document {n}:\n{truncate_to_tokens(doc.page_content, self.budget)}" for n, doc in enumerate(docs, 1)
+        )
+        return BATCH_PROMPT.format(question=query, documents=sections, max_tokens=share)
+
+    @staticmethod
+    def _parse_batch(content: str, count: int) -> Optional[Dict[int, str]]:
+        try:
+            data = json.loads(content)
+            parsed = {int(key): str(value).strip() for key, value in data.items()}
+        except (ValueError, TypeError, AttributeError):
+            return None
+        return parsed if all(n in parsed for n in range(1, count + 1)) else None
+
+    @staticmethod
+    def _assemble(ranked: List[Document], over: List[int], texts: List[Optional[str]], share: int) -> List[Document]:
+        compressed = {i: text for i, text in zip(over, texts)}
+        result = []
+        for i, doc in enumerate(ranked):
+            if i not in compressed:
+                result.append(doc)
+                continue
+            # The LLM may ignore the length limit, and if it failed for this one a truncated
+            # original is kept rather than losing it; either way the text is held to its share
+            text = truncate_to_tokens(compressed[i] if compressed[i] is not None else doc.page_content, share)
+            if text:
+                result.append(Document(page_content=text, metadata=doc.metadata))
+        return result
+
+    def compress(self, docs: List[Document], query: str) -> List[Document]:
+        ranked, over, share = self._plan(docs, query)
+        if not over:
+            return ranked
+
+        targets = [ranked[i] for i in over]
+        texts = None
+        try:
+            response = self.batch_llm.invoke(self._batch_prompt(targets, query, share))
+            parsed = self._parse_batch(response.content, len(targets))
+            if parsed is not None:
+                self.stats["batched"] += 1
+                texts = [parsed[n] for n in range(1, len(targets) + 1)]
+        except Exception as e:
+            logger.error(f"❌ Batched compression failed: {e}")
+
+        if texts is None:
+            self.stats["fallbacks"] += 1
+            logger.warning("⚠️ Falling back to per-document compression")
+            texts = [self._compress_one(doc, query) for doc in targets]
+        return self._assemble(ranked, over, texts, share)
+
+    async def acompress(self, docs: List[Document], query: str) -> List[Document]:
+        # Cross-encoder scoring is CPU work, keep it off the event loop
+        ranked, over, share = await run_blocking(self._plan, docs, query)
+        if not over:
+            return ranked
+
+        targets = [ranked[i] for i in over]
+        texts = None
+        try:
+            response = await self.batch_llm.ainvoke(self._batch_prompt(targets, query, share))
+            parsed = self._parse_batch(response.content, len(targets))
+            if parsed is not None:
+                self.stats["batched"] += 1
+                texts = [parsed[n] for n in range(1, len(targets) + 1)]
+        except Exception as e:
+            logger.error(f"❌ Batched compression failed: {e}")
+
+        if texts is None:
+            self.stats["fallbacks"] += 1
+            logger.warning("⚠️ Falling back to per-document compression")
+            texts = await asyncio.gather(*(self._acompress_one(doc, query) for doc in targets))
+        return self._assemble(ranked, over, list(texts), share)
+
+    def _compress_one(self, doc: Document, query: str) -> Optional[str]:
+        try:
+            response = self.llm.invoke(SINGLE_PROMPT.format(question=query, document=doc.page_content))
+            return response.content.strip()
+        except Exception as e:
+            logger.error(f"❌ Compression failed for a document: {e}")
+            return None
+
+    async def _acompress_one(self, doc: Document, query: str) -> Optional[str]:
+        try:
+            response = await self.llm.ainvoke(SINGLE_PROMPT.format(question=query, document=doc.page_content))
+            return response.content.strip()
+        except Exception as e:
+            logger.error(f"❌ Compression failed for a document: {e}")
+            return None
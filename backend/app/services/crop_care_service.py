@@ -2,23 +2,23 @@ import os
 import logging
 from typing import Dict
 
-from langchain_groq import ChatGroq
 from langchain.prompts import PromptTemplate
 from langchain_core.runnables import RunnableLambda, RunnableParallel, RunnablePassthrough, RunnableSequence
 from langchain_core.documents import Document
 from langchain_community.retrievers import WikipediaRetriever, TavilySearchAPIRetriever
 from langchain_community.utilities import SerpAPIWrapper
 
+from app.core.config import CROP_CARE_CONTEXT_TOKEN_BUDGET
+from app.core.llm import get_llm
+from app.services.reranker import get_reranker, split_passages
+
 logger = logging.getLogger(__name__)
 
 
 class CropCareRAGService:
     def __init__(self) -> None:
         try:
-            self.llm = ChatGroq(
-                api_key=os.getenv("GROQ_API_KEY"),
-                model_name="llama3-8b-8192"
-            )
+            self.llm = get_llm()
             logger.info("✅ Groq LLM initialized for Crop Care")
         except Exception as e:
             logger.error(f"❌ Groq initialization failed: {e}")
@@ -34,6 +34,8 @@ class CropCareRAGService:
             logger.error(f"❌ Retriever initialization failed: {e}")
             raise
 
+        self.reranker = get_reranker()
+
         # Prompt for agricultural expert
         self.crop_care_prompt = PromptTemplate.from_template("""
             You are a highly experienced agricultural expert and advisor.
@@ -74,7 +76,7 @@ class CropCareRAGService:
             "wiki_docs": wiki_runnable,
             "tavily_docs": tavily_runnable,
             "serpapi_result": serpapi_runnable,
-            "question": RunnablePassthrough()
+            "question": RunnableLambda(lambda x: x["question"]),
         })
 
         formatter = RunnableLambda(self.format_docs)
@@ -87,12 +89,17 @@ class CropCareRAGService:
             | self.llm
         )
 
-    @staticmethod
-    def format_docs(inputs: Dict) -> Dict:
+    def format_docs(self, inputs: Dict) -> Dict:
+        # Rank passages from every source together and keep only the best that fit the budget
         all_docs = inputs["wiki_docs"] + inputs["tavily_docs"]
-        context = "\n\n".join([doc.page_content for doc in all_docs])
-        context += f"\n\nSerpAPI Search Result:\n{inputs['serpapi_result']}"
-        return {"context": context, "question": inputs["question"]}
+        if inputs["serpapi_result"]:
+            all_docs.append(Document(page_content=str(inputs["serpapi_result"]), metadata={"source": "serpapi"}))
+        question = inputs["question"]
+        passages = split_passages(all_docs)
+        selected = self.reranker.select(question, passages, CROP_CARE_CONTEXT_TOKEN_BUDGET)
+        logger.info(f"🔢 Kept {len(selected)}/{len(passages)} passages for crop care context")
+        context = "\n\n".join(doc.page_content for doc in selected)
+        return {"context": context, "question": question}
 
     def run_crop_care_pipeline(self, user_query: str) -> str:
         logger.info("🌱 Running Crop Care RAG pipeline")
@@ -102,3 +109,12 @@ class CropCareRAGService:
         except Exception as e:
             logger.error(f"❌ Crop Care pipeline failed: {e}")
             return "Sorry, something went wrong while fetching crop care information."
+
+    async def arun_crop_care_pipeline(self, user_query: str) -> str:
+        logger.info("🌱 Running Crop Care RAG pipeline (async)")
+        try:
+            response = await self.rag_chain.ainvoke(user_query)
+            return response.content.strip()
+        except Exception as e:
+            logger.error(f"❌ Crop Care pipeline failed: {e}")
+            return "Sorry, something went wrong while fetching crop care information."
@@ -0,0 +1,259 @@
+# backend/app/services/embeddings.py
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.core.cache import LRUCache, register_cache
+from app.core.config import (
+    CACHE_DIR,
+    EMBEDDING_BACKEND,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_SIZE,
+    EMBEDDING_MODEL,
+    EMBEDDING_QUANTIZATION,
+)
+
+logger = logging.getLogger(__name__)
+
+# Output sizes of the e5 family, so a remote index can be created before the model loads
+EMBEDDING_DIMENSIONS = {
+    "intfloat/e5-small-v2": 384,
+    "intfloat/e5-base-v2": 768,
+    "intfloat/e5-large-v2": 1024,
+    "intfloat/multilingual-e5-small": 384,
+    "intfloat/multilingual-e5-base": 768,
+    "intfloat/multilingual-e5-large": 1024,
+}
+
+
+def embedding_dimension(model_name: str = EMBEDDING_MODEL) -> int:
+    return EMBEDDING_DIMENSIONS.get(model_name, 1024)
+
+
+def embedding_id(model_name: str = EMBEDDING_MODEL, backend: str = EMBEDDING_BACKEND) -> str:
+    """
+    Identifies the vectors a configuration produces (cache keys, ingestion manifest).
+    Backends differ numerically, int8 noticeably, so the backend is part of it.
+    """
+    return f"{model_name}@{backend}"
+
+
+class EmbeddingStore:
+    """
+    SQLite table of float32 embedding blobs keyed by a hash of model + kind + text.
+    Binary rows are ~4 KB for a 1024-dim vector instead of ~20 KB as JSON.
+    """
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self._conn().execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        conn = self._conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()],
+        )
+        conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embedding model with an in-process LRU and a persistent EmbeddingStore.
+    Keys are model + kind (query/passage) + normalized text, so repeated questions skip
+    the model entirely and ingestion only embeds chunks it hasn't seen before. Only
+    passages are persisted: query vectors grow with traffic, so they stay in the LRU.
+    """
+
+    def __init__(self, model: Embeddings, model_name: str, maxsize: int = EMBEDDING_CACHE_SIZE,
+                 store: Optional[EmbeddingStore] = None) -> None:
+        self.model = model
+        self.model_name = model_name
+        self.memory = LRUCache(f"embeddings.{model_name}", maxsize=maxsize)
+        self.store = store if store is not None else EmbeddingStore()
+        self.disk_hits = 0
+        self.computed = 0
+        self.compute_seconds = 0.0
+        register_cache(f"embeddings.{model_name}", self)
+        logger.info(f"✅ Embedding cache ready for {model_name} ({self.store.path})")
+
+    def _key(self, kind: str, text: str) -> str:
+        # Only whitespace is normalized: some models (multilingual e5) are cased
+        raw = f"{self.model_name}\n{kind}\n{' '.join(text.split())}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _lookup(self, kind: str, texts: List[str], compute, persist: bool = True) -> List[List[float]]:
+        keys = [self._key(kind, text) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            vector = self.memory.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                vectors[key] = vector
+
+        if missing and persist:
+            try:
+                found = self.store.get_many(missing)
+            except Exception as e:
+                logger.warning(f"⚠️ Embedding store read failed: {e}")
+                found = {}
+            self.disk_hits += len(found)
+            for key, vector in found.items():
+                self.memory.set(key, vector)
+            vectors.update(found)
+
+        todo = [key for key in missing if key not in vectors]
+        if todo:
+            text_by_key = dict(zip(keys, texts))
+            start = time.perf_counter()
+            computed = compute([text_by_key[key] for key in todo])
+            self.compute_seconds += time.perf_counter() - start
+            self.computed += len(todo)
+            fresh = dict(zip(todo, computed))
+            for key, vector in fresh.items():
+                self.memory.set(key, vector)
+            if persist:
+                try:
+                    self.store.set_many(fresh)
+                except Exception as e:
+                    logger.warning(f"⚠️ Embedding store write failed: {e}")
+            vectors.update(fresh)
+
+        return [vectors[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._lookup("passage", texts, self.model.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._lookup("query", [text], lambda batch: [self.model.embed_query(batch[0])], persist=False)[0]
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        lookups = memory["hits"] + memory["misses"]
+        return {
+            **memory,
+            "disk_hits": self.disk_hits,
+            "computed": self.computed,
+            "hit_rate": round((memory["hits"] + self.disk_hits) / lookups, 3) if lookups else None,
+            "compute_seconds": round(self.compute_seconds, 3),
+            "shared_backend": self.store.path,
+        }
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    sentence-transformers model on CPU with a torch, ONNX Runtime or int8-quantized ONNX
+    backend. e5 models are trained with "query: " / "passage: " prefixes, which are
+    added here so callers never have to.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, backend: str = EMBEDDING_BACKEND,
+                 batch_size: int = EMBEDDING_BATCH_SIZE) -> None:
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        is_e5 = "e5" in model_name.split("/")[-1].lower()
+        self.query_prefix = "query: " if is_e5 else ""
+        self.passage_prefix = "passage: " if is_e5 else ""
+
+        start = time.perf_counter()
+        self.model = self._load()
+        self.load_seconds = time.perf_counter() - start
+        logger.info(f"✅ Embedding model {model_name} loaded ({backend}) in {self.load_seconds:.1f}s")
+
+    def _load(self):
+        from sentence_transformers import SentenceTransformer
+
+        # sentence-transformers only imports optimum once it is loading, with a less helpful error
+        if self.backend in ("onnx", "onnx-int8") and not all(map(find_spec, ("optimum", "onnxruntime"))):
+            raise RuntimeError(
+                f"EMBEDDING_BACKEND={self.backend} needs ONNX Runtime support: "
+                "pip install 'optimum[onnxruntime]' (or use EMBEDDING_BACKEND=torch)"
+            )
+        if self.backend == "torch":
+            return SentenceTransformer(self.model_name, device="cpu")
+        if self.backend == "onnx":
+            return SentenceTransformer(self.model_name, device="cpu", backend="onnx")
+        if self.backend == "onnx-int8":
+            return self._load_quantized(SentenceTransformer)
+        raise ValueError(f"Unknown embedding backend '{self.backend}'")
+
+    def _load_quantized(self, SentenceTransformer):
+        # Dynamic int8 quantization needs no calibration data; the result is exported once
+        # into CACHE_DIR and loaded from there afterwards
+        save_dir = os.path.join(CACHE_DIR, "onnx", self.model_name.replace("/", "__"))
+        file_name = f"onnx/model_qint8_{EMBEDDING_QUANTIZATION}.onnx"
+        if not os.path.exists(os.path.join(save_dir, file_name)):
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+
+            logger.info(f"📦 Quantizing {self.model_name} to int8 ({EMBEDDING_QUANTIZATION}) in {save_dir}")
+            model = SentenceTransformer(self.model_name, device="cpu", backend="onnx")
+            model.save(save_dir)
+            export_dynamic_quantized_onnx_model(model, EMBEDDING_QUANTIZATION, save_dir)
+        return SentenceTransformer(save_dir, device="cpu", backend="onnx", model_kwargs={"file_name": file_name})
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode([self.passage_prefix + text for text in texts])
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([self.query_prefix + text])[0]
+
+
+@lru_cache(maxsize=None)
+def get_embeddings(model_name: str = EMBEDDING_MODEL, backend: str = EMBEDDING_BACKEND) -> CachedEmbeddings:
+    """
+    Shared cached embedding model per configuration (retrieval and the answer cache use the same one).
+    """
+    return CachedEmbeddings(SentenceTransformerEmbeddings(model_name, backend), embedding_id(model_name, backend))
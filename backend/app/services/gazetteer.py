@@ -0,0 +1,156 @@
+# backend/app/services/gazetteer.py
+
+import re
+import csv
+import logging
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+from app.core.cache import SQLiteKVStore
+from app.core.config import GAZETTEER_PATH, GAZETTEER_FUZZY_CUTOFF
+from app.utils.text_utils import has_devanagari, phonetic_key, transliterate_devanagari
+
+logger = logging.getLogger(__name__)
+
+# Generic words people add around place names ("Pune city", "Nashik district")
+_PLACE_NOISE = re.compile(r"\b(city|town|district|dist|zila|jila|village|mandi|market|india)\b")
+_KIND_ORDER = {"city": 0, "district": 1, "state": 2, "learned": 0}
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    kind: str  # "city", "district", "state" or "learned" (LLM fallback result)
+    district: str
+    state: str
+    priority: int = 0
+
+
+def normalize_place_name(name: str) -> str:
+    if has_devanagari(name):
+        name = transliterate_devanagari(name)
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).lower()
+    name = name.replace("&", " and ")
+    name = re.sub(r"[^a-z0-9 ]+", " ", name)
+    # Keep the word itself when it is the whole name (Mandi is also a district)
+    name = _PLACE_NOISE.sub(" ", name).strip() or name
+    return re.sub(r"\s+", " ", name).strip()
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    """
+    In-memory index of Indian states, districts and towns loaded from the bundled CSV.
+
+    Lookups try, in order: the normalized name, a phonetic key (which absorbs spelling
+    and transliteration variants such as "Nasik"/"नासिक"), and a trigram-narrowed fuzzy
+    match. Places resolved by the LLM fallback are remembered in a persistent store and
+    indexed like bundled ones.
+    """
+
+    def __init__(self, path: str = GAZETTEER_PATH, learned_store: Optional[SQLiteKVStore] = None) -> None:
+        self.learned_store = learned_store
+        self._by_name: Dict[str, List[Place]] = defaultdict(list)
+        self._by_key: Dict[str, List[Place]] = defaultdict(list)
+        self._trigram_index: Dict[str, set] = defaultdict(set)
+
+        with open(path, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                place = Place(
+                    name=row["name"],
+                    kind=row["kind"],
+                    district=row["district"],
+                    state=row["state"],
+                    priority=int(row["priority"] or 0),
+                )
+                aliases = [a for a in row["aliases"].split("|") if a]
+                for name in [row["name"], *aliases]:
+                    self._add(name, place)
+
+        learned = 0
+        if self.learned_store is not None:
+            for name, value in self.learned_store.items():
+                self._add(name, Place(name=name, kind="learned", district=value["district"], state=value["state"]))
+                learned += 1
+
+        logger.info(f"✅ Gazetteer loaded: {len(self._by_name)} names ({learned} learned)")
+
+    def _add(self, name: str, place: Place) -> None:
+        normalized = normalize_place_name(name)
+        if not normalized:
+            return
+        if place not in self._by_name[normalized]:
+            self._by_name[normalized].append(place)
+
+        key = phonetic_key(normalized)
+        if key and place not in self._by_key[key]:
+            self._by_key[key].append(place)
+            for gram in _trigrams(key):
+                self._trigram_index[gram].add(key)
+
+    @staticmethod
+    def _best(places: List[Place], state: str = "") -> Optional[Place]:
+        if state:
+            state_key = phonetic_key(normalize_place_name(state))
+            in_state = [p for p in places if phonetic_key(normalize_place_name(p.state)) == state_key]
+            places = in_state or places
+        if not places:
+            return None
+        return min(places, key=lambda p: (-p.priority, _KIND_ORDER.get(p.kind, 3)))
+
+    def lookup(self, name: str, state: str = "") -> Optional[Place]:
+        """
+        Resolves a city/town/district/state name; `state` disambiguates shared names
+        such as Aurangabad or Bilaspur.
+        """
+        normalized = normalize_place_name(name or "")
+        if not normalized:
+            return None
+
+        places = self._by_name.get(normalized)
+        if places:
+            return self._best(places, state)
+
+        key = phonetic_key(normalized)
+        places = self._by_key.get(key)
+        if places:
+            return self._best(places, state)
+
+        match = self._fuzzy_key(key)
+        return self._best(self._by_key[match], state) if match else None
+
+    def _fuzzy_key(self, key: str) -> Optional[str]:
+        if len(key) < 4:
+            return None
+
+        counts: Dict[str, int] = defaultdict(int)
+        for gram in _trigrams(key):
+            for candidate in self._trigram_index.get(gram, ()):
+                counts[candidate] += 1
+
+        best, best_score = None, GAZETTEER_FUZZY_CUTOFF
+        for candidate in sorted(counts, key=counts.get, reverse=True)[:20]:
+            score = SequenceMatcher(None, key, candidate).ratio()
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def remember(self, name: str, state: str, district: str) -> None:
+        """
+        Stores a place resolved elsewhere (e.g. by the LLM) so the next lookup is local.
+        """
+        normalized = normalize_place_name(name)
+        if not normalized or not state:
+            return
+        self._add(normalized, Place(name=normalized, kind="learned", district=district, state=state))
+        if self.learned_store is not None:
+            self.learned_store.set(normalized, {"state": state, "district": district})
+        logger.info(f"📌 Gazetteer learned: {name} -> {district}, {state}")
@@ -0,0 +1,132 @@
+# backend/app/services/hybrid_search.py
+
+import re
+import math
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.services.reranker import content_tokens
+from app.services.vector_store import Filter, matches_filter
+
+logger = logging.getLogger(__name__)
+
+ALNUM = re.compile(r"[a-z0-9]+")
+# Longest scheme title we try to match as a phrase, in words
+MAX_NAME_WORDS = 12
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = 60) -> List[str]:
+    """
+    Fuses ranked id lists: score(id) = sum 1 / (k + rank). Rank-based, so BM25 and
+    cosine scores never have to be put on the same scale.
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, id_ in enumerate(ranking, 1):
+            scores[id_] += 1.0 / (k + rank)
+    return sorted(scores, key=lambda id_: -scores[id_])
+
+
+def _squash(text: str) -> str:
+    # "PM-KISAN", "pm kisan" and "PMKISAN" all become "pmkisan"
+    return "".join(ALNUM.findall(text.lower()))
+
+
+class SparseIndex:
+    """
+    In-memory BM25 inverted index over chunk text plus the scheme's title and tags.
+    Per-posting BM25 weights are precomputed, so a query is a few numpy scatter-adds.
+    """
+
+    def __init__(self, docs: List[Document], k1: float = 1.5, b: float = 0.75) -> None:
+        self.docs = docs
+        fields = [
+            content_tokens(" ".join([doc.page_content, doc.metadata.get("title", ""), *doc.metadata.get("tags", [])]))
+            for doc in docs
+        ]
+        lengths = np.array([len(tokens) for tokens in fields], dtype=np.float32)
+        avg_len = float(lengths.mean()) if len(docs) else 1.0
+
+        postings: Dict[str, List[tuple]] = defaultdict(list)
+        for i, tokens in enumerate(fields):
+            for term, tf in Counter(tokens).items():
+                postings[term].append((i, tf))
+
+        n = len(docs)
+        self.postings: Dict[str, tuple] = {}
+        for term, entries in postings.items():
+            idx = np.array([i for i, _ in entries], dtype=np.int64)
+            tf = np.array([t for _, t in entries], dtype=np.float32)
+            idf = math.log(1 + (n - len(entries) + 0.5) / (len(entries) + 0.5))
+            weights = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[idx] / avg_len))
+            self.postings[term] = (idx, weights.astype(np.float32))
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.docs), dtype=np.float32)
+        for term in set(content_tokens(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                np.add.at(scores, posting[0], posting[1])
+        return scores
+
+    def search(self, query: str, k: int, mask: Optional[np.ndarray] = None) -> List[int]:
+        scores = self.scores(query)
+        if mask is not None:
+            scores = np.where(mask, scores, 0.0)
+        candidates = np.flatnonzero(scores > 0)
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return order[:k].tolist()
+
+
+class SchemeNameIndex:
+    """
+    Maps scheme names and acronyms ("PMFBY", "PM-KISAN", "Rythu Bandhu Scheme") to
+    titles. Matching squashes case, spaces and punctuation, and checks every word
+    n-gram of the query, so it costs microseconds and needs no model.
+    """
+
+    def __init__(self, titles: Iterable[str]) -> None:
+        self.aliases: Dict[str, str] = {}
+        for title in titles:
+            names = [title, re.sub(r"\s*\(.*?\)", "", title)] + re.findall(r"\(([^)]+)\)", title)
+            # "Rythu Bandhu Scheme" is usually asked about as "Rythu Bandhu"
+            names += [re.sub(r"\s+scheme$", "", name, flags=re.I) for name in names]
+            for name in names:
+                alias = _squash(name)
+                # Very short aliases collide with ordinary words
+                if len(alias) >= 3:
+                    self.aliases.setdefault(alias, title)
+
+    def match(self, query: str) -> List[str]:
+        words = ALNUM.findall(query.lower())
+        found: List[str] = []
+        for i in range(len(words)):
+            for n in range(1, min(MAX_NAME_WORDS, len(words) - i) + 1):
+                title = self.aliases.get("".join(words[i:i + n]))
+                if title and title not in found:
+                    found.append(title)
+        return found
+
+
+def infer_filters(query: str, states: Set[str]) -> Filter:
+    """
+    Metadata filters implied by the query: a state named in it limits results to that
+    state's schemes plus central ones; "central scheme(s)" limits to central schemes.
+    """
+    lowered = query.lower()
+    named = [state for state in states if state.lower() in lowered]
+    if named:
+        return {"state": named + [""]}
+    if re.search(r"\bcentral(ly sponsored)?\b", lowered):
+        return {"scope": "Central"}
+    return None
+
+
+def filter_mask(docs: List[Document], where: Filter) -> Optional[np.ndarray]:
+    if not where:
+        return None
+    return np.fromiter((matches_filter(doc.metadata, where) for doc in docs), dtype=bool, count=len(docs))
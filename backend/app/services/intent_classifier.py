@@ -0,0 +1,118 @@
+# backend/app/services/intent_classifier.py
+
+import re
+import math
+import json
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.core.config import INTENT_MODEL_PATH
+from app.utils.text_utils import tokenize, word_ngrams
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IntentPrediction:
+    intent: str
+    confidence: float
+    source: str  # "rules" or "model"
+
+
+class KeywordIntentRules:
+    """
+    High-precision keyword rules. A rule decides only when exactly one intent matches;
+    ambiguous queries ("weather insurance scheme") are left to the model.
+    """
+
+    RULES = {
+        "weather": re.compile(
+            r"\b(weather|forecast|rain\w*|drizzle|temperature|humid\w*|monsoon|storm|thunder\w*|"
+            r"cyclone|heatwave|hailstorm|frost|fog|mausam|barish)\b"
+        ),
+        "mandi_prices": re.compile(
+            r"\b(mandi|bhav|wholesale|market (price|rate)s?|(price|rate)s? (of|for|in)|per quintal)\b"
+        ),
+        "schemes": re.compile(
+            r"\b(scheme|schemes|yojana|subsidy|subsidies|pm[- ]?kisan|pmfby|kisan credit card|kcc|"
+            r"loan waiver|pension|government|sarkari|grant)\b"
+        ),
+        "agriculture_info": re.compile(
+            r"\b(pest|pests|disease|fertili[sz]er|khad|urea|sow|sowing|seedlings?|prune|"
+            r"compost|vermicompost|weeds?|bollworm|aphids?|termite|wilt|blight|fungus|yield)\b"
+        ),
+    }
+
+    def match(self, text: str) -> Optional[str]:
+        text = text.lower()
+        matched = [intent for intent, pattern in self.RULES.items() if pattern.search(text)]
+        return matched[0] if len(matched) == 1 else None
+
+
+class LocalIntentModel:
+    """
+    TF-IDF + logistic regression scorer loaded from the JSON artifact written by
+    scripts/train_intent_classifier.py. Scoring is plain Python, so serving doesn't need scikit-learn.
+    """
+
+    def __init__(self, model_path: str = INTENT_MODEL_PATH) -> None:
+        with open(model_path, encoding="utf-8") as f:
+            artifact = json.load(f)
+
+        self.classes = artifact["classes"]
+        self.vocabulary: Dict[str, int] = artifact["vocabulary"]
+        self.idf = artifact["idf"]
+        self.coef = artifact["coef"]
+        self.intercept = artifact["intercept"]
+        self.ngram_range = tuple(artifact["ngram_range"])
+        self.sublinear_tf = artifact["sublinear_tf"]
+
+    def vectorize(self, text: str) -> Dict[int, float]:
+        terms = word_ngrams(tokenize(text), *self.ngram_range)
+        counts = Counter(self.vocabulary[t] for t in terms if t in self.vocabulary)
+
+        weights = {}
+        for idx, count in counts.items():
+            tf = 1.0 + math.log(count) if self.sublinear_tf else float(count)
+            weights[idx] = tf * self.idf[idx]
+
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if norm:
+            weights = {idx: w / norm for idx, w in weights.items()}
+        return weights
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        weights = self.vectorize(text)
+        scores = [
+            intercept + sum(w * coef[idx] for idx, w in weights.items())
+            for coef, intercept in zip(self.coef, self.intercept)
+        ]
+
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        return {label: e / total for label, e in zip(self.classes, exps)}
+
+    def predict(self, text: str) -> IntentPrediction:
+        proba = self.predict_proba(text)
+        intent = max(proba, key=proba.get)
+        return IntentPrediction(intent=intent, confidence=proba[intent], source="model")
+
+
+class LocalIntentClassifier:
+    """
+    Local tier of intent detection: keyword rules first, then the TF-IDF model.
+    """
+
+    def __init__(self, model_path: str = INTENT_MODEL_PATH) -> None:
+        self.rules = KeywordIntentRules()
+        self.model = LocalIntentModel(model_path)
+        logger.info(f"✅ Local intent classifier loaded ({len(self.model.vocabulary)} terms)")
+
+    def classify(self, text: str) -> IntentPrediction:
+        intent = self.rules.match(text)
+        if intent:
+            return IntentPrediction(intent=intent, confidence=1.0, source="rules")
+        return self.model.predict(text)
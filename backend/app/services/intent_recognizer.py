@@ -1,22 +1,30 @@
 # backend/app/services/intent_recognizer.py
 
-import os
 import logging
-from langchain_groq import ChatGroq
+from typing import Optional
+
+from app.core.config import INTENT_LOCAL_CONFIDENCE
+from app.core.llm import get_llm
+from app.services.intent_classifier import LocalIntentClassifier
+from app.utils.constants import VALID_INTENTS, UNKNOWN_INTENT
 
 logger = logging.getLogger(__name__)
 
 
 class IntentRecognizer:
-    def __init__(self) -> None:
+    def __init__(self, confidence_threshold: float = INTENT_LOCAL_CONFIDENCE) -> None:
         """
-        Initializes the Groq LLM for intent detection.
+        Initializes the local intent classifier and the Groq LLM used as its fallback.
         """
+        self.confidence_threshold = confidence_threshold
+        try:
+            self.local_classifier = LocalIntentClassifier()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Local intent classifier unavailable, using the LLM only: {e}")
+            self.local_classifier = None
+
         try:
-            self.llm = ChatGroq(
-                api_key=os.getenv("GROQ_API_KEY"),
-                model_name="llama3-8b-8192"
-            )
+            self.llm = get_llm()
             logger.info("✅ Groq LLM initialized for intent recognition.")
         except Exception as e:
             logger.error(f"❌ Failed to initialize Groq LLM: {e}")
@@ -31,10 +39,53 @@ class IntentRecognizer:
             - schemes: For government schemes, subsidies, farmer support, or benefits.
             - agriculture_info: For crop care, farming techniques, aquaculture, pest control, machinery, or general agricultural advice.
 
+        The local classifier answers first; the LLM is asked only when its confidence
+        is below the threshold.
+
         Returns the intent name as a lowercase string, or 'unknown' if unclear.
         """
+        return self.detect_local_intent(user_query) or self.detect_intent_llm(user_query)
+
+    async def adetect_intent(self, user_query: str) -> str:
+        """
+        Async variant of detect_intent() using the LLM's native async client.
+        """
+        return self.detect_local_intent(user_query) or await self.adetect_intent_llm(user_query)
+
+    def detect_local_intent(self, user_query: str) -> Optional[str]:
+        """
+        Returns the local classifier's intent if it is confident enough, else None.
+        """
+        if self.local_classifier is None:
+            return None
+
+        prediction = self.local_classifier.classify(user_query)
+        if prediction.confidence < self.confidence_threshold:
+            logger.info(f"🤔 Local intent not confident ({prediction.intent}, {prediction.confidence:.2f}), asking LLM")
+            return None
+
+        logger.info(f"⚡ Local intent ({prediction.source}): {prediction.intent} ({prediction.confidence:.2f})")
+        return prediction.intent
 
-        prompt = (
+    def detect_intent_llm(self, user_query: str) -> str:
+        try:
+            response = self.llm.invoke(self._build_prompt(user_query))
+            return self._parse_intent(response)
+        except Exception as e:
+            logger.error(f"❌ Groq API error during intent detection: {e}")
+            return UNKNOWN_INTENT
+
+    async def adetect_intent_llm(self, user_query: str) -> str:
+        try:
+            response = await self.llm.ainvoke(self._build_prompt(user_query))
+            return self._parse_intent(response)
+        except Exception as e:
+            logger.error(f"❌ Groq API error during intent detection: {e}")
+            return UNKNOWN_INTENT
+
+    @staticmethod
+    def _build_prompt(user_query: str) -> str:
+        return (
             "You are an AI assistant classifying user queries for an Indian agricultural chatbot.\n"
             "You must identify the **single best intent** from the following options:\n"
             "- weather: weather forecasts, temperature, rainfall, climate updates.\n"
@@ -46,18 +97,13 @@ class IntentRecognizer:
             "Intent:"
         )
 
-        try:
-            response = self.llm.invoke(prompt)
-            intent = getattr(response, 'content', str(response)).strip().lower()
-            logger.info(f"🔍 Groq detected intent: {intent}")
-
-            valid_intents = ["weather", "mandi_prices", "schemes", "agriculture_info"]
-            if intent not in valid_intents:
-                logger.warning(f"⚠️ Invalid intent detected: {intent}, returning 'unknown'")
-                return "unknown"
+    @staticmethod
+    def _parse_intent(response) -> str:
+        intent = getattr(response, 'content', str(response)).strip().lower()
+        logger.info(f"🔍 Groq detected intent: {intent}")
 
-            return intent
+        if intent not in VALID_INTENTS:
+            logger.warning(f"⚠️ Invalid intent detected: {intent}, returning 'unknown'")
+            return UNKNOWN_INTENT
 
-        except Exception as e:
-            logger.error(f"❌ Groq API error during intent detection: {e}")
-            return "unknown"
+        return intent
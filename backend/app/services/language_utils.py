@@ -1,14 +1,131 @@
+# backend/app/services/language_utils.py
+
+import asyncio
+import hashlib
 import logging
 import os
 import json
+from typing import Awaitable, Callable, Dict, Iterator, List, Set, Tuple
+
 from google.cloud import translate_v3 as translate
 from google.api_core.exceptions import GoogleAPICallError
 from google.oauth2 import service_account
 
+from app.core.cache import SQLiteKVStore, TieredCache, register_cache
+from app.core.config import (
+    LOCAL_LANGUAGE_DETECTION,
+    TRANSLATE_BATCH_MAX,
+    TRANSLATE_BATCH_MAX_CHARS,
+    TRANSLATE_BATCH_WINDOW_MS,
+    TRANSLATION_CACHE_MAX_ROWS,
+    TRANSLATION_CACHE_PATH,
+    TRANSLATION_CACHE_SIZE,
+    TRANSLATION_CACHE_TTL,
+)
+from app.utils.text_utils import detect_script_language
+
 logger = logging.getLogger(__name__)
 
 
+def _text_key(*parts: str) -> str:
+    # Whitespace is collapsed; case and punctuation can change a translation, so they stay
+    raw = "\n".join(parts[:-1] + (" ".join(parts[-1].split()),))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def char_batches(texts: List[str], max_chars: int = TRANSLATE_BATCH_MAX_CHARS,
+                 max_items: int = TRANSLATE_BATCH_MAX) -> Iterator[List[str]]:
+    """
+    Splits texts into request-sized batches (a text longer than `max_chars` goes alone).
+    """
+    batch: List[str] = []
+    chars = 0
+    for text in texts:
+        if batch and (chars + len(text) > max_chars or len(batch) >= max_items):
+            yield batch
+            batch, chars = [], 0
+        batch.append(text)
+        chars += len(text)
+    if batch:
+        yield batch
+
+
+class TranslateBatcher:
+    """
+    Coalesces concurrent translate calls per target language into one `contents=[...]`
+    RPC. The first request for a language opens a short window; the batch is sent when
+    it closes, when it reaches `max_items`, or before it would exceed `max_chars`
+    (the API's request size limit). Identical texts in a batch are sent once.
+    """
+
+    def __init__(self, send: Callable[[List[str], str], Awaitable[List[str]]],
+                 window_ms: float = TRANSLATE_BATCH_WINDOW_MS, max_items: int = TRANSLATE_BATCH_MAX,
+                 max_chars: int = TRANSLATE_BATCH_MAX_CHARS) -> None:
+        self._send = send
+        self.window = window_ms / 1000
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._chars: Dict[str, int] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()  # running sends; the loop only keeps weak references
+        self.requests = 0
+        self.batches = 0
+        self.texts_sent = 0
+
+    async def translate(self, text: str, target_lang: str) -> str:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._pending.get(target_lang) and self._chars[target_lang] + len(text) > self.max_chars:
+            self._flush(target_lang)
+        queue = self._pending.setdefault(target_lang, [])
+        queue.append((text, future))
+        self._chars[target_lang] = self._chars.get(target_lang, 0) + len(text)
+        self.requests += 1
+        if len(queue) >= self.max_items or self._chars[target_lang] >= self.max_chars:
+            self._flush(target_lang)
+        elif len(queue) == 1:
+            self._timers[target_lang] = loop.call_later(self.window, self._flush, target_lang)
+        return await future
+
+    def _flush(self, target_lang: str) -> None:
+        timer = self._timers.pop(target_lang, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(target_lang, [])
+        self._chars.pop(target_lang, None)
+        if batch:
+            task = asyncio.ensure_future(self._run(batch, target_lang))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]], target_lang: str) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        self.batches += 1
+        self.texts_sent += len(texts)
+        try:
+            results = dict(zip(texts, await self._send(texts, target_lang)))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for text, future in batch:
+            if not future.done():
+                future.set_result(results[text])
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "texts_sent": self.texts_sent,
+            "avg_batch": round(self.texts_sent / self.batches, 2) if self.batches else None,
+            "window_ms": self.window * 1000,
+        }
+
+
 class LanguageService:
+
     def __init__(self, project_id: str = None, location: str = "global") -> None:
         """
         Initialize the Google Cloud Translation Service using credentials from a JSON environment variable.
@@ -28,46 +145,150 @@ class LanguageService:
                 raise ValueError("❌ GOOGLE_PROJECT_ID not set in environment.")
 
             # ✅ Initialize client with credentials
+            self.credentials = credentials
             self.client = translate.TranslationServiceClient(credentials=credentials)
+            self._async_client = None  # created on first use, inside the running event loop
             self.parent = f"projects/{self.project_id}/locations/{location}"
 
+            # ✅ Translations and detections are cached in-process and on disk (shared by workers);
+            # the periodic cache purge drops expired rows and keeps each table under its cap
+            ttl = TRANSLATION_CACHE_TTL or None
+            max_rows = TRANSLATION_CACHE_MAX_ROWS or None
+            self.translations = TieredCache(
+                "translations", maxsize=TRANSLATION_CACHE_SIZE, ttl=ttl,
+                shared=SQLiteKVStore(TRANSLATION_CACHE_PATH, table="translations", max_rows=max_rows),
+            )
+            self.detections = TieredCache(
+                "language_detection", maxsize=TRANSLATION_CACHE_SIZE, ttl=ttl,
+                shared=SQLiteKVStore(TRANSLATION_CACHE_PATH, table="detections", max_rows=max_rows),
+            )
+            self.local_detections = 0
+            self.batcher = TranslateBatcher(self._atranslate_batch)
+            register_cache("language", self)
+
             logger.info("✅ LanguageService initialized with Google Cloud Translate.")
 
         except Exception as e:
             logger.error(f"❌ Failed to initialize Google Cloud Translate: {e}")
             raise
 
+    def _get_async_client(self) -> translate.TranslationServiceAsyncClient:
+        if self._async_client is None:
+            self._async_client = translate.TranslationServiceAsyncClient(credentials=self.credentials)
+        return self._async_client
+
+    def stats(self) -> dict:
+        return {"local_detections": self.local_detections, "translate_batches": self.batcher.stats()}
+
+    def _detect_cached(self, text: str) -> Tuple[str, str]:
+        # (key, language) with language "" on a miss; the script decides when it can
+        if LOCAL_LANGUAGE_DETECTION:
+            lang_code = detect_script_language(text)
+            if lang_code:
+                self.local_detections += 1
+                return "", lang_code
+        key = _text_key(text)
+        return key, self.detections.get(key, "")
+
     def detect_language(self, text: str) -> str:
         """
-        Detect the input language using Google Cloud Translate.
-        Returns the language code (e.g., 'en', 'hi').
+        Detect the input language: from the script when it is unambiguous, else from the
+        cache, else with Google Cloud Translate. Returns the language code (e.g., 'en', 'hi').
         """
+        key, lang_code = self._detect_cached(text)
+        if lang_code:
+            return lang_code
         try:
             response = self.client.detect_language(
                 content=text,
                 parent=self.parent
             )
             lang_code = response.languages[0].language_code.lower()
-            print(f"🔍 Language detected: {lang_code}")
+            logger.info(f"🔍 Language detected: {lang_code}")
+            self.detections.set(key, lang_code)
             return lang_code
         except GoogleAPICallError as e:
-            print(f"Language detection error: {e}")
+            logger.error(f"Language detection error: {e}")
             return "en"
 
+    def translate_texts(self, texts: List[str], target_lang: str = "en") -> List[str]:
+        """
+        Translate several texts in as few RPCs as the request size limit allows; cached
+        ones are not sent.
+        Texts that fail to translate are returned unchanged.
+        """
+        keys = [_text_key(target_lang, text) for text in texts]
+        results = {key: self.translations.get(key) for key in dict.fromkeys(keys)}
+        todo = list(dict.fromkeys(text for key, text in zip(keys, texts) if results[key] is None))
+        for batch in char_batches(todo):
+            try:
+                response = self.client.translate_text(
+                    parent=self.parent,
+                    contents=batch,
+                    mime_type="text/plain",
+                    target_language_code=target_lang,
+                )
+                for text, translation in zip(batch, response.translations):
+                    key = _text_key(target_lang, text)
+                    results[key] = translation.translated_text
+                    self.translations.set(key, translation.translated_text)
+                logger.info(f"🔤 Translated {len(batch)} text(s) to {target_lang}")
+            except GoogleAPICallError as e:
+                logger.error(f"Translation error: {e}")
+        return [results[key] if results[key] is not None else text for key, text in zip(keys, texts)]
+
     def translate_text(self, text: str, target_lang: str = "en") -> str:
         """
-        Translate text to the target language using Google Cloud Translate.
+        Translate text to the target language using Google Cloud Translate (cached).
         """
+        return self.translate_texts([text], target_lang)[0]
+
+    async def adetect_language(self, text: str) -> str:
+        """
+        Async variant of detect_language() using the async Translate client.
+        """
+        key, lang_code = self._detect_cached(text)
+        if lang_code:
+            return lang_code
         try:
-            response = self.client.translate_text(
-                parent=self.parent,
-                contents=[text],
-                mime_type="text/plain",
-                target_language_code=target_lang,
+            response = await self._get_async_client().detect_language(
+                content=text,
+                parent=self.parent
             )
-            translated_text = response.translations[0].translated_text
-            print(f"🔤 Translated to {target_lang}: {translated_text}")
-            return translated_text
+            lang_code = response.languages[0].language_code.lower()
+            logger.info(f"🔍 Language detected: {lang_code}")
+            self.detections.set(key, lang_code)
+            return lang_code
+        except GoogleAPICallError as e:
+            logger.error(f"Language detection error: {e}")
+            return "en"
+
+    async def _atranslate_batch(self, texts: List[str], target_lang: str) -> List[str]:
+        response = await self._get_async_client().translate_text(
+            parent=self.parent,
+            contents=texts,
+            mime_type="text/plain",
+            target_language_code=target_lang,
+        )
+        logger.info(f"🔤 Translated {len(texts)} text(s) to {target_lang}")
+        return [translation.translated_text for translation in response.translations]
+
+    async def atranslate_text(self, text: str, target_lang: str = "en") -> str:
+        """
+        Async variant of translate_text(). Cache misses go through the micro-batcher, so
+        concurrent requests share one Translate RPC per target language.
+        """
+        key = _text_key(target_lang, text)
+        cached = self.translations.get(key)
+        if cached is not None:
+            return cached
+        try:
+            translated_text = await self.batcher.translate(text, target_lang)
         except GoogleAPICallError as e:
-            print(f"Translation error: {e}")
+            logger.error(f"Translation error: {e}")
             return text
+        self.translations.set(key, translated_text)
+        return translated_text
+
+    async def atranslate_texts(self, texts: List[str], target_lang: str = "en") -> List[str]:
+        return list(await asyncio.gather(*(self.atranslate_text(text, target_lang) for text in texts)))
@@ -1,35 +1,52 @@
-import os
 import json
 import logging
-from langchain_groq import ChatGroq
 from langchain.schema import HumanMessage
 
+from app.core.llm import get_llm
+
 logger = logging.getLogger(__name__)
 
 
 class EntityExtractor:
     def __init__(self):
-        self.llm = ChatGroq(
-            groq_api_key=os.environ["GROQ_API_KEY"],
-            model_name="llama3-8b-8192"
-        )
+        self.llm = get_llm()
 
     def extract_weather_city(self, query: str) -> str:
-        prompt = (
+        response = self.llm.invoke([HumanMessage(content=self._weather_city_prompt(query))])
+        return self._parse_weather_city(query, response.content)
+
+    async def aextract_weather_city(self, query: str) -> str:
+        response = await self.llm.ainvoke([HumanMessage(content=self._weather_city_prompt(query))])
+        return self._parse_weather_city(query, response.content)
+
+    def extract_mandi_entities(self, query: str) -> dict:
+        response = self.llm.invoke([HumanMessage(content=self._mandi_entities_prompt(query))])
+        return self._parse_mandi_entities(response.content)
+
+    async def aextract_mandi_entities(self, query: str) -> dict:
+        response = await self.llm.ainvoke([HumanMessage(content=self._mandi_entities_prompt(query))])
+        return self._parse_mandi_entities(response.content)
+
+    @staticmethod
+    def _weather_city_prompt(query: str) -> str:
+        return (
             "You are an assistant that extracts the **Indian city name only** from a user's query about weather.\n"
             "If no Indian city is found, reply with \"unknown\".\n"
             "Reply with the city name only, no explanation.\n"
             f"User query: \"{query}\"\n"
             "City name:"
         )
-        response = self.llm([HumanMessage(content=prompt)])
-        city = response.content.strip()
+
+    @staticmethod
+    def _parse_weather_city(query: str, content: str) -> str:
+        city = content.strip()
         if city.lower() in ["", "none", "unknown"]:
             logger.warning(f"❌ Could not extract city from query: {query}")
         return city
 
-    def extract_mandi_entities(self, query: str) -> dict:
-        prompt = (
+    @staticmethod
+    def _mandi_entities_prompt(query: str) -> str:
+        return (
             "You are an assistant that extracts the **crop name (singular form)** and the **location (Indian city or district)** "
             "from a user's mandi price query.\n"
             "Crop names should be in singular form. For example, return \"tomato\" instead of \"tomatoes\".\n"
@@ -39,13 +56,14 @@ class EntityExtractor:
             f"User query: \"{query}\"\n"
             "JSON result:"
         )
-        response = self.llm([HumanMessage(content=prompt)])
 
+    @staticmethod
+    def _parse_mandi_entities(content: str) -> dict:
         try:
-            result = json.loads(response.content)
+            result = json.loads(content)
             crop = result.get("crop", "").strip().lower()
             location = result.get("location", "").strip()
             return {"crop": crop, "location": location}
         except Exception as e:
-            logger.error(f"Error parsing mandi entity extraction response: {e} | Response: {response.content}")
+            logger.error(f"Error parsing mandi entity extraction response: {e} | Response: {content}")
             return {"crop": "", "location": ""}
@@ -0,0 +1,197 @@
+# backend/app/services/mandi_aggregation.py
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_COLUMNS = ("state", "district", "market", "commodity")
+PRICE_COLUMNS = ("min_price", "max_price", "modal_price")
+EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _factorize(values: List[str]) -> tuple:
+    # Dict-based factorize: one pass, no sorting of object arrays
+    mapping: Dict[str, int] = {}
+    codes = np.fromiter(map(lambda v: mapping.setdefault(v, len(mapping)), values), dtype=np.int32, count=len(values))
+    categories = np.empty(len(mapping), dtype=object)
+    categories[:] = list(mapping)
+    return codes, categories
+
+
+def _parse_day(arrival_date: str) -> int:
+    # Agmarknet dd/mm/yyyy -> days since epoch
+    return (datetime.strptime(arrival_date, "%d/%m/%Y").date() - datetime(1970, 1, 1).date()).days
+
+
+def _to_price(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _price_column(values: list) -> np.ndarray:
+    # NumPy parses numeric strings in C; only fall back per value when something is malformed
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter((_to_price(v) for v in values), dtype=np.float64, count=len(values))
+
+
+class PriceFrame:
+    """
+    Columnar view of mandi price records: categorical columns are stored as integer
+    codes, arrival dates as day numbers and prices as float arrays, so grouping is a
+    single sort + `reduceat` instead of one list scan per group.
+    """
+
+    def __init__(
+        self,
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, np.ndarray],
+        days: np.ndarray,
+        prices: Dict[str, np.ndarray],
+    ) -> None:
+        self.codes = codes
+        self.categories = categories
+        self.days = days
+        self.prices = prices
+        self._lookup = {col: {v: i for i, v in enumerate(cats)} for col, cats in categories.items()}
+        self._rank: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_records(cls, records: Sequence[dict]) -> "PriceFrame":
+        codes, categories = {}, {}
+        for col in CATEGORY_COLUMNS:
+            codes[col], categories[col] = _factorize([r.get(col, "") for r in records])
+
+        # Few distinct dates per batch, so parse each one once
+        date_codes, date_values = _factorize([r.get("arrival_date", "") for r in records])
+        day_values = np.array([_parse_day(d) if d else -1 for d in date_values], dtype=np.int32)
+        days = day_values[date_codes] if len(records) else np.empty(0, dtype=np.int32)
+
+        prices = {col: _price_column([r.get(col) for r in records]) for col in PRICE_COLUMNS}
+
+        # Rows without usable prices or dates can't contribute to any aggregate
+        valid = (days >= 0) & ~np.isnan(prices["min_price"]) & ~np.isnan(prices["max_price"]) \
+            & ~np.isnan(prices["modal_price"])
+        frame = cls(codes, categories, days, prices)
+        return frame if valid.all() else frame._take(valid)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _take(self, index: np.ndarray) -> "PriceFrame":
+        return PriceFrame(
+            {col: c[index] for col, c in self.codes.items()},
+            self.categories,
+            self.days[index],
+            {col: p[index] for col, p in self.prices.items()},
+        )
+
+    def filter(self, **equals: str) -> "PriceFrame":
+        """
+        Rows whose categorical columns equal the given values, e.g. filter(state="Punjab").
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for col, value in equals.items():
+            code = self._lookup[col].get(value)
+            if code is None:
+                return self._take(np.zeros(len(self), dtype=bool))
+            mask &= self.codes[col] == code
+        return self._take(mask)
+
+    def _modal_rank(self) -> np.ndarray:
+        if self._rank is None:
+            self._rank = np.empty(len(self), dtype=np.int64)
+            self._rank[np.argsort(self.prices["modal_price"], kind="stable")] = np.arange(len(self))
+        return self._rank
+
+    def column(self, col: str) -> np.ndarray:
+        if col == "arrival_date":
+            return self.days
+        return self.categories[col][self.codes[col]]
+
+    def _group_keys(self, keys: Sequence[str]) -> np.ndarray:
+        # Mixed-radix composite key over the group columns, densified if it could overflow
+        composite = np.zeros(len(self), dtype=np.int64)
+        bound = 1
+        for col in keys:
+            if col == "arrival_date":
+                values = (self.days - self.days.min()).astype(np.int64)
+                radix = int(values.max()) + 1
+            else:
+                values, radix = self.codes[col].astype(np.int64), max(len(self.categories[col]), 1)
+            composite = composite * radix + values
+            bound *= radix
+
+        if bound * max(len(self), 1) >= 2 ** 62:
+            composite = np.unique(composite, return_inverse=True)[1].astype(np.int64).ravel()
+        return composite
+
+    def groupby(self, *keys: str) -> List[dict]:
+        """
+        One row per group with price range (min of min_price, max of max_price),
+        median and mean modal price and record count, sorted by the group keys' values.
+        """
+        if not len(self):
+            return []
+
+        modal = self.prices["modal_price"]
+        # Sort by group, then modal price so medians are positional lookups. Folding the
+        # modal rank into one int64 key is a single argsort instead of a lexsort.
+        group_key = self._group_keys(keys) * len(self) + self._modal_rank()
+        order = np.argsort(group_key)
+        sorted_keys = group_key[order] // len(self)
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        counts = np.diff(np.r_[starts, len(order)])
+
+        sorted_modal = modal[order]
+        min_prices = np.minimum.reduceat(self.prices["min_price"][order], starts).tolist()
+        max_prices = np.maximum.reduceat(self.prices["max_price"][order], starts).tolist()
+        medians = ((sorted_modal[starts + (counts - 1) // 2] + sorted_modal[starts + counts // 2]) / 2).tolist()
+        means = (np.add.reduceat(sorted_modal, starts) / counts).tolist()
+
+        first_rows = order[starts]
+        key_values = {col: self.column(col)[first_rows].tolist() for col in keys}
+        if "arrival_date" in key_values:
+            key_values["arrival_date"] = [str(EPOCH + d) for d in key_values["arrival_date"]]
+
+        rows = [
+            {
+                **{col: key_values[col][i] for col in keys},
+                "min_price": min_prices[i],
+                "max_price": max_prices[i],
+                "modal_price": medians[i],
+                "mean_modal_price": means[i],
+                "records": count,
+            }
+            for i, count in enumerate(counts.tolist())
+        ]
+
+        rows.sort(key=lambda r: tuple(r[col] for col in keys))
+        return rows
+
+    def trend(self, *keys: str) -> Dict[tuple, List[dict]]:
+        """
+        Daily series per group: {(key values...): [{arrival_date, modal_price, ...}, ...]}
+        ordered by date, for trend-over-dates views.
+        """
+        series: Dict[tuple, List[dict]] = {}
+        for row in self.groupby(*keys, "arrival_date"):
+            series.setdefault(tuple(row[col] for col in keys), []).append(row)
+        return series
+
+    @staticmethod
+    def change(series: List[dict]) -> Optional[float]:
+        """
+        Percent change in median modal price from the first to the last day of a series.
+        """
+        if len(series) < 2 or not series[0]["modal_price"]:
+            return None
+        first, last = series[0]["modal_price"], series[-1]["modal_price"]
+        return round((last - first) / first * 100, 1)
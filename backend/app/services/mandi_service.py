@@ -1,16 +1,23 @@
 import os
+import re
 import json
 import logging
-import requests
-from typing import Tuple, List
+from typing import Optional, Tuple, List
 
-from langchain_groq import ChatGroq
 from langchain.prompts import ChatPromptTemplate
 
-logger = logging.getLogger(__name__)
+from app.core.cache import SQLiteKVStore
+from app.core.config import CACHE_DIR, MANDI_TREND_DAYS, MANDI_TREND_WINDOW
+from app.core.executor import run_blocking
+from app.models.response_models import MandiTrendResponse
+from app.core.http_client import arequest, request
+from app.core.llm import get_llm
+from app.services.gazetteer import Gazetteer
+from app.services.mandi_aggregation import PriceFrame
+from app.services.mandi_store import API_KEY, BASE_URL, MandiPriceStore
+from app.services.mandi_trends import build_trend, summarize_trend
 
-API_KEY = "579b464db66ec23bdd000001f59af276341944ac508c9a65c45cdaec"
-BASE_URL = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
+logger = logging.getLogger(__name__)
 
 location_prompt = ChatPromptTemplate.from_template("""
 Given a city in India, identify its state and district in JSON format.
@@ -22,13 +29,20 @@ Respond strictly as:
 }}
 """)
 
+JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
 class MandiPriceService:
-    def __init__(self) -> None:
+    def __init__(self, store: Optional[MandiPriceStore] = None) -> None:
+        # Synced local copy of Agmarknet; the live API is only used until the first sync lands
+        self.store = store or MandiPriceStore()
+
+        # Offline city -> state/district lookup; the LLM is only asked about unknown places
+        self.gazetteer = Gazetteer(
+            learned_store=SQLiteKVStore(os.path.join(CACHE_DIR, "gazetteer.sqlite"), table="learned_places")
+        )
+
         try:
-            self.llm = ChatGroq(
-                api_key=os.getenv("GROQ_API_KEY"),
-                model_name="llama3-8b-8192"
-            )
+            self.llm = get_llm()
             logger.info("✅ Groq LLM initialized for mandi price module")
         except Exception as e:
             logger.error(f"❌ Failed to initialize Groq LLM: {e}")
@@ -39,32 +53,94 @@ class MandiPriceService:
         response = self.llm.invoke(prompt)
         return response.content
 
+    async def aget_state_district(self, city: str) -> str:
+        prompt = location_prompt.format_messages(city=city)
+        response = await self.llm.ainvoke(prompt)
+        return response.content
+
     def parse_state_district(self, llm_output: str) -> Tuple[str, str]:
         try:
-            location = json.loads(llm_output)
-            return location.get("state", "Unknown"), location.get("district", "Unknown")
+            # The model sometimes wraps the JSON in prose or code fences
+            match = JSON_OBJECT.search(llm_output)
+            location = json.loads(match.group(0) if match else llm_output)
+            return location.get("state") or "Unknown", location.get("district") or "Unknown"
         except Exception as e:
             logger.error(f"❌ Error parsing LLM location response: {e}")
             return "Unknown", "Unknown"
 
-    def get_crop_prices(self, crop: str) -> List[dict]:
-        params = {
+    def _lookup_location(self, city: str, state: str = "", district: str = "") -> Optional[Tuple[str, str]]:
+        place = self.gazetteer.lookup(city, state)
+        if place:
+            logger.info(f"📍 Gazetteer hit: {city} -> {place.district or '-'}, {place.state}")
+            return place.state, place.district
+
+        # Query understanding already resolved it; remember so the next lookup is offline
+        if state and district:
+            self.gazetteer.remember(city, state, district)
+            return state, district
+        return None
+
+    def resolve_state_district(self, city: str, state: str = "", district: str = "") -> Tuple[str, str]:
+        """
+        Gazetteer first, then any state/district already extracted upstream, then the LLM.
+        """
+        if not city:
+            return (state, district) if state and district else ("Unknown", "Unknown")
+
+        location = self._lookup_location(city, state, district)
+        if location:
+            return location
+
+        state, district = self.parse_state_district(self.get_state_district(city))
+        if state != "Unknown" and district != "Unknown":
+            self.gazetteer.remember(city, state, district)
+        return state, district
+
+    async def aresolve_state_district(self, city: str, state: str = "", district: str = "") -> Tuple[str, str]:
+        if not city:
+            return (state, district) if state and district else ("Unknown", "Unknown")
+
+        location = self._lookup_location(city, state, district)
+        if location:
+            return location
+
+        state, district = self.parse_state_district(await self.aget_state_district(city))
+        if state != "Unknown" and district != "Unknown":
+            self.gazetteer.remember(city, state, district)
+        return state, district
+
+    @staticmethod
+    def _crop_price_params(crop: str) -> dict:
+        return {
             "api-key": API_KEY,
             "format": "json",
             "limit": 100,
             "filters[commodity]": crop
         }
 
-        response = requests.get(BASE_URL, params=params)
+    def get_crop_prices(self, crop: str) -> List[dict]:
+        if not self.store.is_empty():
+            return self.store.get_recent_prices(crop)
+
+        response = request("GET", BASE_URL, params=self._crop_price_params(crop))
         if response.status_code != 200:
             logger.warning(f"❌ Agmarknet API error {response.status_code}")
             return []
 
         return response.json().get("records", [])
 
-    def prepare_response(self, state: str, district: str, crop: str, records: List[dict]) -> str:
-        available_states = {rec["state"] for rec in records}
+    async def aget_crop_prices(self, crop: str) -> List[dict]:
+        if not await run_blocking(self.store.is_empty):
+            return await run_blocking(self.store.get_recent_prices, crop)
+
+        response = await arequest("GET", BASE_URL, params=self._crop_price_params(crop))
+        if response.status_code != 200:
+            logger.warning(f"❌ Agmarknet API error {response.status_code}")
+            return []
+
+        return response.json().get("records", [])
 
+    def prepare_response(self, state: str, district: str, crop: str, records: List[dict]) -> str:
         # ✅ Primary: District match
         district_records = [r for r in records if r["district"] == district]
         if district_records:
@@ -77,52 +153,70 @@ class MandiPriceService:
                 )
             return response
 
+        # Columnar copy so each group is aggregated in one pass instead of one scan per group
+        frame = PriceFrame.from_records(records)
+
         # ⚠️ Secondary: Show other districts in the state
-        state_district_records = [r for r in records if r["state"] == state]
-        if state_district_records:
+        state_frame = frame.filter(state=state)
+        if len(state_frame):
             response = f"⚠️ No data for {district}, {state}. But found {crop} prices in other districts of {state}:\n\n"
-            for d in sorted({r["district"] for r in state_district_records}):
-                d_recs = [r for r in state_district_records if r["district"] == d]
-                min_price = min(int(r["min_price"]) for r in d_recs)
-                max_price = max(int(r["max_price"]) for r in d_recs)
-                response += f"➡️ {d}: ₹{min_price} - ₹{max_price} per quintal\n"
+            for group in state_frame.groupby("district"):
+                response += (
+                    f"➡️ {group['district']}: ₹{group['min_price']:.0f} - ₹{group['max_price']:.0f} per quintal\n"
+                )
             return response
 
         # ❌ Fallback: Show available states
         response = f"⚠️ No data for {crop} in {state}. But found it in these states:\n\n"
-        for s in sorted(available_states):
-            s_recs = [r for r in records if r["state"] == s]
-            min_price = min(int(r["min_price"]) for r in s_recs)
-            max_price = max(int(r["max_price"]) for r in s_recs)
-            response += f"➡️ {s}: ₹{min_price} - ₹{max_price} per quintal\n"
+        for group in frame.groupby("state"):
+            response += f"➡️ {group['state']}: ₹{group['min_price']:.0f} - ₹{group['max_price']:.0f} per quintal\n"
 
         return response
 
-    def list_available_crops(self) -> str:
-        params = {
+    @staticmethod
+    def _crop_list_params() -> dict:
+        return {
             "api-key": API_KEY,
             "format": "json",
             "limit": 100
         }
 
-        response = requests.get(BASE_URL, params=params)
+    def list_available_crops(self) -> str:
+        if not self.store.is_empty():
+            return self._format_crops(self.store.list_commodities())
+
+        response = request("GET", BASE_URL, params=self._crop_list_params())
+        if response.status_code != 200:
+            return "❌ Unable to fetch crop list."
+
+        return self._format_crop_list(response.json().get("records", []))
+
+    async def alist_available_crops(self) -> str:
+        if not await run_blocking(self.store.is_empty):
+            return self._format_crops(await run_blocking(self.store.list_commodities))
+
+        response = await arequest("GET", BASE_URL, params=self._crop_list_params())
         if response.status_code != 200:
             return "❌ Unable to fetch crop list."
 
-        records = response.json().get("records", [])
-        crops = sorted({rec["commodity"] for rec in records})
+        return self._format_crop_list(response.json().get("records", []))
 
+    @staticmethod
+    def _format_crop_list(records: List[dict]) -> str:
+        return MandiPriceService._format_crops(sorted({rec["commodity"] for rec in records}))
+
+    @staticmethod
+    def _format_crops(crops: List[str]) -> str:
         if not crops:
             return "⚠️ No crop data available right now."
 
         return "⚠️ No data found for your crop. Available crops:\n\n" + ", ".join(crops)
 
-    def search_prices(self, city: str, crop: str) -> str:
+    def search_prices(self, city: str, crop: str, state: str = "", district: str = "") -> str:
         logger.info(f"🌾 Mandi search for city: {city}, crop: {crop}")
 
         try:
-            llm_result = self.get_state_district(city)
-            state, district = self.parse_state_district(llm_result)
+            state, district = self.resolve_state_district(city, state, district)
 
             if state == "Unknown" or district == "Unknown":
                 return f"❌ Could not determine state/district for '{city}'."
@@ -133,8 +227,63 @@ class MandiPriceService:
                 logger.warning("⚠️ No data found for this crop in the API.")
                 return self.list_available_crops()
 
-            return self.prepare_response(state, district, crop, records)
+            response = self.prepare_response(state, district, crop, records)
+            trend_line = summarize_trend(build_trend(self.store, crop, state, district))
+            return f"{response}\n{trend_line}" if trend_line else response
+
+        except Exception as e:
+            logger.error(f"❌ Error during mandi price search: {e}")
+            return "❌ Internal error while processing mandi prices."
+
+    async def asearch_prices(self, city: str, crop: str, state: str = "", district: str = "") -> str:
+        logger.info(f"🌾 Mandi search for city: {city}, crop: {crop}")
+
+        try:
+            state, district = await self.aresolve_state_district(city, state, district)
+
+            if state == "Unknown" or district == "Unknown":
+                return f"❌ Could not determine state/district for '{city}'."
+
+            records = await self.aget_crop_prices(crop)
+
+            if not records:
+                logger.warning("⚠️ No data found for this crop in the API.")
+                return await self.alist_available_crops()
+
+            response = self.prepare_response(state, district, crop, records)
+            trend_line = summarize_trend(await run_blocking(build_trend, self.store, crop, state, district))
+            return f"{response}\n{trend_line}" if trend_line else response
 
         except Exception as e:
             logger.error(f"❌ Error during mandi price search: {e}")
             return "❌ Internal error while processing mandi prices."
+
+    def get_trends(
+        self,
+        crop: str,
+        city: str = "",
+        state: str = "",
+        district: str = "",
+        days: int = MANDI_TREND_DAYS,
+        window: int = MANDI_TREND_WINDOW,
+    ) -> Optional[MandiTrendResponse]:
+        if city:
+            state, district = self.resolve_state_district(city, state, district)
+            if "Unknown" in (state, district):
+                raise ValueError(f"Could not determine state/district for '{city}'.")
+        return build_trend(self.store, crop, state, district, days, window)
+
+    async def aget_trends(
+        self,
+        crop: str,
+        city: str = "",
+        state: str = "",
+        district: str = "",
+        days: int = MANDI_TREND_DAYS,
+        window: int = MANDI_TREND_WINDOW,
+    ) -> Optional[MandiTrendResponse]:
+        if city:
+            state, district = await self.aresolve_state_district(city, state, district)
+            if "Unknown" in (state, district):
+                raise ValueError(f"Could not determine state/district for '{city}'.")
+        return await run_blocking(build_trend, self.store, crop, state, district, days, window)
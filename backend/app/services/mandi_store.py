@@ -0,0 +1,467 @@
+# backend/app/services/mandi_store.py
+
+import os
+import time
+import sqlite3
+import asyncio
+import logging
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from app.core.config import (
+    HTTP_TIMEOUT_SECONDS,
+    MANDI_DB_PATH,
+    MANDI_RECENT_DAYS,
+    MANDI_SYNC_LOOKBACK_DAYS,
+    MANDI_SYNC_PAGE_SIZE,
+)
+from app.core.http_client import request
+from app.services.mandi_aggregation import PriceFrame
+
+logger = logging.getLogger(__name__)
+
+API_KEY = "579b464db66ec23bdd000001f59af276341944ac508c9a65c45cdaec"
+BASE_URL = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
+
+PRICE_FIELDS = ("min_price", "max_price", "modal_price")
+TEXT_FIELDS = ("state", "district", "market", "commodity", "variety", "grade")
+
+
+def _iso_date(arrival_date: str) -> str:
+    # Agmarknet dates are dd/mm/yyyy; ISO dates sort correctly in SQL
+    return datetime.strptime(arrival_date, "%d/%m/%Y").strftime("%Y-%m-%d")
+
+
+@lru_cache(maxsize=1024)
+def _api_date(iso_date: str) -> str:
+    return datetime.strptime(iso_date, "%Y-%m-%d").strftime("%d/%m/%Y")
+
+
+def _price(value) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class MandiPriceStore:
+    """
+    Local SQLite copy of the Agmarknet daily price dataset, keyed by
+    commodity/state/district/market/variety/grade/date. Searches read from here
+    instead of calling data.gov.in; `sync_mandi_prices` keeps it up to date.
+    """
+
+    def __init__(self, path: str = MANDI_DB_PATH) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS mandi_prices (
+                commodity_key TEXT NOT NULL,
+                state TEXT NOT NULL,
+                district TEXT NOT NULL,
+                market TEXT NOT NULL,
+                variety TEXT NOT NULL,
+                grade TEXT NOT NULL,
+                arrival_date TEXT NOT NULL,
+                commodity TEXT NOT NULL,
+                min_price INTEGER,
+                max_price INTEGER,
+                modal_price INTEGER,
+                PRIMARY KEY (commodity_key, state, district, market, variety, grade, arrival_date)
+            );
+            CREATE INDEX IF NOT EXISTS idx_mandi_prices_date ON mandi_prices (arrival_date);
+            CREATE TABLE IF NOT EXISTS mandi_sync_log (
+                arrival_date TEXT PRIMARY KEY,
+                records INTEGER NOT NULL,
+                synced_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS mandi_sync_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            -- Daily rollups over varieties/grades, rebuilt for each synced date
+            CREATE TABLE IF NOT EXISTS mandi_market_daily (
+                commodity_key TEXT NOT NULL,
+                state TEXT NOT NULL,
+                district TEXT NOT NULL,
+                market TEXT NOT NULL,
+                arrival_date TEXT NOT NULL,
+                min_price REAL,
+                max_price REAL,
+                modal_price REAL,
+                records INTEGER NOT NULL,
+                PRIMARY KEY (commodity_key, state, arrival_date, district, market)
+            );
+            CREATE TABLE IF NOT EXISTS mandi_district_daily (
+                commodity_key TEXT NOT NULL,
+                state TEXT NOT NULL,
+                district TEXT NOT NULL,
+                arrival_date TEXT NOT NULL,
+                min_price REAL,
+                max_price REAL,
+                modal_price REAL,
+                records INTEGER NOT NULL,
+                PRIMARY KEY (commodity_key, state, district, arrival_date)
+            );
+            CREATE INDEX IF NOT EXISTS idx_mandi_market_daily_date ON mandi_market_daily (arrival_date);
+            CREATE INDEX IF NOT EXISTS idx_mandi_district_daily_date ON mandi_district_daily (arrival_date);
+            """
+        )
+        conn.commit()
+        logger.info(f"✅ Mandi price store ready at {self.path}")
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread: searches run in the executor, syncs in their own thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # Writes (used by the sync)
+    def upsert(self, records: Iterable[dict]) -> int:
+        rows = []
+        for rec in records:
+            try:
+                arrival_date = _iso_date(rec["arrival_date"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            commodity = str(rec.get("commodity") or "").strip()
+            if not commodity:
+                continue
+            rows.append((
+                commodity.lower(),
+                *(str(rec.get(field) or "").strip() for field in TEXT_FIELDS if field != "commodity"),
+                arrival_date,
+                commodity,
+                *(_price(rec.get(field)) for field in PRICE_FIELDS),
+            ))
+
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO mandi_prices (commodity_key, state, district, market, variety, grade, "
+                "arrival_date, commodity, min_price, max_price, modal_price) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def mark_synced(self, counts: Dict[str, int], total: int) -> None:
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO mandi_sync_log (arrival_date, records, synced_at) VALUES (?, ?, ?)",
+                [(date, count, now) for date, count in counts.items()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO mandi_sync_meta (key, value) VALUES ('last_total', ?)", (str(total),)
+            )
+
+    def synced_dates(self) -> set:
+        return {row[0] for row in self._conn().execute("SELECT arrival_date FROM mandi_sync_log")}
+
+    def last_total(self) -> Optional[int]:
+        row = self._conn().execute("SELECT value FROM mandi_sync_meta WHERE key = 'last_total'").fetchone()
+        return int(row[0]) if row else None
+
+    # Reads (used by MandiPriceService)
+    @staticmethod
+    def _commodity_match(crop: str) -> tuple:
+        key = crop.strip().lower()
+        # Prefix ranges rather than LIKE so SQLite can use the primary key index
+        match = (
+            "(commodity_key = ? OR (commodity_key >= ? AND commodity_key < ?) "
+            "OR (commodity_key >= ? AND commodity_key < ?))"
+        )
+        return match, (key, f"{key} (", f"{key} )", f"{key}(", f"{key})")
+
+    def is_empty(self) -> bool:
+        return self._conn().execute("SELECT 1 FROM mandi_prices LIMIT 1").fetchone() is None
+
+    def get_recent_prices(self, crop: str, days: int = MANDI_RECENT_DAYS) -> List[dict]:
+        """
+        Records for `crop` from its most recent `days` arrival dates, shaped like the
+        Agmarknet API records. "tomato" also matches commodities like "Tomato (Hybrid)".
+        """
+        match, params = self._commodity_match(crop)
+
+        conn = self._conn()
+        dates = conn.execute(
+            f"SELECT DISTINCT arrival_date FROM mandi_prices WHERE {match} ORDER BY arrival_date DESC LIMIT ?",
+            (*params, days),
+        ).fetchall()
+        if not dates:
+            return []
+
+        rows = conn.execute(
+            f"SELECT state, district, market, commodity, variety, grade, arrival_date, "
+            f"min_price, max_price, modal_price FROM mandi_prices "
+            f"WHERE {match} AND arrival_date >= ? ORDER BY arrival_date DESC, state, district, market",
+            (*params, dates[-1][0]),
+        ).fetchall()
+
+        records = []
+        for row in rows:
+            record = dict(row)
+            record["arrival_date"] = _api_date(record["arrival_date"])
+            records.append(record)
+        return records
+
+    def list_commodities(self) -> List[str]:
+        rows = self._conn().execute("SELECT DISTINCT commodity FROM mandi_prices ORDER BY commodity").fetchall()
+        return [row[0] for row in rows]
+
+    def refresh_rollups(self, dates: Optional[Iterable[str]] = None) -> int:
+        """
+        Rebuilds the market and district daily rollups for the given ISO dates
+        (all stored dates when None). Returns the number of district-day rows written.
+        """
+        conn = self._conn()
+        if dates is None:
+            dates = [row[0] for row in conn.execute("SELECT DISTINCT arrival_date FROM mandi_prices")]
+
+        written = 0
+        for date in sorted(dates):
+            rows = conn.execute(
+                "SELECT commodity_key AS commodity, state, district, market, arrival_date, "
+                "min_price, max_price, modal_price FROM mandi_prices WHERE arrival_date = ?",
+                (date,),
+            ).fetchall()
+            records = [dict(row, arrival_date=_api_date(date)) for row in rows]
+            frame = PriceFrame.from_records(records)
+
+            market_rows = frame.groupby("commodity", "state", "district", "market", "arrival_date")
+            district_rows = frame.groupby("commodity", "state", "district", "arrival_date")
+            with conn:
+                conn.execute("DELETE FROM mandi_market_daily WHERE arrival_date = ?", (date,))
+                conn.execute("DELETE FROM mandi_district_daily WHERE arrival_date = ?", (date,))
+                conn.executemany(
+                    "INSERT INTO mandi_market_daily VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(r["commodity"], r["state"], r["district"], r["market"], r["arrival_date"],
+                      r["min_price"], r["max_price"], r["modal_price"], r["records"]) for r in market_rows],
+                )
+                conn.executemany(
+                    "INSERT INTO mandi_district_daily VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(r["commodity"], r["state"], r["district"], r["arrival_date"],
+                      r["min_price"], r["max_price"], r["modal_price"], r["records"]) for r in district_rows],
+                )
+            written += len(district_rows)
+
+        logger.info(f"📊 Mandi rollups refreshed: {written} district-days")
+        return written
+
+    def resolve_commodity(self, crop: str) -> Optional[str]:
+        """
+        The rollup commodity key for `crop`: exact match first, else the variant
+        ("tomato (hybrid)") with the most history.
+        """
+        match, params = self._commodity_match(crop)
+        row = self._conn().execute(
+            f"SELECT commodity_key, (commodity_key = ?) AS exact, COUNT(*) AS n FROM mandi_district_daily "
+            f"WHERE {match} GROUP BY commodity_key ORDER BY exact DESC, n DESC LIMIT 1",
+            (params[0], *params),
+        ).fetchone()
+        return row["commodity_key"] if row else None
+
+    def latest_rollup_date(self, commodity_key: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT MAX(arrival_date) FROM mandi_district_daily WHERE commodity_key = ?", (commodity_key,)
+        ).fetchone()
+        return row[0]
+
+    def district_series(self, commodity_key: str, state: str, district: str, since: str) -> List[dict]:
+        rows = self._conn().execute(
+            "SELECT arrival_date, min_price, max_price, modal_price, records FROM mandi_district_daily "
+            "WHERE commodity_key = ? AND state = ? AND district = ? AND arrival_date >= ? ORDER BY arrival_date",
+            (commodity_key, state, district, since),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def state_series(self, commodity_key: str, state: str, since: str) -> List[dict]:
+        # Median of district medians is not available in SQL; the average is close enough for a trend
+        rows = self._conn().execute(
+            "SELECT arrival_date, MIN(min_price) AS min_price, MAX(max_price) AS max_price, "
+            "AVG(modal_price) AS modal_price, SUM(records) AS records FROM mandi_district_daily "
+            "WHERE commodity_key = ? AND state = ? AND arrival_date >= ? GROUP BY arrival_date ORDER BY arrival_date",
+            (commodity_key, state, since),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_market_prices(self, commodity_key: str, state: str, since: str) -> List[dict]:
+        """
+        Each market's most recent daily rollup in `state` since the given date.
+        """
+        rows = self._conn().execute(
+            "SELECT district, market, MAX(arrival_date) AS arrival_date, min_price, max_price, modal_price "
+            "FROM mandi_market_daily WHERE commodity_key = ? AND state = ? AND arrival_date >= ? "
+            "GROUP BY district, market",
+            (commodity_key, state, since),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> dict:
+        conn = self._conn()
+        records, latest = conn.execute("SELECT COUNT(*), MAX(arrival_date) FROM mandi_prices").fetchone()
+        last_sync = conn.execute("SELECT MAX(synced_at) FROM mandi_sync_log").fetchone()[0]
+        return {"records": records, "latest_arrival_date": latest, "last_sync_at": last_sync}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _fetch_page(offset: int, limit: int, arrival_date: Optional[str] = None) -> dict:
+    params = {"api-key": API_KEY, "format": "json", "offset": offset, "limit": limit}
+    if arrival_date:
+        # data.gov.in filters are exact matches on the dataset's dd/mm/yyyy dates
+        params["filters[arrival_date]"] = _api_date(arrival_date)
+    # Large pages are slow to render on data.gov.in, so allow a longer read timeout
+    response = request("GET", BASE_URL, params=params, timeout=HTTP_TIMEOUT_SECONDS * 4, retries=3)
+    response.raise_for_status()
+    return response.json()
+
+
+@contextmanager
+def _sync_lock(db_path: str) -> Iterator[bool]:
+    """
+    Non-blocking inter-process lock next to the database. Yields False when another
+    process (another uvicorn worker, or the cron script) is already syncing.
+    """
+    with open(f"{db_path}.sync.lock", "a+b") as f:
+        try:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _dates_to_fetch(synced: set, lookback_days: int = MANDI_SYNC_LOOKBACK_DAYS) -> List[str]:
+    # Every date after the newest completely synced one, up to today (at most lookback_days)
+    today = datetime.now().date()
+    first = today - timedelta(days=lookback_days - 1)
+    if synced:
+        first = max(first, datetime.fromisoformat(max(synced)).date() + timedelta(days=1))
+    return [(first + timedelta(days=i)).isoformat() for i in range((today - first).days + 1)]
+
+
+def sync_mandi_prices(store: MandiPriceStore, full: bool = False, page_size: int = MANDI_SYNC_PAGE_SIZE) -> dict:
+    """
+    Pages through the Agmarknet daily dataset into the store.
+
+    Incremental mode (default) first checks the dataset size and returns without
+    downloading anything when nothing changed. Otherwise it asks the API only for the
+    arrival dates after the newest completely synced one (filters[arrival_date]), one
+    date at a time; the first sync and `full` page through the whole dataset. The newest
+    date is always fetched again, since data.gov.in keeps appending to it during the day.
+    Only one process syncs a given database at a time; others return "skipped".
+    """
+    with _sync_lock(store.path) as locked:
+        if not locked:
+            logger.info("🌾 Mandi sync already running in another process, skipping")
+            return {"skipped": True, "total": None, "fetched": 0, "written": 0}
+        return _sync_mandi_prices(store, full, page_size)
+
+
+def _sync_mandi_prices(store: MandiPriceStore, full: bool, page_size: int) -> dict:
+    start = time.perf_counter()
+    probe = _fetch_page(0, 1)
+    total = int(probe.get("total") or 0)
+    synced = set() if full else store.synced_dates()
+
+    if not full and total and total == store.last_total():
+        logger.info(f"🌾 Mandi sync: dataset unchanged ({total} records), skipping")
+        return {"skipped": True, "total": total, "fetched": 0, "written": 0}
+
+    counts: Dict[str, int] = {}
+    written_dates = set()
+    fetched = written = 0
+
+    def fetch(arrival_date: Optional[str] = None) -> None:
+        nonlocal fetched, written
+        offset = 0
+        while True:
+            page = _fetch_page(offset, page_size, arrival_date)
+            records = page.get("records", [])
+            if not records:
+                break
+            offset += len(records)
+            fetched += len(records)
+
+            new_records = []
+            for rec in records:
+                try:
+                    day = _iso_date(rec["arrival_date"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                counts[day] = counts.get(day, 0) + 1
+                if day not in synced:
+                    new_records.append(rec)
+                    written_dates.add(day)
+            written += store.upsert(new_records)
+            if offset >= int(page.get("total") or 0):
+                break
+
+    if synced:
+        for arrival_date in _dates_to_fetch(synced):
+            fetch(arrival_date)
+    else:
+        fetch()
+
+    store.refresh_rollups(written_dates)
+
+    # Only dates older than the newest one are complete and can be skipped next time
+    complete = {date: count for date, count in counts.items() if date != max(counts, default=None)}
+    store.mark_synced(complete, total)
+
+    summary = {
+        "skipped": False,
+        "total": total,
+        "fetched": fetched,
+        "written": written,
+        "dates": sorted(counts),
+        "seconds": round(time.perf_counter() - start, 1),
+    }
+    logger.info(f"✅ Mandi sync finished: {summary}")
+    return summary
+
+
+async def run_periodic_sync(store: MandiPriceStore, interval_hours: float) -> None:
+    """
+    Background task started from the app lifespan: incremental sync now, then every
+    `interval_hours`. Failures are logged and retried on the next tick.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(sync_mandi_prices, store)
+        except Exception as e:
+            logger.error(f"❌ Mandi sync failed: {e}")
+        await asyncio.sleep(interval_hours * 3600)
@@ -0,0 +1,122 @@
+# backend/app/services/mandi_trends.py
+
+import logging
+from datetime import date, timedelta
+from typing import List, Optional
+
+from app.core.config import MANDI_TREND_DAYS, MANDI_TREND_WINDOW
+from app.models.response_models import MandiTrendResponse, MarketComparison, PricePoint
+from app.services.mandi_store import MandiPriceStore
+
+logger = logging.getLogger(__name__)
+
+# Week-over-week moves smaller than this are reported as "flat"
+FLAT_THRESHOLD_PCT = 2.0
+MAX_MARKETS = 10
+
+
+def _days_before(iso_date: str, days: int) -> str:
+    return (date.fromisoformat(iso_date) - timedelta(days=days)).isoformat()
+
+
+def _pct_change(new: float, old: float) -> Optional[float]:
+    return round((new - old) / old * 100, 1) if old else None
+
+
+def _mean_between(series: List[dict], start: str, end: str) -> Optional[float]:
+    # Mean modal price over series points with start < date <= end
+    values = [p["modal_price"] for p in series if start < p["arrival_date"] <= end]
+    return sum(values) / len(values) if values else None
+
+
+def _with_rolling_average(series: List[dict], window: int) -> List[PricePoint]:
+    points = []
+    for point in series:
+        window_start = _days_before(point["arrival_date"], window)
+        points.append(PricePoint(
+            date=point["arrival_date"],
+            modal_price=round(point["modal_price"], 1),
+            min_price=round(point["min_price"], 1),
+            max_price=round(point["max_price"], 1),
+            rolling_avg=round(_mean_between(series, window_start, point["arrival_date"]), 1),
+        ))
+    return points
+
+
+def build_trend(
+    store: MandiPriceStore,
+    crop: str,
+    state: str,
+    district: str,
+    days: int = MANDI_TREND_DAYS,
+    window: int = MANDI_TREND_WINDOW,
+) -> Optional[MandiTrendResponse]:
+    """
+    Price history, rolling average, week-over-week change and market comparison for a
+    crop around a district, read from the precomputed daily rollups. Returns None when
+    the crop has no stored history at all.
+    """
+    commodity_key = store.resolve_commodity(crop)
+    if commodity_key is None:
+        return None
+
+    # Anchor on the newest stored day rather than today so a stale sync still answers
+    since = _days_before(store.latest_rollup_date(commodity_key), days)
+    scope, series = "district", []
+    if district:
+        series = store.district_series(commodity_key, state, district, since)
+    if not series:
+        scope, series = "state", store.state_series(commodity_key, state, since)
+
+    trend = MandiTrendResponse(crop=commodity_key, state=state, district=district, scope=scope)
+    if not series:
+        return trend
+
+    latest = series[-1]
+    trend.latest_date = latest["arrival_date"]
+    trend.latest_modal_price = round(latest["modal_price"], 1)
+    trend.series = _with_rolling_average(series, window)
+
+    this_week = _mean_between(series, _days_before(trend.latest_date, 7), trend.latest_date)
+    last_week = _mean_between(series, _days_before(trend.latest_date, 14), _days_before(trend.latest_date, 7))
+    if this_week is not None and last_week is not None:
+        trend.week_over_week_pct = _pct_change(this_week, last_week)
+        if trend.week_over_week_pct is not None:
+            if abs(trend.week_over_week_pct) < FLAT_THRESHOLD_PCT:
+                trend.direction = "flat"
+            else:
+                trend.direction = "up" if trend.week_over_week_pct > 0 else "down"
+
+    # No market coordinates in Agmarknet, so "nearest" means same district first, then the rest of the state
+    markets = store.latest_market_prices(commodity_key, state, _days_before(trend.latest_date, 7))
+    markets.sort(key=lambda m: (m["district"] != district, -m["modal_price"]))
+    trend.markets = [
+        MarketComparison(
+            market=m["market"],
+            district=m["district"],
+            date=m["arrival_date"],
+            modal_price=round(m["modal_price"], 1),
+            change_vs_local_pct=_pct_change(m["modal_price"], latest["modal_price"]),
+            same_district=m["district"] == district,
+        )
+        for m in markets[:MAX_MARKETS]
+    ]
+    return trend
+
+
+def summarize_trend(trend: Optional[MandiTrendResponse]) -> str:
+    """
+    One-line trend note appended to the chat answer for mandi queries.
+    """
+    if trend is None or trend.week_over_week_pct is None:
+        return ""
+
+    place = trend.district if trend.scope == "district" else trend.state
+    if trend.direction == "flat":
+        return f"📊 Trend: {trend.crop} prices in {place} are steady this week ({trend.week_over_week_pct:+.1f}%)."
+
+    arrow = "📈" if trend.direction == "up" else "📉"
+    return (
+        f"{arrow} Trend: {trend.crop} prices in {place} are {trend.direction} "
+        f"{abs(trend.week_over_week_pct):.1f}% week over week (modal ₹{trend.latest_modal_price:.0f} per quintal)."
+    )
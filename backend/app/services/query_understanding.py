@@ -0,0 +1,135 @@
+# backend/app/services/query_understanding.py
+
+import re
+import logging
+
+from pydantic import ValidationError
+
+from app.core.llm import get_llm
+from app.models.query_models import QueryUnderstanding
+from app.services.intent_recognizer import IntentRecognizer
+from app.services.location_crop_extractor import EntityExtractor
+from app.services.mandi_service import MandiPriceService
+
+logger = logging.getLogger(__name__)
+
+# Intents whose answer doesn't depend on crop or location entities
+ENTITY_FREE_INTENTS = {"schemes", "agriculture_info"}
+
+JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+class QueryUnderstandingService:
+    """
+    Single "query understanding" stage for /chat: intent, crop, city, state and district
+    come back together from one structured LLM call instead of three serial ones.
+
+    The local intent classifier still answers first, and schemes / agriculture_info
+    queries never reach the LLM. If the structured call fails or returns invalid JSON,
+    the old per-step methods are used as fallbacks.
+    """
+
+    def __init__(
+        self,
+        intent_service: IntentRecognizer,
+        entity_extractor: EntityExtractor,
+        mandi_service: MandiPriceService,
+    ) -> None:
+        self.intent_service = intent_service
+        self.entity_extractor = entity_extractor
+        self.mandi_service = mandi_service
+
+        try:
+            self.llm = get_llm(temperature=0, json_mode=True)
+            logger.info("✅ Groq LLM initialized for query understanding")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize Groq LLM: {e}")
+            raise
+
+    def understand(self, query: str) -> QueryUnderstanding:
+        local_intent = self.intent_service.detect_local_intent(query)
+        if local_intent in ENTITY_FREE_INTENTS:
+            return QueryUnderstanding(intent=local_intent)
+
+        try:
+            response = self.llm.invoke(self._build_prompt(query))
+            return self._parse(response.content)
+        except (ValidationError, ValueError) as e:
+            logger.warning(f"⚠️ Invalid query understanding response, using per-step fallback: {e}")
+        except Exception as e:
+            logger.error(f"❌ Query understanding call failed, using per-step fallback: {e}")
+
+        return self._fallback(query, local_intent)
+
+    async def aunderstand(self, query: str) -> QueryUnderstanding:
+        local_intent = self.intent_service.detect_local_intent(query)
+        if local_intent in ENTITY_FREE_INTENTS:
+            return QueryUnderstanding(intent=local_intent)
+
+        try:
+            response = await self.llm.ainvoke(self._build_prompt(query))
+            return self._parse(response.content)
+        except (ValidationError, ValueError) as e:
+            logger.warning(f"⚠️ Invalid query understanding response, using per-step fallback: {e}")
+        except Exception as e:
+            logger.error(f"❌ Query understanding call failed, using per-step fallback: {e}")
+
+        return await self._afallback(query, local_intent)
+
+    # Per-step fallbacks (the original serial pipeline)
+    def _fallback(self, query: str, local_intent: str = None) -> QueryUnderstanding:
+        intent = local_intent or self.intent_service.detect_intent_llm(query)
+
+        if intent == "weather":
+            return QueryUnderstanding(intent=intent, city=self.entity_extractor.extract_weather_city(query))
+
+        if intent == "mandi_prices":
+            entities = self.entity_extractor.extract_mandi_entities(query)
+            # State/district are resolved later by MandiPriceService.search_prices
+            return QueryUnderstanding(intent=intent, crop=entities["crop"], city=entities["location"])
+
+        return QueryUnderstanding(intent=intent)
+
+    async def _afallback(self, query: str, local_intent: str = None) -> QueryUnderstanding:
+        intent = local_intent or await self.intent_service.adetect_intent_llm(query)
+
+        if intent == "weather":
+            city = await self.entity_extractor.aextract_weather_city(query)
+            return QueryUnderstanding(intent=intent, city=city)
+
+        if intent == "mandi_prices":
+            entities = await self.entity_extractor.aextract_mandi_entities(query)
+            return QueryUnderstanding(intent=intent, crop=entities["crop"], city=entities["location"])
+
+        return QueryUnderstanding(intent=intent)
+
+    @staticmethod
+    def _parse(content: str) -> QueryUnderstanding:
+        match = JSON_OBJECT.search(content)
+        if not match:
+            raise ValueError(f"No JSON object in response: {content!r}")
+
+        understanding = QueryUnderstanding.model_validate_json(match.group(0))
+        logger.info(f"🧠 Query understanding: {understanding.model_dump()}")
+        return understanding
+
+    @staticmethod
+    def _build_prompt(query: str) -> str:
+        return (
+            "You are the query understanding step of an Indian agricultural chatbot.\n"
+            "Classify the user query into the **single best intent** and extract its entities.\n\n"
+            "Intents:\n"
+            "- weather: weather forecasts, temperature, rainfall, climate updates.\n"
+            "- mandi_prices: crop prices, market rates, mandi rates.\n"
+            "- schemes: government schemes, subsidies, financial benefits.\n"
+            "- agriculture_info: crop care, farming advice, aquaculture, pest control, agricultural machinery, and farming techniques.\n\n"
+            "Entities (use an empty string when not present):\n"
+            "- crop: the crop or commodity in singular form, e.g. \"tomato\" instead of \"tomatoes\".\n"
+            "- city: the Indian city, town or district mentioned in the query.\n"
+            "- state: the Indian state that city belongs to.\n"
+            "- district: the district that city belongs to.\n\n"
+            "Reply only with JSON in exactly this format, no explanation:\n"
+            "{\"intent\": \"<intent>\", \"crop\": \"<crop>\", \"city\": \"<city>\", \"state\": \"<state>\", \"district\": \"<district>\"}\n\n"
+            f"User query: \"{query}\"\n"
+            "JSON result:"
+        )
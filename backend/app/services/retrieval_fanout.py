@@ -0,0 +1,143 @@
+# backend/app/services/retrieval_fanout.py
+
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Deque, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from app.core.config import RAG_SOURCE_DEADLINE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+Retrieve = Callable[[str], List[Document]]
+
+# Every fan-out, for the /rag/stats endpoint
+_registry: Dict[str, "RetrieverFanout"] = {}
+
+
+def retrieval_stats() -> Dict[str, dict]:
+    return {name: fanout.stats() for name, fanout in _registry.items()}
+
+
+class SourceStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.hits = 0  # calls that returned at least one document in time
+        self.docs = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=500)
+        self.lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+
+        def pct(p: float) -> Optional[float]:
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 1) if latencies else None
+
+        return {
+            "calls": self.calls,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.calls, 3) if self.calls else None,
+            "docs": self.docs,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            # Includes stragglers that finished after the deadline
+            "latency_p50_ms": pct(50),
+            "latency_p95_ms": pct(95),
+        }
+
+
+class RetrieverFanout:
+    """
+    Queries several retrievers concurrently. Each source has a deadline measured from
+    the start of the fan-out; whatever arrived in time is returned in source order and
+    stragglers are dropped (their threads finish in the background and still count
+    towards latency stats). Calls run in the fan-out's own bounded pool, so stragglers
+    never tie up the shared blocking executor that TTS and the LLM calls use.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sources: Dict[str, Retrieve],
+        deadline: float = RAG_SOURCE_DEADLINE_SECONDS,
+        deadlines: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.name = name
+        self.sources = sources
+        self.deadlines = {source: (deadlines or {}).get(source, deadline) for source in sources}
+        self._stats = {source: SourceStats() for source in sources}
+        # Own pool: sync callers may already be running inside the shared executor, and slow
+        # sources must not starve it
+        self._pool = ThreadPoolExecutor(max_workers=len(sources) * 4, thread_name_prefix=f"{name}-fanout")
+        _registry[name] = self
+
+    def _call(self, source: str, query: str) -> List[Document]:
+        stats = self._stats[source]
+        start = time.perf_counter()
+        try:
+            docs = self.sources[source](query) or []
+        except Exception as e:
+            with stats.lock:
+                stats.errors += 1
+            logger.error(f"❌ {source} retrieval failed: {e}")
+            docs = []
+        with stats.lock:
+            stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+        return docs
+
+    def _collect(self, source: str, docs: Optional[List[Document]]) -> List[Document]:
+        stats = self._stats[source]
+        with stats.lock:
+            stats.calls += 1
+            if docs is None:
+                stats.timeouts += 1
+            elif docs:
+                stats.hits += 1
+                stats.docs += len(docs)
+
+        if docs is None:
+            logger.warning(f"⏱️ {source} missed its {self.deadlines[source]}s deadline, dropping it")
+            return []
+        logger.info(f"🔍 Retrieved {len(docs)} docs from {source}")
+        return docs
+
+    def retrieve(self, query: str) -> List[Document]:
+        start = time.monotonic()
+        futures = {source: self._pool.submit(self._call, source, query) for source in self.sources}
+
+        all_docs = []
+        for source, future in futures.items():
+            remaining = max(0.0, start + self.deadlines[source] - time.monotonic())
+            try:
+                docs = future.result(timeout=remaining)
+            except FutureTimeout:
+                docs = None
+            all_docs.extend(self._collect(source, docs))
+        return all_docs
+
+    async def aretrieve(self, query: str) -> List[Document]:
+        loop = asyncio.get_running_loop()
+        futures = {
+            source: loop.run_in_executor(self._pool, self._call, source, query) for source in self.sources
+        }
+
+        async def wait(source: str) -> List[Document]:
+            # asyncio.wait (unlike wait_for) leaves the straggler running so its latency is still recorded
+            done, _ = await asyncio.wait({futures[source]}, timeout=self.deadlines[source])
+            return self._collect(source, futures[source].result() if done else None)
+
+        results = await asyncio.gather(*(wait(source) for source in self.sources))
+        return [doc for docs in results for doc in docs]
+
+    def stats(self) -> dict:
+        return {
+            source: {**stats.snapshot(), "deadline_seconds": self.deadlines[source]}
+            for source, stats in self._stats.items()
+        }
@@ -3,88 +3,142 @@
 import os
 import re
 import logging
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
-from pinecone import Pinecone, ServerlessSpec
-from langchain_community.document_loaders import TextLoader
 from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_pinecone import PineconeVectorStore
+
+from app.core.config import BASE_DIR, INGEST_BATCH_SIZE, RAG_HYBRID_CANDIDATES, RAG_RRF_K
+from app.services.embeddings import CachedEmbeddings, get_embeddings
+from app.services.hybrid_search import (
+    SchemeNameIndex,
+    SparseIndex,
+    filter_mask,
+    infer_filters,
+    reciprocal_rank_fusion,
+)
+from app.services.scheme_ingestion import EmbeddingManifest, IngestReport, chunk_id, file_sha, ingest_documents
+from app.services.vector_store import Filter, VectorStore, get_vector_store
 
 logger = logging.getLogger(__name__)
 
 
+def load_scheme_chunks(file_path: str) -> List[Document]:
+    """
+    Parses schemes.txt into per-scheme documents (title, type, scope, state and tags as
+    metadata) and splits them into ~500 character chunks.
+    """
+    logger.info("📂 Loading schemes from file")
+    with open(file_path, encoding="utf-8") as f:
+        full_text = f.read()
+
+    raw_schemes = re.split(r"### Scheme:\s*", full_text)[1:]
+
+    parsed_docs = []
+    for scheme in raw_schemes:
+        title = re.match(r"(.+?)\s*Type:", scheme).group(1).strip()
+        type_match = re.search(r"Type:\s*(.+?)\s*Tags:", scheme)
+        tags_match = re.search(r"Tags:\s*(.+?)\s*Description:", scheme)
+        desc_match = re.search(r"Description:\s*(.+)", scheme, re.DOTALL)
+        scheme_type = type_match.group(1).strip() if type_match else ""
+        state_match = re.match(r"State\s*\((.+?)\)", scheme_type)
+
+        doc = Document(
+            page_content=desc_match.group(1).strip() if desc_match else "",
+            metadata={
+                "title": title,
+                "type": scheme_type,
+                # "Central" (incl. centrally sponsored) or "State", plus the state name for state schemes
+                "scope": "State" if scheme_type.startswith("State") else "Central",
+                "state": state_match.group(1).strip() if state_match else "",
+                "tags": [tag.strip() for tag in tags_match.group(1).split(",")] if tags_match else []
+            }
+        )
+        parsed_docs.append(doc)
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
+    return splitter.split_documents(parsed_docs)
+
+
 class SchemeRetriever:
-    def __init__(self, file_path: str = "rag_store/schemes.txt") -> None:
+    def __init__(self, file_path: str = os.path.join(BASE_DIR, "rag_store", "schemes.txt"),
+                 store: Optional[VectorStore] = None, auto_index: bool = True,
+                 embeddings: Optional[CachedEmbeddings] = None) -> None:
         self.file_path = file_path
-        self.index_name = os.getenv("PINECONE_INDEX_NAME", "schemes")
-        self.embedding_model = HuggingFaceEmbeddings(model_name="intfloat/e5-large-v2")
-        self.pinecone_api_key = os.getenv("PINECONE_API_KEY")
-        self.pinecone_env = os.getenv("PINECONE_ENVIRONMENT", "us-east1-gcp")
-
-        if not self.pinecone_api_key:
-            raise ValueError("❌ Missing PINECONE_API_KEY")
-
-        self._init_pinecone()
-        self._load_or_create_index()
-
-    def _init_pinecone(self):
-        try:
-            self.pinecone_client = Pinecone(api_key=self.pinecone_api_key)
-            logger.info("✅ Pinecone client initialized")
-        except Exception as e:
-            logger.error(f"❌ Pinecone init error: {e}")
-            raise
-
-    def _load_or_create_index(self):
-        if self.index_name not in self.pinecone_client.list_indexes().names():
-            logger.info("📌 Creating new Pinecone index")
-            self.pinecone_client.create_index(
-                name=self.index_name,
-                dimension=1024,
-                metric="cosine",
-                spec=ServerlessSpec(cloud="aws", region="us-east-1")
-            )
-        self.index = self.pinecone_client.Index(self.index_name)
-        self.vectorstore = PineconeVectorStore(
-            index_name=self.index_name,
-            embedding=self.embedding_model
+        # Repeated questions and unchanged chunks are served from the embedding cache
+        self.embedding_model = embeddings or get_embeddings()
+        self.model_name = self.embedding_model.model_name
+        self.store = store if store is not None else get_vector_store()
+
+        self.stats = {"name_hits": 0, "hybrid": 0}
+        self._build_sparse_index()
+
+        # The local index is derived data: (re)build it when schemes.txt, the model or the
+        # chunking changed, i.e. when its chunk ids no longer match the BM25 index's
+        if auto_index and self.store.name == "local":
+            manifest = EmbeddingManifest(self.store)
+            ids = [chunk.metadata["id"] for chunk in self.chunks]
+            if not len(self.store) or not manifest.is_current(file_sha(self.file_path), self.model_name, ids):
+                logger.info("📌 Local vector store is out of date, indexing schemes")
+                self.load_and_upload_documents()
+
+    def load_documents(self) -> List[Document]:
+        return load_scheme_chunks(self.file_path)
+
+    def load_and_upload_documents(self, full: bool = False, batch_size: int = INGEST_BATCH_SIZE) -> IngestReport:
+        """
+        Incremental ingestion: only new or changed chunks are embedded and upserted,
+        and vectors of removed chunks are deleted.
+        """
+        return ingest_documents(
+            self.load_documents(),
+            self.store,
+            self.embedding_model,
+            self.model_name,
+            source_sha=file_sha(self.file_path),
+            batch_size=batch_size,
+            full=full,
         )
 
-    def load_and_upload_documents(self):
-        logger.info("📂 Loading schemes from file")
-        loader = TextLoader(self.file_path, encoding="utf-8")
-        documents = loader.load()
-
-        full_text = "\n".join(doc.page_content for doc in documents)
-        raw_schemes = re.split(r"### Scheme:\s*", full_text)[1:]
-
-        parsed_docs = []
-        for scheme in raw_schemes:
-            title = re.match(r"(.+?)\s*Type:", scheme).group(1).strip()
-            type_match = re.search(r"Type:\s*(.+?)\s*Tags:", scheme)
-            tags_match = re.search(r"Tags:\s*(.+?)\s*Description:", scheme)
-            desc_match = re.search(r"Description:\s*(.+)", scheme, re.DOTALL)
-
-            doc = Document(
-                page_content=desc_match.group(1).strip() if desc_match else "",
-                metadata={
-                    "title": title,
-                    "type": type_match.group(1).strip() if type_match else "",
-                    "tags": [tag.strip() for tag in tags_match.group(1).split(",")] if tags_match else []
-                }
-            )
-            parsed_docs.append(doc)
-
-        splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-        chunked_docs = splitter.split_documents(parsed_docs)
-
-        logger.info(f"📦 Uploading {len(chunked_docs)} chunks to Pinecone")
-        self.vectorstore.add_documents(chunked_docs)
-
-        logger.info("✅ Schemes embedded and stored successfully")
-
-    def retrieve(self, query: str, k: int = 5) -> List[Document]:
-        retriever = self.vectorstore.as_retriever(search_type="similarity", search_kwargs={"k": k})
-        return retriever.invoke(query)
+    def _build_sparse_index(self) -> None:
+        # Built from the source file (not the vector store) so it works with any backend
+        chunks = self.load_documents()
+        for chunk in chunks:
+            chunk.metadata["id"] = chunk_id(chunk)
+        self.chunks = chunks
+        self.sparse = SparseIndex(chunks)
+        self.names = SchemeNameIndex(chunk.metadata["title"] for chunk in chunks)
+        self.states = {chunk.metadata["state"] for chunk in chunks if chunk.metadata["state"]}
+        logger.info(f"✅ Sparse scheme index built ({len(chunks)} chunks, {len(self.names.aliases)} names)")
+
+    def retrieve(self, query: str, k: int = 5, where: Filter = None) -> List[Document]:
+        """
+        Hybrid retrieval. A query naming a scheme ("PMFBY", "PM-KISAN eligibility") is
+        answered from that scheme's chunks by BM25 alone, without the embedding model.
+        Otherwise BM25 and dense candidates are fused with reciprocal rank fusion, under
+        `where` or the filters the query implies (a state, "central schemes").
+        """
+        titles = self.names.match(query)
+        if titles:
+            self.stats["name_hits"] += 1
+            mask = filter_mask(self.chunks, {"title": titles})
+            hits = self.sparse.search(query, k, mask)
+            if len(hits) < k:
+                # Fill up with the scheme's remaining chunks in file order
+                hits += [i for i in np.flatnonzero(mask).tolist() if i not in hits][:k - len(hits)]
+            return [self.chunks[i] for i in hits]
+
+        self.stats["hybrid"] += 1
+        where = where or infer_filters(query, self.states)
+        sparse_ids = [self.chunks[i].metadata["id"]
+                      for i in self.sparse.search(query, RAG_HYBRID_CANDIDATES, filter_mask(self.chunks, where))]
+        vector = self.embedding_model.embed_query(query)
+        dense = self.store.search(vector, RAG_HYBRID_CANDIDATES, where)
+        dense_ids = [doc.metadata["id"] for doc, _ in dense]
+
+        by_id = {chunk.metadata["id"]: chunk for chunk in self.chunks}
+        by_id.update({doc.metadata["id"]: doc for doc, _ in dense})
+        fused = reciprocal_rank_fusion([sparse_ids, dense_ids], RAG_RRF_K)
+        return [by_id[id_] for id_ in fused[:k]]
@@ -0,0 +1,169 @@
+# backend/app/services/scheme_ingestion.py
+
+import os
+import json
+import time
+import hashlib
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional
+
+from langchain_core.documents import Document
+
+from app.core.config import INGEST_BATCH_SIZE, VECTOR_STORE_DIR
+from app.services.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+# Bump when chunking or chunk metadata changes (it changes every chunk id), so existing
+# indexes are rebuilt even though schemes.txt and the model are the same
+CHUNK_SCHEMA = 2
+
+
+@dataclass
+class IngestReport:
+    chunks: int = 0
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    embed_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def file_sha(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def chunk_id(doc: Document) -> str:
+    """
+    Stable id from the chunk's content and metadata: the same chunk always maps to the
+    same vector whatever order the file is in, and a metadata edit is re-upserted.
+    """
+    metadata = json.dumps(doc.metadata, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(f"{metadata}\n{doc.page_content}".encode("utf-8")).hexdigest()
+    return f"scheme-{digest[:20]}"
+
+
+def chunk_keys(docs: List[Document]) -> List[str]:
+    # Position of a chunk within its scheme; a changed chunk keeps its key, so it counts as updated
+    seen: Dict[str, int] = {}
+    keys = []
+    for doc in docs:
+        title = doc.metadata.get("title", "")
+        seen[title] = seen.get(title, 0) + 1
+        keys.append(f"{title}#{seen[title]}")
+    return keys
+
+
+class EmbeddingManifest:
+    """
+    Records which chunk id is stored under each (scheme, position) key, the embedding
+    model that produced the vectors and the hash of the source file, per vector store.
+    """
+
+    def __init__(self, store: VectorStore, directory: str = VECTOR_STORE_DIR) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"manifest_{store.name}.json")
+        self.data = {"model": None, "source_sha": None, "schema": None, "chunks": {}}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.data.update(json.load(f))
+
+    @property
+    def chunks(self) -> Dict[str, str]:
+        return self.data["chunks"]
+
+    def is_current(self, source_sha: str, model: str, chunk_ids: Optional[Iterable[str]] = None) -> bool:
+        """
+        True if the store was built from this file, model and chunk schema and, when
+        `chunk_ids` is given, holds exactly those chunks.
+        """
+        if (self.data["source_sha"], self.data["model"], self.data["schema"]) != (source_sha, model, CHUNK_SCHEMA):
+            return False
+        return chunk_ids is None or set(chunk_ids) == set(self.chunks.values())
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+def ingest_documents(
+    docs: List[Document],
+    store: VectorStore,
+    embeddings,
+    model_name: str,
+    source_sha: str = "",
+    batch_size: int = INGEST_BATCH_SIZE,
+    full: bool = False,
+    manifest: Optional[EmbeddingManifest] = None,
+) -> IngestReport:
+    """
+    Brings `store` in line with `docs`: embeds and upserts only new or changed chunks
+    (in batches of `batch_size`), deletes vectors for chunks that disappeared, and
+    updates the manifest. `full` or a different embedding model re-embeds everything.
+    """
+    start = time.perf_counter()
+    manifest = manifest or EmbeddingManifest(store)
+    report = IngestReport(chunks=len(docs))
+
+    full = full or manifest.data["model"] != model_name
+    previous = dict(manifest.chunks)
+    if full and manifest.chunks:
+        logger.info(f"♻️ Re-embedding all chunks (model {manifest.data['model']} -> {model_name})")
+
+    current: Dict[str, str] = {}
+    pending: List[tuple] = []
+    for key, doc in zip(chunk_keys(docs), docs):
+        id_ = chunk_id(doc)
+        current[key] = id_
+        old = previous.get(key)
+        if old == id_ and not full:
+            report.unchanged += 1
+            continue
+        if old is None:
+            report.added += 1
+        else:
+            report.updated += 1
+        pending.append((id_, doc))
+
+    for i in range(0, len(pending), batch_size):
+        batch = pending[i:i + batch_size]
+        embed_start = time.perf_counter()
+        vectors = embeddings.embed_documents([doc.page_content for _, doc in batch])
+        report.embed_seconds += time.perf_counter() - embed_start
+        store.upsert(
+            [id_ for id_, _ in batch],
+            vectors,
+            [doc.page_content for _, doc in batch],
+            [doc.metadata for _, doc in batch],
+        )
+        logger.info(f"📦 Upserted {min(i + batch_size, len(pending))}/{len(pending)} chunks")
+
+    # Anything stored that the new chunk set doesn't reference (removed or replaced chunks,
+    # or leftovers from before the manifest existed) is deleted
+    live = set(current.values())
+    known = set(previous.values())
+    if full or store.name == "local":
+        # Listing a remote index is slow, so Pinecone orphans are only swept on full runs
+        known |= set(store.ids())
+    stale = sorted(known - live)
+    report.deleted = len(stale)
+    store.delete(stale)
+
+    manifest.data.update({"model": model_name, "source_sha": source_sha, "schema": CHUNK_SCHEMA, "chunks": current})
+    manifest.save()
+
+    report.embed_seconds = round(report.embed_seconds, 3)
+    report.total_seconds = round(time.perf_counter() - start, 3)
+    logger.info(
+        f"✅ Ingested {report.chunks} chunks: {report.added} added, {report.updated} updated, "
+        f"{report.deleted} deleted, {report.unchanged} unchanged in {report.total_seconds}s"
+    )
+    return report
@@ -1,24 +1,55 @@
-import os
 import logging
 from typing import List
-from langchain_groq import ChatGroq
 from langchain_core.prompts import PromptTemplate
 from langchain_core.documents import Document
-from langchain_community.retrievers import WikipediaRetriever
 from duckduckgo_search import DDGS
 
-from app.services.retriever import SchemeRetriever  # Pinecone retriever
+from app.core.config import RAG_COMPRESS_TOP_N, RAG_CONTEXT_TOKEN_BUDGET, RAG_SOURCE_DEADLINE_SECONDS
+from app.core.http_client import request
+from app.core.llm import get_llm
+from app.services.context_compressor import ContextCompressor
+from app.services.reranker import get_reranker, pack_passages
+from app.services.retrieval_fanout import RetrieverFanout
+from app.services.retriever import SchemeRetriever
 
 logger = logging.getLogger(__name__)
 
 
+WIKIPEDIA_API = "https://en.wikipedia.org/w/api.php"
+
+
+# Wikipedia search through the shared HTTP client, so calls have a timeout and a circuit breaker
+# (the `wikipedia` package behind langchain's WikipediaRetriever sets no timeout at all)
+class WikipediaSearchRetriever:
+    def __init__(self, k: int = 3, timeout: float = RAG_SOURCE_DEADLINE_SECONDS):
+        self.k = k
+        self.timeout = timeout
+
+    def invoke(self, query: str) -> List[Document]:
+        # One call: search, then the plain-text intro of each hit
+        response = request("GET", WIKIPEDIA_API, timeout=self.timeout, retries=0, params={
+            "action": "query", "format": "json", "generator": "search", "gsrsearch": query,
+            "gsrlimit": self.k, "prop": "extracts", "exintro": 1, "explaintext": 1, "exlimit": self.k,
+        }, headers={"User-Agent": "Agribot/1.0"})
+        response.raise_for_status()
+        pages = sorted(response.json().get("query", {}).get("pages", {}).values(), key=lambda p: p.get("index", 0))
+        return [
+            Document(
+                page_content=page["extract"],
+                metadata={"title": page["title"], "source": f"https://en.wikipedia.org/?curid={page['pageid']}"},
+            )
+            for page in pages if page.get("extract")
+        ]
+
+
 # Simple DuckDuckGo retriever
 class SimpleDuckDuckGoRetriever:
-    def __init__(self, k: int = 3):
+    def __init__(self, k: int = 3, timeout: float = RAG_SOURCE_DEADLINE_SECONDS):
         self.k = k
+        self.timeout = timeout
 
     def invoke(self, query: str) -> List[Document]:
-        with DDGS() as ddgs:
+        with DDGS(timeout=max(1, int(self.timeout))) as ddgs:
             results = ddgs.text(query, max_results=self.k)
             return [
                 Document(page_content=r.get("body", ""), metadata={"source": r.get("href", "")})
@@ -30,24 +61,32 @@ class SimpleDuckDuckGoRetriever:
 class SchemesRAGService:
     def __init__(self) -> None:
         try:
-            self.llm = ChatGroq(
-                api_key=os.getenv("GROQ_API_KEY"),
-                model_name="llama3-8b-8192"
-            )
+            self.llm = get_llm()
             logger.info("✅ Groq LLM initialized for RAG")
         except Exception as e:
             logger.error(f"❌ Groq initialization failed: {e}")
             raise
 
         try:
-            self.scheme_retriever = SchemeRetriever()  # Pinecone retriever
-            self.wikipedia_retriever = WikipediaRetriever(top_k_results=3, lang="en")
+            self.scheme_retriever = SchemeRetriever()  # local or Pinecone index, per VECTOR_STORE_BACKEND
+            self.wikipedia_retriever = WikipediaSearchRetriever(k=3)
             self.duckduckgo_retriever = SimpleDuckDuckGoRetriever(k=3)
             logger.info("✅ All retrievers initialized")
         except Exception as e:
             logger.error(f"❌ Retriever initialization failed: {e}")
             raise
 
+        # Sources are queried concurrently; total latency is the slowest source within its deadline.
+        # The scheme index is labelled by role, not backend, so /rag/stats keys stay stable.
+        self.retrievers = RetrieverFanout("schemes", {
+            "schemes_index": self.scheme_retriever.retrieve,
+            "Wikipedia": self.wikipedia_retriever.invoke,
+            "DuckDuckGo": self.duckduckgo_retriever.invoke,
+        })
+
+        self.reranker = get_reranker()
+        self.compressor = ContextCompressor(reranker=self.reranker)
+
         # Prompt templates
         self.rewrite_prompt = PromptTemplate.from_template(
             "Rewrite the following user query to optimize it for document retrieval.\n"
@@ -55,11 +94,6 @@ class SchemesRAGService:
             "User Query: {question}\nRewritten Query:"
         )
 
-        self.compression_prompt = PromptTemplate.from_template(
-            "Summarize the following document by keeping only the parts relevant to answering the user's question.\n\n"
-            "User Question: {question}\n\nDocument:\n{document}\n\nCompressed Content:"
-        )
-
         self.final_prompt = PromptTemplate.from_template(
             "You are an expert assistant for Indian farmers. Use the following context to answer the user's question.\n\n"
             "Context:\n{context}\n\nUser Question: {question}\n\nAnswer:"
@@ -70,47 +104,32 @@ class SchemesRAGService:
         response = self.llm.invoke(self.rewrite_prompt.format(question=query))
         return response.content.strip()
 
-    # 2. Retrieve documents from all retrievers
+    async def arewrite_query(self, query: str) -> str:
+        response = await self.llm.ainvoke(self.rewrite_prompt.format(question=query))
+        return response.content.strip()
+
+    # 2. Retrieve documents from all retrievers (concurrently, per-source deadline)
     def retrieve_documents(self, query: str) -> List[Document]:
-        all_docs = []
+        return self.retrievers.retrieve(query)
 
-        try:
-            pinecone_docs = self.scheme_retriever.retrieve(query)
-            logger.info(f"🔍 Retrieved {len(pinecone_docs)} docs from Pinecone")
-            all_docs.extend(pinecone_docs)
-        except Exception as e:
-            logger.error(f"❌ Pinecone retrieval failed: {e}")
+    async def aretrieve_documents(self, query: str) -> List[Document]:
+        return await self.retrievers.aretrieve(query)
 
-        try:
-            wiki_docs = self.wikipedia_retriever.invoke(query)
-            logger.info(f"🔍 Retrieved {len(wiki_docs)} docs from Wikipedia")
-            all_docs.extend(wiki_docs)
-        except Exception as e:
-            logger.error(f"❌ Wikipedia retrieval failed: {e}")
+    # 3. Rerank, keep the top N and compress them (one batched LLM call, skipped if they already fit)
+    def compress_documents(self, docs: List[Document], query: str) -> List[Document]:
+        return self.compressor.compress(docs, query)
 
-        try:
-            ddg_docs = self.duckduckgo_retriever.invoke(query)
-            logger.info(f"🔍 Retrieved {len(ddg_docs)} docs from DuckDuckGo")
-            all_docs.extend(ddg_docs)
-        except Exception as e:
-            logger.error(f"❌ DuckDuckGo retrieval failed: {e}")
+    async def acompress_documents(self, docs: List[Document], query: str) -> List[Document]:
+        return await self.compressor.acompress(docs, query)
 
-        return all_docs
+    # 4. Generate the final answer from the most relevant passages that fit the budget.
+    # compress_documents() already ranked them, so only the token budget is applied here.
+    def build_context(self, context_docs: List[Document], query: str) -> str:
+        selected = pack_passages(context_docs[:RAG_COMPRESS_TOP_N], RAG_CONTEXT_TOKEN_BUDGET)
+        return "\n\n".join(doc.page_content for doc in selected)
 
-    # 3. Compress each document to save tokens
-    def compress_documents(self, docs: List[Document], query: str) -> List[Document]:
-        compressed = []
-        for doc in docs:
-            try:
-                response = self.llm.invoke(self.compression_prompt.format(question=query, document=doc.page_content))
-                compressed.append(Document(page_content=response.content.strip(), metadata=doc.metadata))
-            except Exception as e:
-                logger.error(f"❌ Compression failed for a document: {e}")
-        return compressed
-
-    # 4. Generate the final answer from context
     def generate_answer(self, context_docs: List[Document], query: str) -> str:
-        context = "\n\n".join(doc.page_content for doc in context_docs[:5])  # limit to 5 chunks
+        context = self.build_context(context_docs, query)
         try:
             response = self.llm.invoke(self.final_prompt.format(context=context, question=query))
             return response.content.strip()
@@ -118,6 +137,15 @@ class SchemesRAGService:
             logger.error(f"❌ Answer generation failed: {e}")
             return "Sorry, I couldn't generate an answer."
 
+    async def agenerate_answer(self, context_docs: List[Document], query: str) -> str:
+        context = self.build_context(context_docs, query)
+        try:
+            response = await self.llm.ainvoke(self.final_prompt.format(context=context, question=query))
+            return response.content.strip()
+        except Exception as e:
+            logger.error(f"❌ Answer generation failed: {e}")
+            return "Sorry, I couldn't generate an answer."
+
     # 5. Complete RAG pipeline
     def run_rag_pipeline(self, user_query: str) -> str:
         logger.info("🚀 Running RAG pipeline")
@@ -142,3 +170,22 @@ class SchemesRAGService:
         except Exception as e:
             logger.error(f"❌ RAG pipeline failed: {e}")
             return "Sorry, something went wrong while retrieving schemes."
+
+    # Async pipeline: LLM calls use the native async client, retrievers fan out in the bounded executor
+    async def arun_rag_pipeline(self, user_query: str) -> str:
+        logger.info("🚀 Running RAG pipeline (async)")
+        try:
+            rewritten_query = await self.arewrite_query(user_query)
+            logger.info(f"🔧 Rewritten query: {rewritten_query}")
+
+            docs = await self.aretrieve_documents(rewritten_query)
+
+            if not docs:
+                return "Sorry, I couldn't find relevant government schemes or information."
+
+            compressed_docs = await self.acompress_documents(docs, rewritten_query)
+            return await self.agenerate_answer(compressed_docs, user_query)
+
+        except Exception as e:
+            logger.error(f"❌ RAG pipeline failed: {e}")
+            return "Sorry, something went wrong while retrieving schemes."
@@ -0,0 +1,159 @@
+# backend/app/services/speech_utils/audio_cache.py
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from app.core.cache import register_cache
+from app.core.config import TTS_AUDIO_DIR, TTS_CACHE_MAX_AGE_DAYS, TTS_CACHE_MAX_MB
+
+logger = logging.getLogger(__name__)
+
+
+def audio_key(text: str, lang: str, slow: bool, engine: str = "gtts") -> str:
+    raw = f"{engine}\n{lang}\n{int(slow)}\n{' '.join(text.split())}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class AudioCache:
+    """
+    Content-addressed TTS output: <hash of engine, text, lang, slow>.mp3 in the static audio
+    directory, so identical answers are synthesized once and served as files. A file's
+    mtime is its last use; evict() drops files unused for `max_age` seconds and then the
+    least recently used ones until the directory fits in `max_bytes`.
+    """
+
+    def __init__(self, directory: str = TTS_AUDIO_DIR, max_bytes: int = int(TTS_CACHE_MAX_MB * 1024 * 1024),
+                 max_age: float = TTS_CACHE_MAX_AGE_DAYS * 86400) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.evicted_bytes = 0
+        self.last_sweep: Optional[float] = None
+        register_cache("tts_audio", self)
+        logger.info(f"✅ TTS audio cache ready ({directory}, {max_bytes // (1024 * 1024)} MB)")
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        # One synthesis per key: concurrent requests for the same answer wait for the first.
+        # The entry is dropped on exit, so the dict only holds keys being rendered.
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            try:
+                yield
+            finally:
+                with self._guard:
+                    if self._locks.get(key) is lock:
+                        del self._locks[key]
+
+    def get(self, key: str, count: bool = True) -> Optional[str]:
+        # count=False lets a caller probing several keys record one lookup itself
+        path = self.path(key)
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            if count:
+                self.misses += 1
+            return None
+        if count:
+            self.hits += 1
+        return path
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def put(self, key: str, write) -> str:
+        """
+        Calls `write(tmp_path)` and moves the result into place atomically, so a
+        half-written file is never served.
+        """
+        path = self.path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+    def _files(self):
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(".mp3"):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def disk_usage(self) -> dict:
+        files = list(self._files())
+        return {"files": len(files), "bytes": sum(size for _, size, _ in files)}
+
+    def evict(self) -> int:
+        """
+        Age- then size-based sweep of the directory (legacy uuid-named files included).
+        Returns the number of files removed.
+        """
+        now = time.time()
+        files = sorted(self._files(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for path, size, mtime in files:
+            expired = self.max_age and now - mtime > self.max_age
+            if not expired and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            removed += 1
+            self.evicted_bytes += size
+        self.evicted += removed
+        self.last_sweep = now
+        if removed:
+            logger.info(f"🧹 Evicted {removed} TTS audio file(s), {total / (1024 * 1024):.1f} MB left")
+        return removed
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            **self.disk_usage(),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evicted": self.evicted,
+            "evicted_bytes": self.evicted_bytes,
+            "last_sweep": self.last_sweep,
+        }
+
+
+async def run_audio_janitor(cache: AudioCache, interval_minutes: float) -> None:
+    """
+    Background task started from the app lifespan: sweeps the audio directory now and
+    then every `interval_minutes`.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(cache.evict)
+        except Exception as e:
+            logger.error(f"❌ TTS audio sweep failed: {e}")
+        await asyncio.sleep(interval_minutes * 60)
@@ -1,23 +1,73 @@
+import asyncio
 import logging
 import os
-import whisper
 import subprocess
-from typing import Optional
-import tempfile
-import uuid
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Optional, Union
+
+from app.core.cache import register_cache
+from app.core.config import (
+    STT_BACKEND,
+    STT_COMPUTE_TYPE,
+    STT_LANGUAGE_MODELS,
+    STT_MODEL_SIZE,
+    STT_QUEUE_SIZE,
+    STT_THREADS_PER_WORKER,
+    STT_WORKERS,
+)
+from app.services.speech_utils import stt_worker
 
 logger = logging.getLogger(__name__)
 
+
+class STTOverloaded(Exception):
+    """
+    Raised instead of queueing an upload when every worker is busy and the queue is full.
+    """
+
+
 class SpeechToTextService:
-    def __init__(self, model_size: str = "small") -> None:
+    """
+    Dispatches transcriptions to a pool of worker processes with preloaded, warmed
+    models, so Whisper never runs in (or holds the GIL of) the API process. At most
+    `workers + queue_size` jobs are admitted; beyond that STTOverloaded is raised.
+    """
+
+    def __init__(self, model_size: str = STT_MODEL_SIZE, workers: int = STT_WORKERS,
+                 queue_size: int = STT_QUEUE_SIZE, backend: str = STT_BACKEND) -> None:
+        if workers < 1:
+            raise ValueError(f"STT_WORKERS must be at least 1, got {workers}")
         try:
             self.setup_ffmpeg()
-            self.model = whisper.load_model(model_size)
-            logger.info(f"Whisper model '{model_size}' loaded successfully.")
+            self.model_size = model_size
+            self.workers = workers
+            self.capacity = workers + queue_size
+            sizes = list(dict.fromkeys([model_size, *STT_LANGUAGE_MODELS.values()]))
+            self._initargs = (backend, sizes, STT_COMPUTE_TYPE, STT_THREADS_PER_WORKER)
+            self.pool = self._new_pool()
+            # Start the workers now and surface model loading errors at startup
+            pids = {future.result() for future in wait([self.pool.submit(stt_worker.ready) for _ in range(workers)]).done}
+            logger.info(f"✅ STT pool ready: {len(pids)} worker(s), {backend} {sizes}, queue {queue_size}")
         except Exception as e:
-            logger.error(f"Error loading Whisper model: {e}")
+            logger.error(f"Error starting speech-to-text workers: {e}")
             raise RuntimeError("SpeechToTextService initialization failed.") from e
 
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self.restarts = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.transcribe_seconds = 0.0
+        register_cache("speech_to_text", self)
+
     def setup_ffmpeg(self):
         """Add FFmpeg to PATH if needed and verify it's installed."""
         ffmpeg_dir = r"C:\ffmpeg\bin"  # 🧠 Update this for deployment if needed
@@ -35,40 +85,108 @@ class SpeechToTextService:
             logger.error(f"❌ FFmpeg setup error: {e}")
             raise RuntimeError("FFmpeg setup failed.")
 
-    def preprocess_audio(self, input_path: str) -> str:
-        """Convert input to 16kHz mono WAV."""
-        temp_wav = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4().hex}.wav")
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", input_path,
-            "-ar", "16000",
-            "-ac", "1",
-            "-c:a", "pcm_s16le",
-            temp_wav,
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            logger.error(f"❌ Audio conversion failed: {result.stderr}")
-            raise RuntimeError("Audio conversion failed.")
-        
-        logger.info(f"✅ Audio converted to WAV: {temp_wav}")
-        return temp_wav
-
-    def transcribe_audio(self, file_path: str, language: Optional[str] = None) -> str:
-        if not os.path.exists(file_path):
-            logger.error(f"🚫 File not found: {file_path}")
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        ext = os.path.splitext(file_path)[1].lower()
-        should_convert = ext in [".webm", ".opus", ".m4a", ".aac", ".flac", ".ogg", ".wma", ".mp3"]
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that already has threads (and maybe torch) is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context("spawn"),
+            initializer=stt_worker.init_worker,
+            initargs=self._initargs,
+        )
+
+    def _restart_pool(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Replaces a pool that broke because a worker died (OOM kill, segfault). Models
+        load again in the new workers, on the first job each one takes.
+        """
+        with self._pool_lock:
+            if self.pool is not broken:
+                return  # another request already replaced it
+            logger.error("❌ STT worker died, restarting the pool")
+            self.pool = self._new_pool()
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def model_for(self, language: Optional[str]) -> str:
+        return STT_LANGUAGE_MODELS.get(language or "", self.model_size)
 
+    def _submit(self, audio: Union[bytes, str], language: Optional[str]) -> Future:
+        if isinstance(audio, str):
+            if not os.path.exists(audio):
+                logger.error(f"🚫 File not found: {audio}")
+                raise FileNotFoundError(f"File not found: {audio}")
+            with open(audio, "rb") as f:
+                audio = f.read()
+
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise STTOverloaded(f"{self.in_flight} transcriptions in flight")
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        submitted_at = time.time()
         try:
-            target_path = self.preprocess_audio(file_path) if should_convert else file_path
-            result = self.model.transcribe(target_path, language=language)
-            transcription = result.get("text", "").strip()
-            logger.info(f"✅ Transcription completed.")
-            return transcription
-        finally:
-            if should_convert and os.path.exists(target_path):
-                os.remove(target_path)
+            pool = self.pool
+            try:
+                future = pool.submit(stt_worker.transcribe, audio, language, self.model_for(language))
+            except BrokenProcessPool:
+                self._restart_pool(pool)
+                future = self.pool.submit(stt_worker.transcribe, audio, language, self.model_for(language))
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+                self.failed += 1
+            raise
+
+        def done(f: Future) -> None:
+            with self._lock:
+                self.in_flight -= 1
+                if f.cancelled() or f.exception() is not None:
+                    self.failed += 1
+                    return
+                _, started_at, seconds = f.result()
+                self.completed += 1
+                self.wait_seconds += max(0.0, started_at - submitted_at)
+                self.transcribe_seconds += seconds
+
+        future.add_done_callback(done)
+        return future
+
+    def transcribe_audio(self, audio: Union[bytes, str], language: Optional[str] = None) -> str:
+        """
+        Transcribes uploaded audio bytes (or a file path). Decoding happens in memory in
+        the worker, so nothing is written to disk.
+        """
+        transcription = self._submit(audio, language).result()[0]
+        logger.info("✅ Transcription completed.")
+        return transcription
+
+    async def atranscribe_audio(self, audio: Union[bytes, str], language: Optional[str] = None) -> str:
+        """
+        Async variant of transcribe_audio(); awaits the worker without blocking the event loop.
+        """
+        transcription = (await asyncio.wrap_future(self._submit(audio, language)))[0]
+        logger.info("✅ Transcription completed.")
+        return transcription
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - self.workers),
+                "peak_in_flight": self.peak_in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "pool_restarts": self.restarts,
+                "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 1) if self.completed else None,
+                "avg_transcribe_ms": (
+                    round(self.transcribe_seconds / self.completed * 1000, 1) if self.completed else None
+                ),
+            }
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,114 @@
+# backend/app/services/speech_utils/stt_worker.py
+"""
+Code that runs inside the speech-to-text worker processes. Each worker loads its models
+once in `init_worker`, warms them up on a second of silence, and then serves
+`transcribe` calls. Everything here is module-level so it can be pickled by the pool.
+"""
+
+import os
+import time
+import logging
+import tempfile
+import subprocess
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import STT_DECODE_TIMEOUT_SECONDS
+from app.core.logger import setup_logger
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+_backend = "whisper"
+_compute_type = "int8"
+_threads = 1
+_models: Dict[str, object] = {}
+
+
+def _load(size: str):
+    if _backend == "faster-whisper":
+        from faster_whisper import WhisperModel
+
+        return WhisperModel(size, device="cpu", compute_type=_compute_type, cpu_threads=_threads)
+    if _backend == "whisper":
+        import whisper
+
+        return whisper.load_model(size, device="cpu")
+    raise ValueError(f"Unknown STT backend '{_backend}'")
+
+
+def _run(model, audio, language: Optional[str]) -> str:
+    if _backend == "faster-whisper":
+        segments, _ = model.transcribe(audio, language=language, beam_size=1, vad_filter=True)
+        return "".join(segment.text for segment in segments).strip()
+    return model.transcribe(audio, language=language, fp16=False).get("text", "").strip()
+
+
+def _model(size: str):
+    model = _models.get(size)
+    if model is None:
+        start = time.perf_counter()
+        model = _models[size] = _load(size)
+        _run(model, np.zeros(SAMPLE_RATE, dtype=np.float32), "en")  # warm-up
+        logger.info(f"✅ STT worker {os.getpid()}: {_backend} '{size}' ready in {time.perf_counter() - start:.1f}s")
+    return model
+
+
+def init_worker(backend: str, sizes: Iterable[str], compute_type: str, threads: int) -> None:
+    global _backend, _compute_type, _threads
+    setup_logger()
+    _backend, _compute_type, _threads = backend, compute_type, threads
+    if backend == "whisper":
+        import torch
+
+        torch.set_num_threads(threads)
+    for size in sizes:
+        _model(size)
+
+
+def ready() -> int:
+    return os.getpid()
+
+
+def decode_audio(data: bytes, sample_rate: int = SAMPLE_RATE,
+                 timeout: float = STT_DECODE_TIMEOUT_SECONDS) -> np.ndarray:
+    """
+    Decodes any ffmpeg-readable upload to 16 kHz mono float32 samples over pipes,
+    without touching the disk. MP4/M4A files whose index sits at the end can't be read
+    from a pipe; those are retried through a temporary file that is always removed.
+    """
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", "{input}",
+           "-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "pipe:1"]
+    try:
+        result = subprocess.run([arg.replace("{input}", "pipe:0") for arg in cmd], input=data,
+                                capture_output=True, timeout=timeout)
+        if result.returncode != 0 or not result.stdout:
+            # Closed before ffmpeg opens it: Windows won't let a second process open it otherwise
+            with tempfile.NamedTemporaryFile(suffix=".audio", delete=False) as f:
+                f.write(data)
+            try:
+                result = subprocess.run([arg.replace("{input}", f.name) for arg in cmd],
+                                        capture_output=True, timeout=timeout)
+            finally:
+                os.remove(f.name)
+    except subprocess.TimeoutExpired:
+        logger.error(f"❌ Audio conversion timed out after {timeout}s")
+        raise RuntimeError("Audio conversion timed out.")
+
+    if result.returncode != 0:
+        logger.error(f"❌ Audio conversion failed: {result.stderr.decode(errors='replace')[-500:]}")
+        raise RuntimeError("Audio conversion failed.")
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def transcribe(data: bytes, language: Optional[str], size: str) -> Tuple[str, float, float]:
+    """
+    Transcribes raw upload bytes. Returns (text, wall-clock start time, seconds spent);
+    the start time lets the parent measure how long the job waited in the queue.
+    """
+    started_at = time.time()
+    start = time.perf_counter()
+    text = _run(_model(size), decode_audio(data), language)
+    return text, started_at, time.perf_counter() - start
@@ -1,40 +1,227 @@
 import os
-import uuid
+import re
+import asyncio
 import logging
-from gtts import gTTS
+import time
+import shutil
+from typing import AsyncIterator, List
+
+from app.core.cache import register_cache
+from app.core.config import TTS_CHUNK_CHARS, TTS_FALLBACK_LANG, TTS_MAX_CONCURRENCY
+from app.core.executor import run_blocking
+from app.services.speech_utils.audio_cache import AudioCache, audio_key
+from app.services.speech_utils.tts_engines import ENGINE_CLASSES, engine_chain, get_tts_engine
 
 logger = logging.getLogger(__name__)
 
+# Sentence ends in Latin and Indic scripts (danda, double danda)
+SENTENCE_END = re.compile(r"(?<=[.!?।॥])\s+|\n+")
+# A period after these ("Rs. 2,300", "Dr. Rao", "e.g. wheat") doesn't end a sentence
+ABBREVIATIONS = {"rs", "dr", "mr", "mrs", "ms", "no", "vs", "st", "sr", "jr", "prof", "govt", "approx", "e.g", "i.e"}
+STREAM_BLOCK = 32 * 1024
+
+
+def tts_language(lang: str) -> str:
+    lang = (lang or "").split("-")[0].lower()
+    return lang if engine_chain(lang) else TTS_FALLBACK_LANG
+
+
+def speakable(text: str) -> bool:
+    # At least one letter or digit: blank or punctuation-only text makes gTTS raise
+    return any(ch.isalnum() for ch in text or "")
+
+
+def _is_sentence_end(text: str, match: re.Match) -> bool:
+    if "\n" in match.group() or not text[:match.start()].endswith("."):
+        return True
+    # A lowercase word or a number after the period continues the sentence
+    following = text[match.end():match.end() + 1]
+    if following.islower() or following.isdigit():
+        return False
+    return text[:match.start()].split()[-1][:-1].lower() not in ABBREVIATIONS
+
+
+def split_for_tts(text: str, max_chars: int = TTS_CHUNK_CHARS) -> List[str]:
+    """
+    Splits an answer at sentence boundaries. The first chunk is the first sentence on
+    its own, so streamed playback starts as early as possible; later sentences are
+    packed into chunks of up to `max_chars`. Returns [] when nothing is speakable.
+    """
+    sentences, start = [], 0
+    for match in SENTENCE_END.finditer(text or ""):
+        if _is_sentence_end(text, match):
+            sentences.append(text[start:match.start()])
+            start = match.end()
+    sentences.append((text or "")[start:])
+
+    chunks: List[str] = []
+    for sentence in (s.strip() for s in sentences):
+        if not speakable(sentence):
+            continue
+        if len(chunks) > 1 and len(chunks[-1]) + 1 + len(sentence) <= max_chars:
+            chunks[-1] += " " + sentence
+        else:
+            chunks.append(sentence)
+    return chunks
+
+
+def _concat(paths: List[str], output_path: str) -> None:
+    # MP3 is a stream of self-contained frames, so files can be joined byte-wise
+    with open(output_path, "wb") as out:
+        for path in paths:
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, out)
+
+
 class TextToSpeechService:
-    def __init__(self):
-        logger.info("✅ TextToSpeechService initialized (gTTS)")
+    def __init__(self, cache: AudioCache = None):
+        # ✅ Identical (text, lang, slow) requests reuse one MP3 in static/audio
+        self.cache = cache or AudioCache()
+        self._semaphore = asyncio.Semaphore(TTS_MAX_CONCURRENCY)
+        register_cache("tts_engines", self)
+        logger.info(f"✅ TextToSpeechService initialized (engines: {', '.join(e.name for e in engine_chain('hi'))})")
 
-    def synthesize_speech(self, text: str, slow: bool = False) -> str:
+    def _render(self, text: str, lang: str, slow: bool) -> str:
         """
-        Converts text to speech using gTTS and saves as an MP3 in /static/audio/.
-
-        :param text: The text to convert.
-        :param slow: Speak slowly (default: False).
-        :return: Public URL to the generated MP3 file (e.g. /static/audio/xyz.mp3).
+        Audio for one chunk from the first engine for `lang` that has it cached or can
+        render it. An engine whose circuit is open (repeated failures) is skipped, so a
+        gTTS outage falls through to the local engine without waiting on timeouts.
         """
+        if not speakable(text):
+            raise ValueError("Nothing to speak in the given text.")
+
+        errors = []
+        hit = False
         try:
-            # ✅ Save in static/audio directory
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            audio_dir = os.path.join(base_dir, "static", "audio")
-            os.makedirs(audio_dir, exist_ok=True)
+            for engine in engine_chain(lang):
+                # Cached audio is served whatever the engine's circuit state
+                key = audio_key(text, lang, slow, engine.name)
+                cached = self.cache.get(key, count=False)
+                if cached:
+                    hit = True
+                    return cached
+                if not engine.breaker.allow():
+                    continue
+                try:
+                    with self.cache.lock(key):
+                        # Another request may have rendered it while we waited
+                        output_path = self.cache.path(key)
+                        if os.path.exists(output_path):
+                            engine.breaker.release()
+                            hit = True
+                            return output_path
 
-            # ✅ Generate unique filename
-            filename = f"{uuid.uuid4().hex}.mp3"
-            output_path = os.path.join(audio_dir, filename)
+                        logger.info(f"🔉 Generating speech ({engine.name}, {lang}) for: {text[:60]}...")
+                        start = time.perf_counter()
+                        output_path = self.cache.put(
+                            key, lambda tmp_path: engine.synthesize(text, engine.voice(lang), slow, tmp_path)
+                        )
+                        engine.seconds += time.perf_counter() - start
+                        engine.renders += 1
+                        engine.breaker.record_success()
+                        return output_path
+                except Exception as e:
+                    engine.failures += 1
+                    # Only outages open the circuit; an engine rejecting this text stays closed
+                    if engine.is_outage(e):
+                        engine.breaker.record_failure()
+                    else:
+                        engine.breaker.release()
+                    errors.append(f"{engine.name}: {e}")
+                    logger.warning(f"⚠️ TTS engine {engine.name} failed, trying the next one: {e}")
+                except BaseException:
+                    engine.breaker.release()
+                    raise
+            raise RuntimeError(f"No TTS engine could speak '{lang}' ({'; '.join(errors) or 'none available'})")
+        finally:
+            # One cache lookup per chunk, however many engines were probed
+            self.cache.record(hit)
 
-            logger.info(f"🔉 Generating speech for: {text[:60]}...")
-            tts = gTTS(text=text, lang='hi', slow=slow)  # Use lang='hi' or auto-detect if needed
-            tts.save(output_path)
-            logger.info(f"✅ TTS audio saved at: {output_path}")
+    def _answer_key(self, text: str, lang: str, slow: bool) -> str:
+        # Joined multi-chunk answers are keyed by the engine that would render them now,
+        # so audio made by a fallback engine is replaced once the preferred one recovers
+        engines = [engine for engine in engine_chain(lang) if engine.breaker.state != "open"]
+        return audio_key(text, lang, slow, engines[0].name if engines else "none")
 
-            # ✅ Return public URL path (not absolute path)
-            return f"/static/audio/{filename}"
+    def stats(self) -> dict:
+        return {name: get_tts_engine(name).stats() for name in ENGINE_CLASSES}
 
+    async def _arender(self, text: str, lang: str, slow: bool) -> str:
+        async with self._semaphore:
+            return await run_blocking(self._render, text, lang, slow)
+
+    def synthesize_speech(self, text: str, slow: bool = False, lang: str = "hi") -> str:
+        """
+        Converts text to speech and saves it as an MP3 in /static/audio/, or returns the
+        existing file for the same text, language and speed.
+
+        :param text: The text to convert.
+        :param slow: Speak slowly (default: False).
+        :param lang: Detected language code; mapped to an engine voice.
+        :return: Path of the MP3 file; it is served as /static/audio/<file name>.
+        """
+        lang = tts_language(lang)
+        chunks = split_for_tts(text)
+        if not chunks:
+            raise ValueError("Nothing to speak in the given text.")
+        try:
+            if len(chunks) == 1:
+                return self._render(chunks[0], lang, slow)
+            key = self._answer_key(text, lang, slow)
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+            paths = [self._render(chunk, lang, slow) for chunk in chunks]
+            return self.cache.put(key, lambda tmp_path: _concat(paths, tmp_path))
+        except Exception as e:
+            logger.error(f"❌ TTS generation failed: {e}")
+            raise RuntimeError("Text-to-Speech generation failed.") from e
+
+    async def asynthesize_speech(self, text: str, slow: bool = False, lang: str = "hi") -> str:
+        """
+        Async variant of synthesize_speech(): sentence chunks are synthesized concurrently
+        in the bounded executor (the engines are blocking) and joined into one file.
+        """
+        lang = tts_language(lang)
+        chunks = split_for_tts(text)
+        if not chunks:
+            raise ValueError("Nothing to speak in the given text.")
+        try:
+            if len(chunks) == 1:
+                return await self._arender(chunks[0], lang, slow)
+            key = self._answer_key(text, lang, slow)
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+            paths = await asyncio.gather(*(self._arender(chunk, lang, slow) for chunk in chunks))
+            return await run_blocking(self.cache.put, key, lambda tmp_path: _concat(paths, tmp_path))
         except Exception as e:
             logger.error(f"❌ TTS generation failed: {e}")
             raise RuntimeError("Text-to-Speech generation failed.") from e
+
+    async def stream_speech(self, text: str, slow: bool = False, lang: str = "hi") -> AsyncIterator[bytes]:
+        """
+        Yields MP3 bytes sentence by sentence. All chunks are synthesized concurrently,
+        but each is sent as soon as it and the ones before it are ready, so playback
+        starts after the first sentence.
+        """
+        lang = tts_language(lang)
+        chunks = split_for_tts(text)
+        if not chunks:
+            raise ValueError("Nothing to speak in the given text.")
+        cached = self.cache.get(self._answer_key(text, lang, slow))
+        paths = [cached] if cached else None
+        tasks = [] if cached else [asyncio.ensure_future(self._arender(chunk, lang, slow)) for chunk in chunks]
+        try:
+            for item in paths or tasks:
+                path = item if isinstance(item, str) else await item
+                with open(path, "rb") as f:
+                    while True:
+                        block = f.read(STREAM_BLOCK)
+                        if not block:
+                            break
+                        yield block
+        finally:
+            # Client went away or a chunk failed: don't keep synthesizing the rest
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,136 @@
+# backend/app/services/speech_utils/tts_engines.py
+
+import shutil
+import logging
+import subprocess
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from app.core.config import (
+    ESPEAK_BINARY,
+    TTS_ENGINE_COOLDOWN_SECONDS,
+    TTS_ENGINE_FAILURES,
+    TTS_ENGINES,
+    TTS_LANGUAGE_ENGINES,
+)
+from app.core.http_client import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class TTSEngine(ABC):
+    """
+    A speech synthesizer that writes MP3 files. `voice(lang)` maps a detected language
+    to the engine's voice, or None when the engine can't speak it.
+    """
+
+    name = "base"
+    voices: Dict[str, str] = {}
+
+    def __init__(self) -> None:
+        self.breaker = CircuitBreaker(TTS_ENGINE_FAILURES, TTS_ENGINE_COOLDOWN_SECONDS)
+        self.renders = 0
+        self.failures = 0
+        self.seconds = 0.0
+
+    def voice(self, lang: str) -> Optional[str]:
+        return self.voices.get((lang or "").split("-")[0].lower())
+
+    def available(self) -> bool:
+        return True
+
+    def is_outage(self, error: Exception) -> bool:
+        """
+        Whether a synthesize() error means the engine itself is failing (network,
+        subprocess) rather than the input, so it counts against the circuit breaker.
+        """
+        return isinstance(error, (OSError, subprocess.SubprocessError))
+
+    @abstractmethod
+    def synthesize(self, text: str, voice: str, slow: bool, output_path: str) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {
+            "renders": self.renders,
+            "failures": self.failures,
+            "avg_ms": round(self.seconds / self.renders * 1000, 1) if self.renders else None,
+            "circuit": self.breaker.state,
+        }
+
+
+class GTTSEngine(TTSEngine):
+    """
+    Google Translate's TTS endpoint through gTTS: natural voices, one network call per
+    ~100 characters.
+    """
+
+    name = "gtts"
+    # Assamese is closest to the Bengali voice
+    voices = {
+        "en": "en", "hi": "hi", "mr": "mr", "ta": "ta", "te": "te", "bn": "bn", "as": "bn",
+        "gu": "gu", "kn": "kn", "ml": "ml", "pa": "pa", "ur": "ur", "ne": "ne",
+    }
+
+    def synthesize(self, text: str, voice: str, slow: bool, output_path: str) -> None:
+        from gtts import gTTS
+
+        gTTS(text=text, lang=voice, slow=slow).save(output_path)
+
+    def is_outage(self, error: Exception) -> bool:
+        from gtts import gTTSError
+
+        # gTTSError wraps failed requests to Google; requests' own errors are OSErrors
+        return isinstance(error, gTTSError) or super().is_outage(error)
+
+
+class EspeakEngine(TTSEngine):
+    """
+    Local espeak-ng formant synthesizer: robotic but offline, and far faster than real
+    time on one CPU core. WAV output is encoded to MP3 by ffmpeg over pipes.
+    """
+
+    name = "espeak"
+    voices = {
+        "en": "en-us", "hi": "hi", "mr": "mr", "ta": "ta", "te": "te", "bn": "bn", "as": "as",
+        "gu": "gu", "kn": "kn", "ml": "ml", "pa": "pa", "ur": "ur", "ne": "ne", "or": "or",
+    }
+
+    def __init__(self, binary: str = ESPEAK_BINARY) -> None:
+        super().__init__()
+        self.binary = binary
+
+    def available(self) -> bool:
+        return shutil.which(self.binary) is not None and shutil.which("ffmpeg") is not None
+
+    def synthesize(self, text: str, voice: str, slow: bool, output_path: str) -> None:
+        wav = subprocess.run(
+            [self.binary, "-v", voice, "-s", "120" if slow else "160", "--stdout", text],
+            capture_output=True, timeout=60, check=True,
+        ).stdout
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-y", "-f", "wav", "-i", "pipe:0",
+             "-ac", "1", "-b:a", "48k", "-f", "mp3", output_path],
+            input=wav, capture_output=True, timeout=60, check=True,
+        )
+
+
+ENGINE_CLASSES = {engine.name: engine for engine in (GTTSEngine, EspeakEngine)}
+
+
+@lru_cache(maxsize=None)
+def get_tts_engine(name: str) -> TTSEngine:
+    if name not in ENGINE_CLASSES:
+        raise ValueError(f"Unknown TTS engine '{name}'")
+    return ENGINE_CLASSES[name]()
+
+
+def engine_chain(lang: str) -> List[TTSEngine]:
+    """
+    Engines to try for `lang`, in order: the language's own list if configured, else
+    TTS_ENGINES. Engines without a voice for it, or not installed, are left out.
+    """
+    names = TTS_LANGUAGE_ENGINES.get(lang) or TTS_ENGINES
+    engines = [get_tts_engine(name) for name in names]
+    return [engine for engine in engines if engine.voice(lang) and engine.available()]
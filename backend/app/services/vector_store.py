@@ -0,0 +1,241 @@
+# backend/app/services/vector_store.py
+
+import os
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.core.config import PINECONE_INDEX_NAME, VECTOR_STORE_BACKEND, VECTOR_STORE_DIR
+
+logger = logging.getLogger(__name__)
+
+Filter = Optional[Dict[str, Any]]
+
+
+def matches_filter(metadata: Dict[str, Any], where: Filter) -> bool:
+    """
+    Equality filter on metadata. A list of expected values means "any of them", and
+    list-valued fields (like tags) match if they contain an expected value.
+    """
+    for key, expected in (where or {}).items():
+        value = metadata.get(key, "")
+        wanted = expected if isinstance(expected, list) else [expected]
+        values = value if isinstance(value, list) else [value]
+        if not any(v in wanted for v in values):
+            return False
+    return True
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class VectorStore(ABC):
+    """
+    Minimal vector index interface used by the retrievers: ids are caller-assigned,
+    similarity is cosine, and `search` returns (document, score) pairs best first.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def upsert(self, ids: Sequence[str], vectors, texts: Sequence[str], metadatas: Sequence[dict]) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, ids: Sequence[str]) -> None:
+        ...
+
+    @abstractmethod
+    def search(self, vector, k: int = 5, where: Filter = None) -> List[Tuple[Document, float]]:
+        ...
+
+    @abstractmethod
+    def ids(self) -> List[str]:
+        ...
+
+    def __len__(self) -> int:
+        return len(self.ids())
+
+
+class _Snapshot:
+    # Readers grab one snapshot reference; writers build a new one and swap it in
+    def __init__(self, ids: List[str], matrix: np.ndarray, texts: List[str], metadatas: List[dict]) -> None:
+        self.ids = ids
+        self.matrix = matrix
+        self.texts = texts
+        self.metadatas = metadatas
+        self._masks: Dict[str, np.ndarray] = {}
+
+    def mask(self, where: Dict[str, Any]) -> np.ndarray:
+        # Filters repeat (scheme type, a handful of tags), so masks are computed once per snapshot
+        key = json.dumps(where, sort_keys=True)
+        if key not in self._masks:
+            self._masks[key] = np.fromiter(
+                (matches_filter(m, where) for m in self.metadatas), dtype=bool, count=len(self.ids)
+            )
+        return self._masks[key]
+
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process exact cosine search over a matrix of normalized float32 embeddings.
+    The matrix lives in `vectors.npy` (memory-mapped, so workers share the page cache)
+    next to `records.json` with ids, texts and metadata. A few hundred chunks search in
+    tens of microseconds, so no approximate index is needed at this size.
+    """
+
+    name = "local"
+
+    def __init__(self, path: str = VECTOR_STORE_DIR) -> None:
+        self.path = path
+        self._vectors_path = os.path.join(path, "vectors.npy")
+        self._records_path = os.path.join(path, "records.json")
+        self._write_lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._snapshot = self._load()
+        logger.info(f"✅ Local vector store loaded ({len(self._snapshot.ids)} vectors from {path})")
+
+    def _load(self) -> _Snapshot:
+        if not (os.path.exists(self._vectors_path) and os.path.exists(self._records_path)):
+            return _Snapshot([], np.zeros((0, 0), dtype=np.float32), [], [])
+        with open(self._records_path, encoding="utf-8") as f:
+            records = json.load(f)
+        matrix = np.load(self._vectors_path, mmap_mode="r")
+        return _Snapshot(records["ids"], matrix, records["texts"], records["metadatas"])
+
+    def _save(self, snapshot: _Snapshot) -> None:
+        # Write-then-rename so readers in other processes never see a half-written index
+        vectors_tmp = self._vectors_path + ".tmp.npy"
+        records_tmp = self._records_path + ".tmp"
+        np.save(vectors_tmp, np.ascontiguousarray(snapshot.matrix, dtype=np.float32))
+        with open(records_tmp, "w", encoding="utf-8") as f:
+            json.dump({"ids": snapshot.ids, "texts": snapshot.texts, "metadatas": snapshot.metadatas}, f)
+        os.replace(vectors_tmp, self._vectors_path)
+        os.replace(records_tmp, self._records_path)
+        self._snapshot = self._load()
+
+    def upsert(self, ids: Sequence[str], vectors, texts: Sequence[str], metadatas: Sequence[dict]) -> None:
+        if not ids:
+            return
+        new = normalize_rows(vectors)
+        replaced = set(ids)
+        with self._write_lock:
+            current = self._snapshot
+            keep = [i for i, id_ in enumerate(current.ids) if id_ not in replaced]
+            matrix = np.vstack([np.asarray(current.matrix)[keep], new]) if keep else new
+            self._save(_Snapshot(
+                [current.ids[i] for i in keep] + list(ids),
+                matrix,
+                [current.texts[i] for i in keep] + list(texts),
+                [current.metadatas[i] for i in keep] + [dict(m) for m in metadatas],
+            ))
+
+    def delete(self, ids: Sequence[str]) -> None:
+        doomed = set(ids)
+        with self._write_lock:
+            current = self._snapshot
+            keep = [i for i, id_ in enumerate(current.ids) if id_ not in doomed]
+            if len(keep) == len(current.ids):
+                return
+            matrix = np.asarray(current.matrix)[keep] if keep else np.zeros((0, 0), dtype=np.float32)
+            self._save(_Snapshot(
+                [current.ids[i] for i in keep],
+                matrix,
+                [current.texts[i] for i in keep],
+                [current.metadatas[i] for i in keep],
+            ))
+
+    def search(self, vector, k: int = 5, where: Filter = None) -> List[Tuple[Document, float]]:
+        snapshot = self._snapshot
+        if not snapshot.ids:
+            return []
+
+        scores = snapshot.matrix @ normalize_rows(vector)[0]
+        if where:
+            scores = np.where(snapshot.mask(where), scores, -np.inf)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (Document(page_content=snapshot.texts[i], metadata={**snapshot.metadatas[i], "id": snapshot.ids[i]}),
+             float(scores[i]))
+            for i in top if scores[i] != -np.inf
+        ]
+
+    def ids(self) -> List[str]:
+        return list(self._snapshot.ids)
+
+
+class PineconeVectorStore(VectorStore):
+    """
+    Remote Pinecone serverless index. Chunk text is stored in the `text` metadata field,
+    the same layout langchain_pinecone uses, so existing indexes keep working.
+    """
+
+    name = "pinecone"
+
+    def __init__(self, index_name: str = PINECONE_INDEX_NAME, dimension: Optional[int] = None) -> None:
+        from pinecone import Pinecone, ServerlessSpec
+        from app.services.embeddings import embedding_dimension
+
+        api_key = os.getenv("PINECONE_API_KEY")
+        if not api_key:
+            raise ValueError("❌ Missing PINECONE_API_KEY")
+
+        client = Pinecone(api_key=api_key)
+        if index_name not in client.list_indexes().names():
+            logger.info("📌 Creating new Pinecone index")
+            client.create_index(
+                name=index_name,
+                dimension=dimension or embedding_dimension(),
+                metric="cosine",
+                spec=ServerlessSpec(cloud="aws", region="us-east-1")
+            )
+        self.index = client.Index(index_name)
+        logger.info(f"✅ Pinecone vector store ready ({index_name})")
+
+    def upsert(self, ids: Sequence[str], vectors, texts: Sequence[str], metadatas: Sequence[dict]) -> None:
+        self.index.upsert(vectors=[
+            {"id": id_, "values": [float(x) for x in vector], "metadata": {**metadata, "text": text}}
+            for id_, vector, text, metadata in zip(ids, vectors, texts, metadatas)
+        ])
+
+    def delete(self, ids: Sequence[str]) -> None:
+        if ids:
+            self.index.delete(ids=list(ids))
+
+    def search(self, vector, k: int = 5, where: Filter = None) -> List[Tuple[Document, float]]:
+        pinecone_filter = {
+            key: {"$in": value} if isinstance(value, list) else {"$eq": value} for key, value in (where or {}).items()
+        }
+        result = self.index.query(
+            vector=[float(x) for x in vector], top_k=k, include_metadata=True, filter=pinecone_filter or None
+        )
+        hits = []
+        for match in result.matches:
+            metadata = dict(match.metadata or {})
+            text = metadata.pop("text", "")
+            hits.append((Document(page_content=text, metadata={**metadata, "id": match.id}), float(match.score)))
+        return hits
+
+    def ids(self) -> List[str]:
+        return [id_ for page in self.index.list() for id_ in page]
+
+
+def get_vector_store(backend: str = VECTOR_STORE_BACKEND, **kwargs) -> VectorStore:
+    if backend == "pinecone":
+        return PineconeVectorStore(**kwargs)
+    if backend == "local":
+        return LocalVectorStore(**kwargs)
+    raise ValueError(f"Unknown vector store backend '{backend}'")
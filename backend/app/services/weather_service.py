@@ -1,8 +1,16 @@
 import os
-import requests
+import time
 import logging
+from functools import lru_cache
+from typing import Optional, Tuple
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+
+from app.core.cache import SQLiteKVStore, TieredCache
+from app.core.config import CACHE_DIR, WEATHER_CACHE_BACKEND, WEATHER_CACHE_SIZE
+from app.core.executor import run_blocking
+from app.core.http_client import arequest, request
+from app.core.llm import get_llm
+from app.services.gazetteer import normalize_place_name
 
 load_dotenv()
 # ✅ Setup logger
@@ -10,19 +18,112 @@ logger = logging.getLogger(__name__)
 
 # ✅ Weather API key
 weather_api_key = os.getenv("OPENWEATHERMAP_API_KEY")
+FORECAST_URL = "http://api.openweathermap.org/data/2.5/forecast"
+
+
+# OpenWeatherMap forecasts come in 3-hour slots aligned to UTC midnight
+SLOT_SECONDS = 3 * 3600
+
+
+def _forecast_params(city: str) -> dict:
+    return {"q": city, "appid": weather_api_key, "units": "metric"}
+
+
+# ✅ Two-level forecast cache: raw OWM response by city, farmer summary by (city, slot, language)
+@lru_cache(maxsize=None)
+def _cache(name: str) -> TieredCache:
+    shared = None
+    if WEATHER_CACHE_BACKEND == "sqlite":
+        shared = SQLiteKVStore(os.path.join(CACHE_DIR, "weather.sqlite"), table=name)
+    return TieredCache(f"weather_{name}", maxsize=WEATHER_CACHE_SIZE, shared=shared)
+
+
+def _current_slot() -> Tuple[int, float]:
+    # (slot number, seconds until the next slot starts)
+    now = time.time()
+    slot = int(now // SLOT_SECONDS)
+    return slot, (slot + 1) * SLOT_SECONDS - now
+
+
+def _summary_key(city: str, lang: str) -> str:
+    slot, _ = _current_slot()
+    return f"{normalize_place_name(city)}|{slot}|{lang}"
+
+
+def get_cached_summary(city: str, lang: str = "en") -> Optional[dict]:
+    """
+    Cached farmer summary for this city, forecast slot and language:
+    {"english": ..., "text": ...}, or None.
+    """
+    return _cache("summaries").get(_summary_key(city, lang))
+
+
+def cache_summary(city: str, lang: str, english: str, text: str) -> None:
+    _, ttl = _current_slot()
+    _cache("summaries").set(_summary_key(city, lang), {"english": english, "text": text}, ttl=ttl)
+
+
+# ✅ Async variants: a local miss falls through to SQLite, so keep it off the event loop
+async def aget_cached_summary(city: str, lang: str = "en") -> Optional[dict]:
+    return await run_blocking(get_cached_summary, city, lang)
+
+
+async def acache_summary(city: str, lang: str, english: str, text: str) -> None:
+    await run_blocking(cache_summary, city, lang, english, text)
+
+
+def _cached_forecast(city: str) -> Optional[dict]:
+    return _cache("raw").get(normalize_place_name(city))
+
+
+def _store_forecast(city: str, data: dict) -> None:
+    # Only successful responses are cached; "city not found" is retried next time
+    if data.get("cod") == "200":
+        _, ttl = _current_slot()
+        _cache("raw").set(normalize_place_name(city), data, ttl=ttl)
+
 
 # ✅ Get raw 24-hour forecast from OpenWeatherMap
 def get_forecast(city: str):
+    data = _cached_forecast(city)
+    if data is not None:
+        logger.info(f"🌦️ Forecast cache hit for city: {city}")
+        return format_forecast(city, data)
+
     logger.info(f"🌦️ Fetching forecast for city: {city}")
-    url = f"http://api.openweathermap.org/data/2.5/forecast?q={city}&appid={weather_api_key}&units=metric"
-    
+
     try:
-        res = requests.get(url)
+        res = request("GET", FORECAST_URL, params=_forecast_params(city))
         data = res.json()
     except Exception as e:
         logger.error(f"❌ Weather API request failed: {e}")
         return None, "❌ Weather API request failed."
 
+    _store_forecast(city, data)
+    return format_forecast(city, data)
+
+
+# ✅ Async variant of get_forecast (shared keep-alive client, doesn't block the event loop)
+async def aget_forecast(city: str):
+    data = await run_blocking(_cached_forecast, city)
+    if data is not None:
+        logger.info(f"🌦️ Forecast cache hit for city: {city}")
+        return format_forecast(city, data)
+
+    logger.info(f"🌦️ Fetching forecast for city: {city}")
+
+    try:
+        res = await arequest("GET", FORECAST_URL, params=_forecast_params(city))
+        data = res.json()
+    except Exception as e:
+        logger.error(f"❌ Weather API request failed: {e}")
+        return None, "❌ Weather API request failed."
+
+    await run_blocking(_store_forecast, city, data)
+    return format_forecast(city, data)
+
+
+def format_forecast(city: str, data: dict):
     if data.get("cod") != "200":
         logger.warning(f"❌ Could not fetch forecast for {city}: {data.get('message')}")
         return None, f"❌ Could not fetch forecast for {city}."
@@ -46,25 +147,45 @@ def get_forecast(city: str):
     return data, forecast_text
 
 
+def _simplify_prompt(city: str, forecast_text: str) -> str:
+    return (
+        f"You are an agricultural weather advisor helping Indian farmers understand weather forecasts.\n\n"
+        f"Here is the forecast for {city}:\n{forecast_text}\n\n"
+        f"Summarize this forecast in simple and respectful words that a farmer can easily understand.\n"
+        f"Explain how the weather will feel today and tomorrow—whether it will be sunny, rainy, humid, or dry.\n"
+    )
+
+
 # ✅ Simplify the forecast for farmers using Groq LLM
 def simplify_forecast_for_farmer(city: str, forecast_text: str) -> str:
+    cached = get_cached_summary(city)
+    if cached is not None:
+        return cached["english"]
+
     logger.info("🤖 Simplifying forecast using Groq LLM")
 
     try:
-        llm = ChatGroq(
-            api_key=os.getenv("GROQ_API_KEY"),
-            model_name="llama3-8b-8192"
-        )
+        simplified_forecast = get_llm().invoke(_simplify_prompt(city, forecast_text)).content
+        logger.info("✅ Simplified forecast generated")
+        cache_summary(city, "en", simplified_forecast, simplified_forecast)
+        return simplified_forecast
 
-        prompt = (
-        f"You are an agricultural weather advisor helping Indian farmers understand weather forecasts.\n\n"
-        f"Here is the forecast for {city}:\n{forecast_text}\n\n"
-        f"Summarize this forecast in simple and respectful words that a farmer can easily understand.\n"
-        f"Explain how the weather will feel today and tomorrow—whether it will be sunny, rainy, humid, or dry.\n"
-    )
+    except Exception as e:
+        logger.error(f"❌ Failed to simplify forecast: {e}")
+        return "❌ Could not generate simplified forecast."
+
+
+async def asimplify_forecast_for_farmer(city: str, forecast_text: str) -> str:
+    cached = await aget_cached_summary(city)
+    if cached is not None:
+        return cached["english"]
 
-        simplified_forecast = llm.invoke(prompt).content
+    logger.info("🤖 Simplifying forecast using Groq LLM")
+
+    try:
+        simplified_forecast = (await get_llm().ainvoke(_simplify_prompt(city, forecast_text))).content
         logger.info("✅ Simplified forecast generated")
+        await acache_summary(city, "en", simplified_forecast, simplified_forecast)
         return simplified_forecast
 
     except Exception as e:
@@ -0,0 +1,5 @@
+# backend/app/utils/constants.py
+
+# ✅ Intents understood by the /chat router
+VALID_INTENTS = ["weather", "mandi_prices", "schemes", "agriculture_info"]
+UNKNOWN_INTENT = "unknown"
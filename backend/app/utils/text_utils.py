@@ -0,0 +1,196 @@
+# backend/app/utils/text_utils.py
+
+import re
+from typing import List, Optional
+
+# Same pattern scikit-learn's vectorizers use, so tokens match between training and serving
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercases and collapses whitespace.
+    """
+    return WHITESPACE.sub(" ", text.strip().lower())
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def word_ngrams(tokens: List[str], min_n: int = 1, max_n: int = 1) -> List[str]:
+    ngrams = []
+    for n in range(min_n, max_n + 1):
+        ngrams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return ngrams
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap LLM token estimate (~4 characters per token for English), good enough for budgets.
+    """
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    return text if len(text) <= max_chars else text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+
+# ✅ Devanagari -> Latin transliteration (rough, for matching only)
+_DEVANAGARI_VOWELS = {
+    "अ": "a", "आ": "aa", "इ": "i", "ई": "ii", "उ": "u", "ऊ": "uu", "ऋ": "ri",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au", "ऑ": "o",
+}
+_DEVANAGARI_MATRAS = {
+    "ा": "aa", "ि": "i", "ी": "ii", "ु": "u", "ू": "uu", "ृ": "ri",
+    "े": "e", "ै": "ai", "ो": "o", "ौ": "au", "ॉ": "o",
+}
+_DEVANAGARI_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "व": "v", "श": "sh", "ष": "sh", "स": "s", "ह": "h", "ळ": "l",
+    "क़": "k", "ख़": "kh", "ग़": "g", "ज़": "z", "ड़": "r", "ढ़": "rh", "फ़": "f",
+}
+_DEVANAGARI_NUKTA_FORMS = {"ड": "r", "ढ": "rh", "ज": "z", "फ": "f", "क": "k", "ख": "kh", "ग": "g"}
+_DEVANAGARI_SIGNS = {"ं": "n", "ँ": "n", "ः": "h"}
+_VIRAMA, _NUKTA = "्", "़"
+
+
+def has_devanagari(text: str) -> bool:
+    return any("ऀ" <= ch <= "ॿ" for ch in text)
+
+
+def _schwa_deleted(text: str, i: int, out: list) -> bool:
+    """
+    Hindi drops the inherent "a" in a VC_CV pattern ("रायपुर" is "raipur", not "raayapur").
+    i points just past the current consonant.
+    """
+    if not any(c in "aeiou" for c in "".join(out[:-1])):
+        return False  # first syllable keeps its vowel
+    j = i
+    if j < len(text) and text[j] in _DEVANAGARI_CONSONANTS:
+        j += 1
+        if j < len(text) and text[j] == _NUKTA:
+            j += 1
+        return j < len(text) and (text[j] in _DEVANAGARI_MATRAS or text[j] in _DEVANAGARI_VOWELS)
+    return False
+
+
+def transliterate_devanagari(text: str) -> str:
+    """
+    Romanizes Devanagari text well enough for fuzzy matching against English spellings
+    (e.g. "वाराणसी" -> "vaaraanasii"). Non-Devanagari characters pass through unchanged.
+    """
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch in _DEVANAGARI_CONSONANTS:
+            latin = _DEVANAGARI_CONSONANTS[ch]
+            i += 1
+            if i < n and text[i] == _NUKTA:
+                latin = _DEVANAGARI_NUKTA_FORMS.get(ch, latin)
+                i += 1
+            out.append(latin)
+
+            nxt = text[i] if i < n else ""
+            if nxt in _DEVANAGARI_MATRAS:
+                out.append(_DEVANAGARI_MATRAS[nxt])
+                i += 1
+            elif nxt == _VIRAMA:
+                i += 1
+            elif nxt and ("ऀ" <= nxt <= "ॿ") and not _schwa_deleted(text, i, out):
+                # Inherent vowel, dropped at the end of a word
+                out.append("a")
+        elif ch in _DEVANAGARI_VOWELS:
+            out.append(_DEVANAGARI_VOWELS[ch])
+            i += 1
+        elif ch in _DEVANAGARI_SIGNS:
+            out.append(_DEVANAGARI_SIGNS[ch])
+            i += 1
+        elif ch == _NUKTA or ch == _VIRAMA:
+            i += 1
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+_PHONETIC_RULES = [
+    (re.compile(r"c(?!h)"), "k"),
+    (re.compile(r"chh|ch"), "c"),
+    (re.compile(r"sh"), "s"), (re.compile(r"ph"), "f"), (re.compile(r"bh"), "b"),
+    (re.compile(r"kh"), "k"), (re.compile(r"gh"), "g"), (re.compile(r"th"), "t"),
+    (re.compile(r"dh"), "d"), (re.compile(r"jh"), "j"), (re.compile(r"q"), "k"),
+    (re.compile(r"x"), "ks"), (re.compile(r"w"), "v"), (re.compile(r"z"), "j"),
+    (re.compile(r"ee|ii|y"), "i"), (re.compile(r"oo|uu|ou"), "u"),
+    (re.compile(r"(.)\1+"), r"\1"),
+    (re.compile(r"[ah]+$"), ""),
+]
+
+
+def phonetic_key(text: str) -> str:
+    """
+    Collapses common Indian-English spelling variants to one key, e.g. "Nasik"/"Naashik",
+    "Varanasi"/"Vaaraanasii", "Chennai"/"Chenai". Expects normalized Latin text.
+    """
+    key = re.sub(r"[^a-z]", "", text.lower())
+    for pattern, repl in _PHONETIC_RULES:
+        key = pattern.sub(repl, key)
+    return key
+
+
+# Unicode blocks of Indic scripts used by a single language (in practice, for farmer queries)
+_SCRIPT_LANGUAGES = [
+    (0x0A00, 0x0A7F, "pa"),  # Gurmukhi
+    (0x0A80, 0x0AFF, "gu"),  # Gujarati
+    (0x0B00, 0x0B7F, "or"),  # Odia
+    (0x0B80, 0x0BFF, "ta"),  # Tamil
+    (0x0C00, 0x0C7F, "te"),  # Telugu
+    (0x0C80, 0x0CFF, "kn"),  # Kannada
+    (0x0D00, 0x0D7F, "ml"),  # Malayalam
+]
+# Devanagari (Hindi, Marathi, ...) and Bengali-Assamese are shared; tell them apart by markers
+# (regex \b doesn't work here: vowel signs are not \w, so words are matched as split tokens)
+_MARATHI_WORDS = {"आहे", "आहेत", "काय", "कसे", "कसा", "कशी", "मला", "आम्ही", "तुम्ही", "नाही", "आणि", "किती"}
+_HINDI_WORDS = {"है", "हैं", "क्या", "कैसे", "कैसा", "कैसी", "मुझे", "हम", "नहीं", "और", "में", "का", "की", "के", "कितना"}
+
+
+def detect_script_language(text: str, min_share: float = 0.8) -> Optional[str]:
+    """
+    Language of `text` from its script alone, or None when the script doesn't settle it
+    (Latin, which may be English or romanized Hindi; mixed scripts; unmarked Devanagari).
+    """
+    counts: dict = {}
+    letters = 0
+    for ch in text:
+        if not ch.isalpha() and not ("ऀ" <= ch <= "ൿ"):
+            continue
+        letters += 1
+        code = ord(ch)
+        if 0x0900 <= code <= 0x097F:
+            script = "deva"
+        elif 0x0980 <= code <= 0x09FF:
+            script = "beng"
+        else:
+            script = next((lang for lo, hi, lang in _SCRIPT_LANGUAGES if lo <= code <= hi), "other")
+        counts[script] = counts.get(script, 0) + 1
+    if letters < 2:
+        return None
+
+    script, count = max(counts.items(), key=lambda item: item[1])
+    if script == "other" or count / letters < min_share:
+        return None
+    if script == "deva":
+        words = set(re.findall(r"[\u0900-\u097F]+", text))
+        if "ळ" in text or words & _MARATHI_WORDS or any(word.endswith("च्या") for word in words):
+            return "mr"
+        return "hi" if words & _HINDI_WORDS else None
+    if script == "beng":
+        return "as" if "ৰ" in text or "ৱ" in text else "bn"
+    return script
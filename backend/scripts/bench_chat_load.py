@@ -0,0 +1,77 @@
+# backend/scripts/bench_chat_load.py
+"""
+Load test for the /chat endpoint.
+
+Fires the same query at a running backend with increasing concurrency and reports
+throughput and latency at each level. Run it once per worker count to see how
+throughput scales, e.g.:
+
+    uvicorn app.main:app --workers 1   # in one shell
+    python -m scripts.bench_chat_load --concurrency 1 4 16 32 --requests 64
+"""
+
+import time
+import asyncio
+import argparse
+import statistics
+from typing import List
+
+import httpx
+
+
+async def run_level(client: httpx.AsyncClient, url: str, query: str, concurrency: int, total: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one_request():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, json={"query": query})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000 if latencies else 0.0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent load test for /chat")
+    parser.add_argument("--url", default="http://localhost:8000/chat")
+    parser.add_argument("--query", default="What is the weather in Pune?")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=32, help="Requests per concurrency level")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        # Warm-up request so lazy service loading isn't counted
+        await run_level(client, args.url, args.query, 1, 1)
+
+        print(f"{'conc':>5} {'ok':>5} {'err':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9}")
+        for concurrency in args.concurrency:
+            r = await run_level(client, args.url, args.query, concurrency, args.requests)
+            print(
+                f"{r['concurrency']:>5} {r['ok']:>5} {r['errors']:>5} {r['throughput_rps']:>8.2f} "
+                f"{r['p50_ms']:>9.0f} {r['p95_ms']:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
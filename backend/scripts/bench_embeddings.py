@@ -0,0 +1,123 @@
+# backend/scripts/bench_embeddings.py
+"""
+Compares embedding configurations on the schemes corpus: model load time, RSS added
+by the model, passage throughput, single-query latency and retrieval recall@5.
+Each configuration runs in a fresh subprocess so load time and RSS aren't shared.
+
+Recall queries are generated from each scheme's tags and short name; a hit is any
+chunk of that scheme in the top 5.
+
+    python -m scripts.bench_embeddings
+    python -m scripts.bench_embeddings --configs intfloat/e5-small-v2:torch intfloat/e5-small-v2:onnx-int8
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import statistics
+from typing import List, Tuple
+
+from app.core.config import BASE_DIR
+
+DEFAULT_CONFIGS = [
+    "intfloat/e5-large-v2:torch",
+    "intfloat/e5-base-v2:onnx",
+    "intfloat/e5-small-v2:torch",
+    "intfloat/e5-small-v2:onnx-int8",
+]
+
+
+def recall_queries(chunks) -> List[Tuple[str, str]]:
+    queries = []
+    seen = set()
+    for doc in chunks:
+        title = doc.metadata["title"]
+        if title in seen:
+            continue
+        seen.add(title)
+        tags = doc.metadata.get("tags", [])
+        if len(tags) >= 2:
+            queries.append((f"government scheme for {tags[0]} and {tags[1]}", title))
+        short = re.search(r"\(([^)]+)\)", title)
+        if short:
+            queries.append((f"what are the benefits of {short.group(1)}", title))
+    return queries
+
+
+def run_one(config: str) -> dict:
+    import numpy as np
+
+    from app.core.container import get_rss_bytes
+    from app.services.embeddings import SentenceTransformerEmbeddings
+    from app.services.retriever import load_scheme_chunks
+    from app.services.vector_store import LocalVectorStore
+
+    model_name, backend = config.rsplit(":", 1)
+    chunks = load_scheme_chunks(f"{BASE_DIR}/rag_store/schemes.txt")
+    texts = [doc.page_content for doc in chunks]
+
+    rss_before = get_rss_bytes()
+    start = time.perf_counter()
+    model = SentenceTransformerEmbeddings(model_name, backend)
+    load_seconds = time.perf_counter() - start
+    model.embed_documents(texts[:4])  # warm-up
+    rss_mb = (get_rss_bytes() - rss_before) / (1024 * 1024)
+
+    start = time.perf_counter()
+    vectors = model.embed_documents(texts)
+    embed_seconds = time.perf_counter() - start
+
+    queries = recall_queries(chunks)
+    latencies, hits = [], 0
+    with tempfile.TemporaryDirectory() as path:
+        store = LocalVectorStore(path)
+        store.upsert([str(i) for i in range(len(chunks))], np.asarray(vectors), texts,
+                     [doc.metadata for doc in chunks])
+        for query, title in queries:
+            start = time.perf_counter()
+            vector = model.embed_query(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += any(doc.metadata["title"] == title for doc, _ in store.search(vector, 5))
+
+    return {
+        "config": config,
+        "dim": len(vectors[0]),
+        "load_s": round(load_seconds, 2),
+        "rss_mb": round(rss_mb),
+        "passages_per_s": round(len(texts) / embed_seconds, 1),
+        "query_p50_ms": round(statistics.median(latencies), 1),
+        "recall_at_5": round(hits / len(queries), 3),
+        "queries": len(queries),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Embedding backend throughput, memory and recall")
+    parser.add_argument("--configs", nargs="+", default=DEFAULT_CONFIGS, help="model:backend pairs")
+    parser.add_argument("--one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        print(json.dumps(run_one(args.one)))
+        return
+
+    print(f"{'config':<34} {'dim':>5} {'load s':>7} {'RSS MB':>7} {'passages/s':>11} {'query ms':>9} {'R@5':>6}")
+    for config in args.configs:
+        proc = subprocess.run(
+            [sys.executable, "-m", "scripts.bench_embeddings", "--one", config],
+            capture_output=True, text=True, cwd=BASE_DIR,
+        )
+        if proc.returncode != 0:
+            print(f"{config:<34} failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr else proc.returncode}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{config:<34} {r['dim']:>5} {r['load_s']:>7} {r['rss_mb']:>7} {r['passages_per_s']:>11} "
+              f"{r['query_p50_ms']:>9} {r['recall_at_5']:>6}")
+
+
+if __name__ == "__main__":
+    main()
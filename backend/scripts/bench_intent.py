@@ -0,0 +1,77 @@
+# backend/scripts/bench_intent.py
+"""
+Compares the tiered intent classifier (local rules/model, LLM fallback) with the
+LLM-only path on the held-out evaluation queries: accuracy, LLM calls and p50/p99 latency.
+
+    python -m scripts.bench_intent              # needs GROQ_API_KEY
+    python -m scripts.bench_intent --skip-llm   # local tier only
+"""
+
+import csv
+import time
+import argparse
+from typing import Callable, List, Optional
+
+from app.core.config import BASE_DIR, INTENT_LOCAL_CONFIDENCE
+from app.services.intent_classifier import LocalIntentClassifier
+
+DEFAULT_EVAL = f"{BASE_DIR}/rag_store/intent/intent_queries_eval.csv"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(name: str, predict: Callable[[str], Optional[str]], queries: List[str], labels: List[str]) -> None:
+    latencies, correct, answered = [], 0, 0
+    for query, label in zip(queries, labels):
+        start = time.perf_counter()
+        intent = predict(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if intent is not None:
+            answered += 1
+            correct += intent == label
+
+    print(
+        f"{name:<14} answered {answered:>3}/{len(queries)}  "
+        f"accuracy {correct / max(answered, 1):.3f}  "
+        f"p50 {percentile(latencies, 50):8.3f} ms  p99 {percentile(latencies, 99):8.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark tiered vs LLM-only intent detection")
+    parser.add_argument("--data", default=DEFAULT_EVAL)
+    parser.add_argument("--threshold", type=float, default=INTENT_LOCAL_CONFIDENCE)
+    parser.add_argument("--skip-llm", action="store_true", help="Only benchmark the local tier")
+    args = parser.parse_args()
+
+    with open(args.data, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    queries = [r["query"] for r in rows]
+    labels = [r["intent"] for r in rows]
+
+    local = LocalIntentClassifier()
+
+    def local_tier(query: str) -> Optional[str]:
+        prediction = local.classify(query)
+        return prediction.intent if prediction.confidence >= args.threshold else None
+
+    run("local (all)", lambda q: local.classify(q).intent, queries, labels)
+    run("local (conf)", local_tier, queries, labels)
+
+    if args.skip_llm:
+        return
+
+    from app.services.intent_recognizer import IntentRecognizer
+
+    recognizer = IntentRecognizer(confidence_threshold=args.threshold)
+    llm_calls = sum(local_tier(q) is None for q in queries)
+    run("tiered", recognizer.detect_intent, queries, labels)
+    print(f"{'':<14} LLM calls: {llm_calls}/{len(queries)}")
+    run("llm only", recognizer.detect_intent_llm, queries, labels)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# backend/scripts/bench_mandi_aggregation.py
+"""
+Compares the old list-scan aggregation in MandiPriceService.prepare_response (one pass
+over all records per state/district, int() on string prices) with the columnar
+PriceFrame group-by on synthetic Agmarknet-shaped records.
+
+    python -m scripts.bench_mandi_aggregation --rows 1000000
+    python -m scripts.bench_mandi_aggregation --rows 1000000 --skip-legacy
+"""
+
+import time
+import random
+import argparse
+from typing import List
+
+from app.services.mandi_aggregation import PriceFrame
+
+N_STATES = 30
+DISTRICTS_PER_STATE = 25
+MARKETS_PER_DISTRICT = 4
+N_COMMODITIES = 200
+N_DAYS = 30
+
+
+def synthetic_records(rows: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    states = [f"State {s}" for s in range(N_STATES)]
+    districts = {s: [f"{s} District {d}" for d in range(DISTRICTS_PER_STATE)] for s in states}
+    commodities = [f"Commodity {c}" for c in range(N_COMMODITIES)]
+    dates = [f"{d + 1:02d}/09/2026" for d in range(N_DAYS)]
+    # Agmarknet returns prices as strings; reuse a pool so memory stays reasonable
+    price_pool = [str(p) for p in range(500, 10000, 10)]
+
+    records = []
+    for _ in range(rows):
+        state = rng.choice(states)
+        district = rng.choice(districts[state])
+        low = rng.randrange(len(price_pool) - 100)
+        records.append({
+            "state": state,
+            "district": district,
+            "market": f"{district} Market {rng.randrange(MARKETS_PER_DISTRICT)}",
+            "commodity": rng.choice(commodities),
+            "arrival_date": rng.choice(dates),
+            "min_price": price_pool[low],
+            "modal_price": price_pool[low + 50],
+            "max_price": price_pool[low + 99],
+        })
+    return records
+
+
+def legacy_aggregate(records: List[dict], state: str) -> tuple:
+    # The per-group scans prepare_response used before PriceFrame
+    state_records = [r for r in records if r["state"] == state]
+    by_district = []
+    for d in sorted({r["district"] for r in state_records}):
+        d_recs = [r for r in state_records if r["district"] == d]
+        by_district.append((d, min(int(r["min_price"]) for r in d_recs), max(int(r["max_price"]) for r in d_recs)))
+
+    by_state = []
+    for s in sorted({rec["state"] for rec in records}):
+        s_recs = [r for r in records if r["state"] == s]
+        by_state.append((s, min(int(r["min_price"]) for r in s_recs), max(int(r["max_price"]) for r in s_recs)))
+    return by_district, by_state
+
+
+def columnar_aggregate(frame: PriceFrame, state: str) -> tuple:
+    by_district = [
+        (g["district"], int(g["min_price"]), int(g["max_price"])) for g in frame.filter(state=state).groupby("district")
+    ]
+    by_state = [(g["state"], int(g["min_price"]), int(g["max_price"])) for g in frame.groupby("state")]
+    return by_district, by_state
+
+
+def timed(func, *args, repeat: int = 3):
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark mandi price aggregation")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = synthetic_records(args.rows)
+    print(f"Generated {len(records):,} records in {time.perf_counter() - start:.1f}s")
+    state = records[0]["state"]
+
+    frame, build_ms = timed(PriceFrame.from_records, records, repeat=1)
+    columnar, columnar_ms = timed(columnar_aggregate, frame, state)
+    print(f"{'columnar build':<22} {build_ms:10.1f} ms")
+    print(f"{'columnar group-by':<22} {columnar_ms:10.1f} ms")
+
+    _, median_ms = timed(frame.groupby, "state", "commodity")
+    print(f"{'state x commodity':<22} {median_ms:10.1f} ms  (min/max/median/mean modal)")
+    _, trend_ms = timed(frame.trend, "state", "commodity", repeat=1)
+    print(f"{'daily trend':<22} {trend_ms:10.1f} ms  (state x commodity x date)")
+
+    if args.skip_legacy:
+        return
+
+    legacy, legacy_ms = timed(legacy_aggregate, records, state, repeat=1)
+    print(f"{'legacy list scans':<22} {legacy_ms:10.1f} ms")
+    assert legacy == columnar, "columnar results differ from the legacy aggregation"
+    print(f"Results match; group-by speedup {legacy_ms / columnar_ms:.0f}x "
+          f"({legacy_ms / (build_ms + columnar_ms):.1f}x including the columnar build)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# backend/scripts/bench_query_understanding.py
+"""
+Latency comparison: legacy serial pipeline (detect intent -> extract entities -> resolve
+state/district, three LLM round trips) vs. the single structured query understanding call.
+
+Runs against a stubbed OpenAI-compatible LLM server on localhost with a fixed per-call
+latency, so the numbers reflect round-trip count rather than Groq's load that day.
+
+    python -m scripts.bench_query_understanding --llm-latency-ms 400 --runs 10
+"""
+
+import json
+import time
+import argparse
+import statistics
+
+from scripts.stub_llm import StubLLMHandler, start_stub_llm
+
+QUERY = "What is the price of tomatoes in Pune mandi?"
+
+# Canned answers keyed by a phrase that only appears in the matching prompt
+STUB_REPLIES = {
+    "query understanding step": json.dumps(
+        {"intent": "mandi_prices", "crop": "tomato", "city": "Pune", "state": "Maharashtra", "district": "Pune"}
+    ),
+    "classifying user queries": "mandi_prices",
+    "extracts the **crop name": json.dumps({"crop": "tomato", "location": "Pune"}),
+    "extracts the **Indian city name": "Pune",
+    "identify its state and district": json.dumps({"state": "Maharashtra", "district": "Pune"}),
+}
+
+
+def stub_reply(prompt: str) -> str:
+    return next((text for marker, text in STUB_REPLIES.items() if marker in prompt), "unknown")
+
+
+def measure(name: str, func, runs: int) -> None:
+    StubLLMHandler.reset()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{name:<22} {StubLLMHandler.calls / runs:>4.1f} LLM calls  "
+        f"p50 {statistics.median(timings):8.1f} ms  max {max(timings):8.1f} ms  -> {result}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serial vs. merged query understanding latency")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    server = start_stub_llm(stub_reply, args.llm_latency_ms)
+
+    from app.services.intent_recognizer import IntentRecognizer
+    from app.services.location_crop_extractor import EntityExtractor
+    from app.services.mandi_service import MandiPriceService
+    from app.services.query_understanding import QueryUnderstandingService
+
+    intent_service = IntentRecognizer()
+    entity_extractor = EntityExtractor()
+    mandi_service = MandiPriceService()
+    understanding_service = QueryUnderstandingService(intent_service, entity_extractor, mandi_service)
+
+    def legacy():
+        intent = intent_service.detect_intent_llm(QUERY)
+        entities = entity_extractor.extract_mandi_entities(QUERY)
+        state, district = mandi_service.parse_state_district(mandi_service.get_state_district(entities["location"]))
+        return intent, entities["crop"], entities["location"], state, district
+
+    def merged():
+        u = understanding_service.understand(QUERY)
+        return u.intent, u.crop, u.city, u.state, u.district
+
+    print(f"Stub LLM latency: {args.llm_latency_ms:.0f} ms per call, query: {QUERY!r}\n")
+    measure("legacy (3 serial)", legacy, args.runs)
+    measure("query understanding", merged, args.runs)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# backend/scripts/bench_schemes_compression.py
+"""
+LLM calls and tokens per schemes query for the context compression stage: legacy
+(one sequential call per retrieved document, then answer from the first 5) vs. the
+ContextCompressor (rerank, top N, one batched call, skipped when it already fits).
+
+Retrieval is replaced by a fixture shaped like a real fan-out (5 Pinecone chunks,
+3 long Wikipedia pages, 3 DuckDuckGo snippets) cut from rag_store/schemes.txt, and
+the LLM is the local stub server, so only prompt sizes and round trips are measured.
+
+    python -m scripts.bench_schemes_compression --llm-latency-ms 300
+"""
+
+import re
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+from scripts.stub_llm import StubLLMHandler, start_stub_llm
+
+SCHEMES_PATH = Path(__file__).resolve().parents[1] / "rag_store" / "schemes.txt"
+QUERY = "How much income support do small farmers get under PM-KISAN and how is it paid?"
+
+LEGACY_COMPRESSION_PROMPT = (
+    "Summarize the following document by keeping only the parts relevant to answering the user's question.\n\n"
+    "User Question: {question}\n\nDocument:\n{document}\n\nCompressed Content:"
+)
+FINAL_PROMPT = (
+    "You are an expert assistant for Indian farmers. Use the following context to answer the user's question.\n\n"
+    "Context:\n{context}\n\nUser Question: {question}\n\nAnswer:"
+)
+
+
+def stub_reply(prompt: str) -> str:
+    if "JSON object mapping each document number" in prompt:
+        sections = re.split(r"\nDocument \d+:\n", prompt)[1:]
+        return json.dumps({str(n): section[:400] for n, section in enumerate(sections, 1)})
+    if "Compressed Content:" in prompt:
+        return prompt.split("Document:\n", 1)[1][:400]
+    return "Eligible farmers receive Rs 6,000 a year in three instalments paid by DBT."
+
+
+def load_fixture(short: bool = False):
+    blocks = [b.strip() for b in SCHEMES_PATH.read_text(encoding="utf-8").split("### Scheme:") if b.strip()]
+    pinecone = [Document(page_content=b[:500], metadata={"source": "pinecone"}) for b in blocks[:5]]
+    if short:
+        return pinecone
+    wiki = [
+        Document(page_content=" ".join(blocks[5 + 3 * i: 8 + 3 * i])[:4000], metadata={"source": "wikipedia"})
+        for i in range(3)
+    ]
+    ddg = [Document(page_content=b[:200], metadata={"source": "duckduckgo"}) for b in blocks[15:18]]
+    return pinecone + wiki + ddg
+
+
+def legacy(llm, docs):
+    compressed = [
+        llm.invoke(LEGACY_COMPRESSION_PROMPT.format(question=QUERY, document=doc.page_content)).content
+        for doc in docs
+    ]
+    context = "\n\n".join(compressed[:5])
+    return llm.invoke(FINAL_PROMPT.format(context=context, question=QUERY)).content
+
+
+def batched(compressor, llm, docs):
+    compressed = compressor.compress(docs, QUERY)
+    context = "\n\n".join(doc.page_content for doc in compressed[:5])
+    return llm.invoke(FINAL_PROMPT.format(context=context, question=QUERY)).content
+
+
+def abatched(compressor, llm, docs):
+    async def run():
+        compressed = await compressor.acompress(docs, QUERY)
+        context = "\n\n".join(doc.page_content for doc in compressed[:5])
+        return (await llm.ainvoke(FINAL_PROMPT.format(context=context, question=QUERY))).content
+    return asyncio.run(run())
+
+
+def measure(name: str, func) -> None:
+    StubLLMHandler.reset()
+    start = time.perf_counter()
+    func()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"{name:<34} {StubLLMHandler.calls:>3} LLM calls  "
+        f"{StubLLMHandler.prompt_tokens:>6} prompt + {StubLLMHandler.completion_tokens:>5} completion tokens  "
+        f"{elapsed:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-document vs. batched context compression")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    server = start_stub_llm(stub_reply, args.llm_latency_ms)
+
+    from app.core.llm import get_llm
+    from app.services.context_compressor import ContextCompressor
+
+    llm = get_llm()
+    compressor = ContextCompressor()
+    docs, short_docs = load_fixture(), load_fixture(short=True)
+
+    print(f"Stub LLM latency: {args.llm_latency_ms:.0f} ms per call, {len(docs)} retrieved docs, "
+          f"budget {compressor.budget} tokens, top {compressor.top_n}\n")
+    measure("legacy (per-doc, sequential)", lambda: legacy(llm, docs))
+    measure("compressor (sync)", lambda: batched(compressor, llm, docs))
+    measure("compressor (async)", lambda: abatched(compressor, llm, docs))
+    measure("legacy, 5 short chunks", lambda: legacy(llm, short_docs))
+    measure("compressor, 5 short chunks", lambda: batched(compressor, llm, short_docs))
+    print(f"\nCompressor stats: {compressor.stats}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/scripts/bench_tts.py
+"""
+Compares TTS engines on the same farmer answers: per-utterance latency and real-time
+factor (synthesis time / audio duration; below 1 is faster than real time). Audio
+duration is read with ffprobe. The audio cache is bypassed.
+
+    python -m scripts.bench_tts
+    python -m scripts.bench_tts --engines gtts espeak --langs hi ta --repeat 3
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from app.services.speech_utils.tts_engines import ENGINE_CLASSES, get_tts_engine
+
+TEXTS = {
+    "en": [
+        "Light rain is expected tomorrow, so postpone spraying pesticides.",
+        "The modal price of onion in Lasalgaon mandi today is 1,850 rupees per quintal, "
+        "up 4 percent from last week.",
+    ],
+    "hi": [
+        "कल हल्की बारिश की संभावना है, इसलिए कीटनाशक का छिड़काव टाल दें।",
+        "प्रधानमंत्री किसान सम्मान निधि योजना में पात्र किसानों को हर साल छह हजार रुपये "
+        "तीन किस्तों में सीधे बैंक खाते में मिलते हैं।",
+    ],
+    "mr": ["उद्या हलका पाऊस अपेक्षित आहे, त्यामुळे फवारणी पुढे ढकला."],
+    "ta": ["நாளை லேசான மழை பெய்யும், எனவே பூச்சிக்கொல்லி தெளிப்பதை ஒத்திவைக்கவும்."],
+    "te": ["రేపు తేలికపాటి వర్షం కురిసే అవకాశం ఉంది, కాబట్టి పురుగుమందు పిచికారీ వాయిదా వేయండి."],
+}
+
+
+def audio_seconds(path: str) -> float:
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return float(out.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TTS engine latency and real-time factor")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINE_CLASSES))
+    parser.add_argument("--langs", nargs="+", default=list(TEXTS))
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'engine':<8} {'lang':<5} {'n':>3} {'p50 ms':>8} {'max ms':>8} {'audio s':>8} {'RTF':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.engines:
+            engine = get_tts_engine(name)
+            if not engine.available():
+                print(f"{name:<8} not available")
+                continue
+            for lang in args.langs:
+                voice = engine.voice(lang)
+                if not voice:
+                    print(f"{name:<8} {lang:<5} no voice")
+                    continue
+                latencies, audio, failed = [], 0.0, 0
+                for i, text in enumerate(TEXTS[lang] * args.repeat):
+                    path = os.path.join(tmp, f"{name}-{lang}-{i}.mp3")
+                    start = time.perf_counter()
+                    try:
+                        engine.synthesize(text, voice, False, path)
+                    except Exception:
+                        failed += 1
+                        continue
+                    latencies.append(time.perf_counter() - start)
+                    audio += audio_seconds(path)
+                if not latencies:
+                    print(f"{name:<8} {lang:<5} all {failed} failed")
+                    continue
+                print(f"{name:<8} {lang:<5} {len(latencies):>3} {statistics.median(latencies) * 1000:>8.0f} "
+                      f"{max(latencies) * 1000:>8.0f} {audio:>8.1f} {sum(latencies) / audio:>6.3f}"
+                      + (f"  ({failed} failed)" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# backend/scripts/bench_vector_search.py
+"""
+Search latency of the local (memory-mapped NumPy) vector store at schemes-corpus size.
+Uses random unit vectors, so it runs offline without the embedding model.
+
+    python -m scripts.bench_vector_search --chunks 400 --dim 1024 --queries 2000
+"""
+
+import time
+import argparse
+import tempfile
+import statistics
+
+import numpy as np
+
+from app.services.vector_store import LocalVectorStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local vector store search latency")
+    parser.add_argument("--chunks", type=int, default=400)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.chunks, args.dim)).astype(np.float32)
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as path:
+        store = LocalVectorStore(path)
+        start = time.perf_counter()
+        store.upsert(
+            [f"chunk-{i}" for i in range(args.chunks)],
+            vectors,
+            [f"text {i}" for i in range(args.chunks)],
+            [{"type": "Central" if i % 2 else "State", "tags": [f"tag{i % 7}"]} for i in range(args.chunks)],
+        )
+        print(f"Indexed {args.chunks} x {args.dim} vectors in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+        for label, where in (("exact top-k", None), ("exact top-k + filter", {"type": "Central", "tags": "tag3"})):
+            timings = []
+            for query in queries:
+                start = time.perf_counter()
+                store.search(query, args.k, where)
+                timings.append((time.perf_counter() - start) * 1e6)
+            timings.sort()
+            print(f"{label:<22} p50 {statistics.median(timings):7.1f} us  "
+                  f"p99 {timings[int(len(timings) * 0.99)]:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# backend/scripts/ingest_schemes.py
+"""
+Embeds rag_store/schemes.txt into the configured vector store. Only chunks whose
+content changed are re-embedded; vectors of removed chunks are deleted.
+
+    python -m scripts.ingest_schemes                       # incremental
+    python -m scripts.ingest_schemes --full                # re-embed everything
+    python -m scripts.ingest_schemes --backend pinecone --batch-size 64
+"""
+
+import json
+import argparse
+
+from app.core.config import INGEST_BATCH_SIZE, VECTOR_STORE_BACKEND
+from app.core.logger import setup_logger
+from app.services.vector_store import get_vector_store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incrementally index government schemes")
+    parser.add_argument("--file", default=None, help="Schemes file (defaults to rag_store/schemes.txt)")
+    parser.add_argument("--backend", default=VECTOR_STORE_BACKEND, choices=["local", "pinecone"])
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument("--full", action="store_true", help="Re-embed every chunk")
+    args = parser.parse_args()
+
+    setup_logger()
+    from app.services.retriever import SchemeRetriever
+
+    kwargs = {"file_path": args.file} if args.file else {}
+    retriever = SchemeRetriever(store=get_vector_store(args.backend), auto_index=False, **kwargs)
+    report = retriever.load_and_upload_documents(full=args.full, batch_size=args.batch_size)
+    print(json.dumps(report.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
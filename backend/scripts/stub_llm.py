@@ -0,0 +1,74 @@
+# backend/scripts/stub_llm.py
+"""
+Stubbed OpenAI-compatible chat completion server for the benchmark scripts. It replies
+with a fixed per-call latency and counts calls and (estimated) tokens, so benchmarks
+measure round trips and prompt sizes instead of Groq's load that day.
+"""
+
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    latency_seconds = 0.0
+    reply: Callable[[str], str] = staticmethod(lambda prompt: "unknown")
+    calls = 0
+    prompt_tokens = 0
+    completion_tokens = 0
+    lock = threading.Lock()
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls.lock:
+            cls.calls = cls.prompt_tokens = cls.completion_tokens = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        reply = StubLLMHandler.reply(prompt)
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(reply) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        with StubLLMHandler.lock:
+            StubLLMHandler.calls += 1
+            StubLLMHandler.prompt_tokens += usage["prompt_tokens"]
+            StubLLMHandler.completion_tokens += usage["completion_tokens"]
+        time.sleep(self.latency_seconds)
+
+        payload = json.dumps({
+            "id": "stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": usage,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_llm(reply: Callable[[str], str], latency_ms: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Starts the stub on a free localhost port and points ChatGroq at it. Call before
+    any service builds its LLM client.
+    """
+    StubLLMHandler.reply = staticmethod(reply)
+    StubLLMHandler.latency_seconds = latency_ms / 1000
+    StubLLMHandler.reset()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # ChatGroq reads these when the client is constructed
+    os.environ["GROQ_API_BASE"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["GROQ_API_KEY"] = "stub"
+    return server
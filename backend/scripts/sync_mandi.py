@@ -0,0 +1,37 @@
+# backend/scripts/sync_mandi.py
+"""
+Syncs the Agmarknet daily price dataset into the local mandi price store.
+Run it from cron when the API's background sync is disabled (MANDI_SYNC_INTERVAL_HOURS=0).
+
+    python -m scripts.sync_mandi            # incremental: only new arrival dates
+    python -m scripts.sync_mandi --full     # re-download everything
+    python -m scripts.sync_mandi --rebuild-rollups   # recompute trend rollups only
+"""
+
+import json
+import argparse
+
+from app.core.config import MANDI_DB_PATH, MANDI_SYNC_PAGE_SIZE
+from app.core.logger import setup_logger
+from app.services.mandi_store import MandiPriceStore, sync_mandi_prices
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync Agmarknet mandi prices into the local store")
+    parser.add_argument("--full", action="store_true", help="Re-fetch all arrival dates")
+    parser.add_argument("--db", default=MANDI_DB_PATH)
+    parser.add_argument("--page-size", type=int, default=MANDI_SYNC_PAGE_SIZE)
+    parser.add_argument("--rebuild-rollups", action="store_true", help="Recompute daily rollups without syncing")
+    args = parser.parse_args()
+
+    setup_logger()
+    store = MandiPriceStore(args.db)
+    if args.rebuild_rollups:
+        store.refresh_rollups()
+    else:
+        sync_mandi_prices(store, full=args.full, page_size=args.page_size)
+    print(json.dumps(store.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# backend/scripts/train_intent_classifier.py
+"""
+Trains the local TF-IDF + logistic regression intent model and writes it as a JSON
+artifact that app.services.intent_classifier.LocalIntentModel can score without scikit-learn.
+
+    python -m scripts.train_intent_classifier
+"""
+
+import csv
+import json
+import argparse
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from app.core.config import BASE_DIR, INTENT_MODEL_PATH
+from app.services.intent_classifier import LocalIntentModel
+from app.utils.text_utils import TOKEN_PATTERN
+
+DEFAULT_DATA = f"{BASE_DIR}/rag_store/intent/intent_queries.csv"
+
+
+def load_queries(path: str):
+    with open(path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    return [r["query"] for r in rows], [r["intent"] for r in rows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the local intent classifier")
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--output", default=INTENT_MODEL_PATH)
+    parser.add_argument("--C", type=float, default=10.0, help="Inverse regularization strength")
+    args = parser.parse_args()
+
+    queries, labels = load_queries(args.data)
+
+    vectorizer = TfidfVectorizer(
+        lowercase=True,
+        token_pattern=TOKEN_PATTERN.pattern,
+        ngram_range=(1, 2),
+        sublinear_tf=True,
+    )
+    X = vectorizer.fit_transform(queries)
+    clf = LogisticRegression(C=args.C, max_iter=2000)
+    clf.fit(X, labels)
+
+    artifact = {
+        "classes": [str(c) for c in clf.classes_],
+        "vocabulary": {term: int(idx) for term, idx in sorted(vectorizer.vocabulary_.items())},
+        "idf": [round(float(v), 6) for v in vectorizer.idf_],
+        "coef": [[round(float(v), 6) for v in row] for row in clf.coef_],
+        "intercept": [round(float(v), 6) for v in clf.intercept_],
+        "ngram_range": [1, 2],
+        "sublinear_tf": True,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, separators=(",", ":"))
+
+    # The pure-Python scorer must agree with scikit-learn
+    model = LocalIntentModel(args.output)
+    sk_proba = clf.predict_proba(X)
+    max_diff = max(
+        abs(model.predict_proba(q)[label] - p)
+        for q, row in zip(queries, sk_proba)
+        for label, p in zip(clf.classes_, row)
+    )
+    if max_diff > 1e-3:
+        raise SystemExit(f"❌ Exported model disagrees with scikit-learn (max diff {max_diff:.5f})")
+
+    train_acc = clf.score(X, labels)
+    print(f"✅ Trained on {len(queries)} queries, {len(artifact['vocabulary'])} terms, "
+          f"train accuracy {train_acc:.3f}, export max diff {max_diff:.2e}")
+    print(f"📦 Model written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()